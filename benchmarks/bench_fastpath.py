@@ -0,0 +1,83 @@
+""" Benchmark the compiled fast path against argparse.
+
+    Usage: PYTHONPATH=. python benchmarks/bench_fastpath.py [--options N] [--given K]
+"""
+import timeit
+import argparse
+import inspect
+from typing import List
+from defparse import ArgumentParser
+
+def make_callable(num_options:int, prefix:str ="arg"):
+    # build a callable with a mix of argument types
+    annotations = [int, float, str, List[int], bool]
+    params = [
+        inspect.Parameter(
+            "%s_%i" % (prefix, i),
+            inspect.Parameter.KEYWORD_ONLY,
+            default=[0] if annotations[i % 5] is List[int] else annotations[i % 5](),
+            annotation=annotations[i % 5]
+        )
+        for i in range(num_options)
+    ]
+    def fn(**kwargs):
+        return kwargs
+    fn.__signature__ = inspect.Signature(params)
+    return fn
+
+def make_plain_parser(fn) -> argparse.ArgumentParser:
+    # plain argparse parser with the options generated for `fn`,
+    # parsing does not run through any defparse code
+    parser = argparse.ArgumentParser()
+    for param in inspect.signature(fn).parameters.values():
+        option_string = "--" + param.name
+        if param.annotation is bool:
+            parser.add_argument(option_string, action='store_true', default=param.default)
+        elif param.annotation == List[int]:
+            parser.add_argument(option_string, type=int, nargs='+', default=param.default)
+        else:
+            parser.add_argument(option_string, type=param.annotation, default=param.default)
+    return parser
+
+def make_argv(num_options:int, num_given:int, prefix:str ="arg") -> List[str]:
+    argv = []
+    for i in range(0, num_options, max(1, num_options // num_given)):
+        argv.append("--%s_%i" % (prefix, i))
+        if i % 5 == 3:
+            argv.extend(["1", "2", "3"])
+        elif i % 5 != 4:
+            argv.append("1")
+    return argv
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--options", type=int, default=300)
+    parser.add_argument("--given", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    fn = make_callable(args.options)
+    defparser = ArgumentParser()
+    defparser.add_args_from_callable(fn)
+    plain_parser = make_plain_parser(fn)
+    argv = make_argv(args.options, args.given)
+
+    # make sure both produce identical results
+    assert vars(defparser.parse_args(argv)) == vars(plain_parser.parse_args(argv))
+
+    t_argparse = min(timeit.repeat(
+        lambda: plain_parser.parse_args(argv),
+        number=args.number, repeat=5
+    )) / args.number
+    t_compiled = min(timeit.repeat(
+        lambda: defparser.parse_args(argv),
+        number=args.number, repeat=5
+    )) / args.number
+
+    print("options: %i, given: %i (%i tokens)" % (args.options, args.given, len(argv)))
+    print("argparse: %8.1f us" % (t_argparse * 1e6))
+    print("compiled: %8.1f us" % (t_compiled * 1e6))
+    print("speedup:  %8.1fx" % (t_argparse / t_compiled))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+""" Benchmark suite for parser construction, parsing, execution and import time.
+
+    Usage:
+        PYTHONPATH=. python benchmarks/suite.py [--filter NAME]
+        PYTHONPATH=. python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+        PYTHONPATH=. python benchmarks/suite.py --compare benchmarks/baseline.json [--threshold 0.5]
+
+    Each benchmark reports the best time per call in microseconds over
+    several repeats. Every benchmark is measured alternately with a plain
+    argparse reference for the same time, such that both run under the
+    same machine load.
+    When comparing against a baseline, timings are normalized by their
+    reference and the suite exits with a non-zero status if any benchmark
+    is slower than the baseline by more than the threshold.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import inspect
+import argparse
+import platform
+import subprocess
+from typing import Callable, Dict, List, Tuple
+import defparse.parser
+from defparse import ArgumentParser, uses
+from bench_fastpath import make_callable, make_plain_parser, make_argv
+
+# plain argparse benchmark measured alongside every benchmark
+# to normalize timings by the speed of the machine
+REFERENCE = "parse/options=100/given=20/argparse"
+
+# docstring styles supported by docstring_parser
+DOCSTRING_STYLES = {
+    'none': None,
+    'google': lambda names: "Function\n\nArgs:\n" + "".join(
+        "    %s (int): description of %s\n" % (n, n) for n in names
+    ),
+    'numpy': lambda names: "Function\n\nParameters\n----------\n" + "".join(
+        "%s : int\n    description of %s\n" % (n, n) for n in names
+    ),
+    'rest': lambda names: "Function\n\n" + "".join(
+        ":param int %s: description of %s\n" % (n, n) for n in names
+    )
+}
+
+def make_documented_callable(num_params:int, style:str, annotated:bool) -> Callable:
+    names = ["arg_%i" % i for i in range(num_params)]
+    params = [
+        inspect.Parameter(
+            n, inspect.Parameter.KEYWORD_ONLY, default=0,
+            annotation=int if annotated else inspect.Parameter.empty
+        )
+        for n in names
+    ]
+    def fn(**kwargs):
+        return kwargs
+    fn.__signature__ = inspect.Signature(params)
+    fn.__doc__ = DOCSTRING_STYLES[style](names) if DOCSTRING_STYLES[style] is not None else None
+    return fn
+
+def make_uses_graph(depth:int, fan_out:int, params_per_node:int =3) -> Callable:
+    # build layered graph where each node uses all nodes of the next layer
+    counter = [0]
+    def make_node(children:List[Callable]) -> Callable:
+        names = ["p%i" % (counter[0] + i) for i in range(params_per_node)]
+        counter[0] += params_per_node
+        params = [inspect.Parameter(n, inspect.Parameter.KEYWORD_ONLY, default=0, annotation=int) for n in names]
+        params.append(inspect.Parameter("kwargs", inspect.Parameter.VAR_KEYWORD))
+        def fn(**kwargs):
+            return kwargs
+        fn.__signature__ = inspect.Signature(params)
+        for child in children:
+            fn = uses(child)(fn)
+        return fn
+
+    layer = [make_node([]) for _ in range(fan_out)]
+    for _ in range(depth - 1):
+        layer = [make_node(layer) for _ in range(fan_out)]
+    return make_node(layer)
+
+def _register(fn:Callable, memoized:bool) -> Callable[[], None]:
+    def run():
+        if not memoized:
+            defparse.parser._spec_memo.clear()
+        ArgumentParser().add_args_from_callable(fn)
+    return run
+
+def construction_benchmarks() -> Dict[str, Callable[[], None]]:
+    benchmarks = {}
+    for n in (10, 100):
+        for style in DOCSTRING_STYLES:
+            fn = make_documented_callable(n, style, annotated=True)
+            benchmarks["construct/params=%i/doc=%s" % (n, style)] = _register(fn, memoized=False)
+        # types inferred from docstring
+        fn = make_documented_callable(n, 'google', annotated=False)
+        benchmarks["construct/params=%i/doc=google/types-from-doc" % n] = _register(fn, memoized=False)
+        # replay of memoized spec
+        fn = make_documented_callable(n, 'google', annotated=True)
+        benchmarks["construct/params=%i/doc=google/memoized" % n] = _register(fn, memoized=True)
+    return benchmarks
+
+def uses_benchmarks() -> Dict[str, Callable[[], None]]:
+    benchmarks = {}
+    for depth, fan_out in ((2, 2), (4, 2), (6, 2), (3, 4), (3, 8)):
+        fn = make_uses_graph(depth, fan_out)
+        benchmarks["uses/depth=%i/fan-out=%i" % (depth, fan_out)] = _register(fn, memoized=False)
+    return benchmarks
+
+def compact_benchmarks() -> Dict[str, Callable[[], None]]:
+    # many registered callables of which only few options are used
+    benchmarks = {}
+    fns = [make_callable(10, prefix="plugin_%i" % i) for i in range(200)]
+    argv = make_argv(10, 5, prefix="plugin_0")
+    for compact in (False, True):
+        def run(compact=compact):
+            parser = ArgumentParser(compact=compact)
+            for fn in fns:
+                parser.add_args_from_callable(fn)
+            parser.parse_args(argv)
+        benchmarks["compact/callables=200/construct+parse%s" % ("/compact" if compact else "")] = run
+    return benchmarks
+
+def parse_benchmarks() -> Dict[str, Callable[[], None]]:
+    benchmarks = {}
+    for num_options, num_given in ((100, 20), (300, 50), (1000, 200)):
+        fn = make_callable(num_options)
+        parser = ArgumentParser()
+        parser.add_args_from_callable(fn)
+        # same options on a parser without any defparse code
+        plain_parser = make_plain_parser(fn)
+        argv = make_argv(num_options, num_given)
+        assert vars(parser.parse_args(argv)) == vars(plain_parser.parse_args(argv))
+        benchmarks["parse/options=%i/given=%i" % (num_options, num_given)] = (
+            lambda parser=parser, argv=argv: parser.parse_args(argv)
+        )
+        benchmarks["parse/options=%i/given=%i/argparse" % (num_options, num_given)] = (
+            lambda parser=plain_parser, argv=argv: parser.parse_args(argv)
+        )
+    return benchmarks
+
+def execute_benchmarks() -> Dict[str, Callable[[], None]]:
+    benchmarks = {}
+    for num_callables in (1, 50):
+        parser = ArgumentParser()
+        containers = [
+            parser.add_args_from_callable(make_callable(10, prefix="group_%i" % i))
+            for i in range(num_callables)
+        ]
+        parser.parse_args([])
+        container = containers[-1]
+        benchmarks["container/callables=%i/kwargs" % num_callables] = lambda c=container: c.kwargs
+        benchmarks["container/callables=%i/execute" % num_callables] = lambda c=container: c.execute()
+    return benchmarks
+
+def import_benchmark(repeat:int, code:str ="import defparse") -> float:
+    # cold import in a fresh interpreter, relative to a bare interpreter
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    def run(code:str) -> float:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True, env=env)
+            best = min(best, time.perf_counter() - start)
+        return best
+    return max(0.0, run(code) - run("pass"))
+
+def _calibrate(fn:Callable[[], None], min_time:float) -> Tuple[timeit.Timer, int]:
+    # calibrate number of calls per repeat
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return timer, max(1, int(number * min_time / 0.2))
+
+def time_benchmark(
+    fn:Callable[[], None], 
+    reference:Callable[[], None], 
+    repeat:int, 
+    min_time:float
+) -> Tuple[float, float]:
+    # alternate between benchmark and reference, both
+    # measured for the same time per repeat
+    timer, number = _calibrate(fn, min_time)
+    reference_timer, reference_number = _calibrate(reference, min_time)
+    best, best_reference = float('inf'), float('inf')
+    for _ in range(repeat):
+        best_reference = min(best_reference, reference_timer.timeit(reference_number) / reference_number)
+        best = min(best, timer.timeit(number) / number)
+    return best, best_reference
+
+def run_suite(name_filter:str, repeat:int, min_time:float) -> Tuple[Dict[str, float], Dict[str, float]]:
+    benchmarks = {}
+    for factory in (construction_benchmarks, uses_benchmarks, compact_benchmarks, parse_benchmarks, execute_benchmarks):
+        benchmarks.update(factory())
+    reference = benchmarks[REFERENCE]
+
+    results, references = {}, {}
+    for name, fn in benchmarks.items():
+        if name_filter in name:
+            results[name], references[name] = (t * 1e6 for t in time_benchmark(fn, reference, repeat, min_time))
+            print("%-50s %12.1f us" % (name, results[name]), flush=True)
+    # `import defparse` only sets up the lazy namespace of the
+    # package, the parser module is the import to keep fast
+    name = "import/defparse/parser"
+    if name_filter in name:
+        results[name] = import_benchmark(repeat, "from defparse import ArgumentParser") * 1e6
+        references[name] = time_benchmark(reference, reference, repeat, min_time)[1] * 1e6
+        print("%-50s %12.1f us" % (name, results[name]), flush=True)
+    return results, references
+
+def compare(
+    results:Dict[str, float],
+    references:Dict[str, float],
+    baseline:Dict[str, Dict[str, float]],
+    threshold:float
+) -> List[Tuple[str, float]]:
+    regressions = []
+    print("\n%-50s %12s %12s %8s %8s" % ("benchmark", "baseline", "current", "machine", "change"))
+    for name, current in results.items():
+        if (name not in baseline['results']) or (name == REFERENCE):
+            continue
+        # relative speed of the machine measured by the reference
+        scale = references[name] / baseline['references'][name] if name in baseline.get('references', {}) else 1.0
+        change = current / (baseline['results'][name] * scale) - 1.0
+        flag = " REGRESSION" if change > threshold else ""
+        print("%-50s %12.1f %12.1f %7.2fx %+7.1f%%%s" % (name, baseline['results'][name], current, scale, change * 100, flag))
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="defparse benchmark suite")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this string")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum time per repeat in seconds")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store results as baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare results against baseline")
+    parser.add_argument("--threshold", type=float, default=0.5, help="relative slowdown flagged as regression")
+    args = parser.parse_args()
+
+    results, references = run_suite(args.filter, args.repeat, args.min_time)
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+                "references": references
+            }, f, indent=2, sort_keys=True)
+
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, references, baseline, args.threshold)
+        if len(regressions) > 0:
+            print("\n%i regression(s) above %.0f%% threshold" % (len(regressions), args.threshold * 100))
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
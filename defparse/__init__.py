@@ -1,2 +1,40 @@
-from .parser import ArgumentParser, uses
-from .typehints import Ignore
+# public names are imported on first access to keep
+# the import of defparse fast for short-lived programs
+_LAZY_NAMES = {
+    'ArgumentParser': '.parser',
+    'ArgumentSpec': '.parser',
+    'BatchResult': '.parser',
+    'BoundArgs': '.parser',
+    'CallableSpec': '.parser',
+    'ParseResult': '.parser',
+    'Subcommands': '.parser',
+    'uses': '.parser',
+    'Ignore': '.typehints',
+    'Sweep': '.typehints',
+    'Array': '.typehints',
+    'SweepResult': '.sweep',
+    'run_concurrently': '.aio',
+    'RecordResult': '.runner',
+    'run_records': '.runner',
+    'Profiler': '.profiling'
+}
+
+__all__ = list(_LAZY_NAMES)
+
+def __getattr__(name:str):
+    import importlib
+    if name not in _LAZY_NAMES:
+        # submodules, e.g. `defparse.parser` after `import defparse`
+        try:
+            return importlib.import_module('.' + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != __name__ + '.' + name:
+                raise
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(_LAZY_NAMES[name], __name__), name)
+    # cache in module namespace for following accesses
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
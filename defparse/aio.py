@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, List, Optional, Sequence
+from .parser import ArgsContainer
+
+async def gather(
+    containers:Sequence[ArgsContainer],
+    *,
+    limit:Optional[int] =None,
+    return_exceptions:bool =False
+) -> List[Any]:
+    """ Execute containers concurrently in the running event loop.
+
+        At most `limit` containers are executed at the same time.
+        Results are returned in the order of the containers.
+    """
+    if limit is None:
+        return await asyncio.gather(
+            *(c.aexecute() for c in containers),
+            return_exceptions=return_exceptions
+        )
+
+    if limit < 1:
+        raise ValueError("Concurrency limit must be positive, got %i" % limit)
+    # bound the number of concurrently running containers
+    semaphore = asyncio.Semaphore(limit)
+    async def execute(container:ArgsContainer) -> Any:
+        async with semaphore:
+            return await container.aexecute()
+
+    return await asyncio.gather(
+        *(execute(c) for c in containers),
+        return_exceptions=return_exceptions
+    )
+
+def run_concurrently(
+    containers:Sequence[ArgsContainer],
+    *,
+    limit:Optional[int] =None,
+    return_exceptions:bool =False
+) -> List[Any]:
+    """ Execute containers concurrently in a new event loop, see `gather`. """
+    return asyncio.run(gather(
+        containers,
+        limit=limit,
+        return_exceptions=return_exceptions
+    ))
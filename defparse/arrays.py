@@ -0,0 +1,41 @@
+import argparse
+from typing import Any, List, Sequence
+
+class ArrayAction(argparse.Action):
+    """ Store values of an argument as NumPy array.
+
+        Converts all values in one vectorized step. A single value
+        of the form `@path` is loaded from a `.npy` file or a raw
+        binary file of the given dtype as read-only memory map
+        without copying the data.
+    """
+
+    def __init__(self, option_strings:List[str], dest:str, dtype:Any =float, **kwargs):
+        super(ArrayAction, self).__init__(option_strings, dest, **kwargs)
+        # numpy is only required for array arguments
+        import numpy
+        self.dtype = numpy.dtype(dtype)
+
+    def to_array(self, values:Sequence[Any]) -> Any:
+        import numpy
+        # load array from file
+        if (len(values) == 1) and isinstance(values[0], str) and values[0].startswith('@'):
+            path = values[0][1:]
+            try:
+                if path.endswith('.npy'):
+                    array = numpy.load(path, mmap_mode='r')
+                else:
+                    array = numpy.memmap(path, dtype=self.dtype, mode='r')
+            except (OSError, ValueError) as e:
+                raise argparse.ArgumentError(self, "cannot load array from %s: %s" % (path, e))
+            if array.dtype != self.dtype:
+                raise argparse.ArgumentError(self, "expected array of dtype %s, got %s in %s" % (self.dtype, array.dtype, path))
+            return array
+        # convert all values at once
+        try:
+            return numpy.asarray(values, dtype=self.dtype)
+        except (TypeError, ValueError) as e:
+            raise argparse.ArgumentError(self, "invalid %s array value: %s" % (self.dtype, e))
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, self.to_array(values))
@@ -0,0 +1,95 @@
+import os
+import sys
+from typing import Any, Callable, Optional, Tuple
+
+def callable_key(fn:Callable) -> Optional[str]:
+    """ Stable identifier of a callable across processes.
+
+        Returns `None` for callables that cannot be identified
+        by their qualified name, i.e. lambdas and local functions,
+        as multiple of them can share the same name.
+    """
+    module = getattr(fn, '__module__', None)
+    qualname = getattr(fn, '__qualname__', None)
+    if (module is None) or (qualname is None) or ('<' in qualname):
+        return None
+    return "%s:%s" % (module, qualname)
+
+def source_fingerprint(fn:Callable) -> Optional[Tuple[str, int, int]]:
+    """ Fingerprint of the source file defining the callable.
+
+        Consists of the path, modification time and size of the file.
+        Returns `None` if the callable is not defined in a file.
+    """
+    module = sys.modules.get(getattr(fn, '__module__', None))
+    path = getattr(module, '__file__', None)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+def atomic_write(path:str, data:bytes) -> None:
+    # write to temporary file in the same directory and
+    # move it into place to avoid partially written files
+    import tempfile
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class SpecCache(object):
+    """ Persistent on-disk cache of introspected callables.
+
+        Entries are keyed by the qualified name of the callable and
+        invalidated whenever the source file of the callable changes.
+    """
+
+    def __init__(self, cache_dir:str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key:str) -> str:
+        import hashlib
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + '.pickle')
+
+    def load(self, fn:Callable) -> Any:
+        # check if callable can be cached
+        key, fingerprint = callable_key(fn), source_fingerprint(fn)
+        if (key is None) or (fingerprint is None):
+            return None
+        # read cache entry
+        import pickle
+        try:
+            with open(self._path(key), 'rb') as f:
+                cached_key, cached_fingerprint, spec = pickle.load(f)
+        except Exception:
+            return None
+        # check if entry is still valid
+        if (cached_key != key) or (cached_fingerprint != fingerprint):
+            return None
+        return spec
+
+    def store(self, fn:Callable, spec:Any) -> None:
+        # check if callable can be cached
+        key, fingerprint = callable_key(fn), source_fingerprint(fn)
+        if (key is None) or (fingerprint is None):
+            return
+        import pickle
+        try:
+            data = pickle.dumps((key, fingerprint, spec))
+        except Exception:
+            # spec contains objects that cannot be
+            # serialized, e.g. local types or defaults
+            return
+        try:
+            atomic_write(self._path(key), data)
+        except OSError:
+            pass
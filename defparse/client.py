@@ -0,0 +1,51 @@
+""" Thin client forwarding an invocation to a `defparse.server`.
+
+    Usage:
+        python -m defparse.client [--no-stdin] SOCKET [ARGS ...]
+
+    Sends the command line arguments and the standard input, if it
+    is a pipe or a file and not disabled by `--no-stdin`, to the server, writes the captured output to
+    the standard streams and exits with the exit code of the request.
+    Only depends on the standard library to keep startup fast.
+"""
+import os
+import sys
+import json
+import stat
+import socket
+from typing import List, Optional
+
+def request(path:str, argv:List[str], stdin:Optional[str] =None) -> dict:
+    """ Send a single request to the server listening on the socket. """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps({'argv': argv, 'stdin': stdin}).encode('utf-8') + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        data = bytearray()
+        while True:
+            chunk = sock.recv(65536)
+            if len(chunk) == 0:
+                break
+            data.extend(chunk)
+    return json.loads(data.decode('utf-8'))
+
+def main(argv:Optional[List[str]] =None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    forward_stdin = (len(argv) == 0) or (argv[0] != '--no-stdin')
+    argv = argv if forward_stdin else argv[1:]
+    if len(argv) == 0:
+        print("usage: python -m defparse.client [--no-stdin] SOCKET [ARGS ...]", file=sys.stderr)
+        sys.exit(2)
+    # forward piped input and files only
+    stdin = None
+    if forward_stdin and (sys.stdin is not None):
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+        if stat.S_ISFIFO(mode) or stat.S_ISREG(mode):
+            stdin = sys.stdin.read()
+    response = request(argv[0], argv[1:], stdin)
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    sys.exit(response['exit_code'])
+
+if __name__ == '__main__':
+    main()
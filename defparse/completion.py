@@ -0,0 +1,141 @@
+""" Static shell completion.
+
+    Exports the options of a built parser into a line-based index
+    that is read directly by the generated bash/zsh completion
+    scripts, so completion does not need to start python or import
+    the application.
+
+    Usage:
+        python -m defparse.completion package.module:parser --prog PROG --index PATH [--shell bash]
+"""
+import os
+import sys
+import argparse
+from typing import List, Tuple, Optional
+from .cache import atomic_write
+
+# first line of index files
+INDEX_HEADER = "# defparse completion index v1"
+
+def _entries(parser:argparse.ArgumentParser, path:str) -> List[Tuple[str, str, str, str]]:
+    # register arguments of lazy subcommands
+    if hasattr(parser, '_populate_subcommand'):
+        parser._populate_subcommand()
+
+    entries = []
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            for name, subparser in action.choices.items():
+                entries.append((path, 'command', name, ''))
+                entries.extend(_entries(subparser, (path + ' ' + name).strip()))
+            continue
+        if action.help is argparse.SUPPRESS:
+            continue
+        # options without values are flags
+        kind = 'flag' if action.nargs == 0 else 'value'
+        choices = ' '.join(map(str, action.choices)) if action.choices is not None else ''
+        for option_string in action.option_strings:
+            entries.append((path, kind, option_string, choices))
+    return entries
+
+def build_index(parser:argparse.ArgumentParser) -> str:
+    """ Build the completion index of a parser.
+
+        Every line holds the tab-separated subcommand path, the kind
+        of entry (`flag`, `value` or `command`), the option string or
+        subcommand name and the space-separated choices.
+    """
+    lines = [INDEX_HEADER]
+    for entry in _entries(parser, ''):
+        # tabs and newlines would break the line format
+        lines.append('\t'.join(s.replace('\t', ' ').replace('\n', ' ') for s in entry))
+    return '\n'.join(lines) + '\n'
+
+def write_index(parser:argparse.ArgumentParser, path:str) -> None:
+    """ Write the completion index of a parser to a file. """
+    atomic_write(os.path.abspath(path), build_index(parser).encode('utf-8'))
+
+_BASH_SCRIPT = r"""# bash completion for %(prog)s generated by defparse
+%(function)s() {
+    local index=%(index)s
+    local cur="${COMP_WORDS[COMP_CWORD]}" prev="${COMP_WORDS[COMP_CWORD-1]}"
+    local -a paths kinds words choices
+    local line tab=$'\t' i j path="" candidates=""
+    [[ -r "$index" ]] || return 0
+    # split lines manually as read collapses empty tab-separated fields
+    while IFS= read -r line; do
+        [[ "$line" == "#"* ]] && continue
+        paths+=("${line%%%%$tab*}"); line="${line#*$tab}"
+        kinds+=("${line%%%%$tab*}"); line="${line#*$tab}"
+        words+=("${line%%%%$tab*}"); choices+=("${line#*$tab}")
+    done < "$index"
+    # follow subcommands given before the current word
+    for ((i=1; i<COMP_CWORD; i++)); do
+        for ((j=0; j<${#words[@]}; j++)); do
+            if [[ "${kinds[j]}" == command && "${paths[j]}" == "$path" && "${words[j]}" == "${COMP_WORDS[i]}" ]]; then
+                path="${path:+$path }${COMP_WORDS[i]}"
+                break
+            fi
+        done
+    done
+    # complete values of the previous option
+    for ((j=0; j<${#words[@]}; j++)); do
+        if [[ "${kinds[j]}" == value && "${paths[j]}" == "$path" && "${words[j]}" == "$prev" ]]; then
+            if [[ -n "${choices[j]}" ]]; then
+                COMPREPLY=($(compgen -W "${choices[j]}" -- "$cur"))
+            else
+                # fall back to default completion, e.g. file names
+                COMPREPLY=()
+            fi
+            return 0
+        fi
+    done
+    # complete options and subcommands
+    for ((j=0; j<${#words[@]}; j++)); do
+        [[ "${paths[j]}" == "$path" ]] && candidates+=" ${words[j]}"
+    done
+    COMPREPLY=($(compgen -W "$candidates" -- "$cur"))
+}
+complete -o bashdefault -o default -F %(function)s %(prog)s
+"""
+
+_ZSH_SCRIPT = """# zsh completion for %(prog)s generated by defparse
+autoload -U +X bashcompinit && bashcompinit
+"""
+
+def _quote(s:str) -> str:
+    return "'" + s.replace("'", "'\\''") + "'"
+
+def completion_script(prog:str, index_path:str, shell:str ='bash') -> str:
+    """ Generate a completion script reading the index at the given path.
+
+        Supported shells are `bash` and `zsh`, the latter using the
+        bash completion function through `bashcompinit`.
+    """
+    if shell not in ('bash', 'zsh'):
+        raise ValueError("Unsupported shell `%s`, expected `bash` or `zsh`" % shell)
+    function = "_defparse_" + "".join(c if c.isalnum() else '_' for c in os.path.basename(prog))
+    script = _BASH_SCRIPT % {
+        'prog': prog,
+        'function': function,
+        'index': _quote(os.path.abspath(index_path))
+    }
+    return (_ZSH_SCRIPT % {'prog': prog} + script) if shell == 'zsh' else script
+
+def main(argv:Optional[List[str]] =None) -> None:
+    from .parser import import_callable
+    parser = argparse.ArgumentParser(prog="python -m defparse.completion", description="Export a static completion index and print the completion script.")
+    parser.add_argument("parser", help="parser or factory returning the parser, e.g. `package.module:build_parser`")
+    parser.add_argument("--prog", required=True, help="name of the command to complete")
+    parser.add_argument("--index", required=True, metavar="PATH", help="path to write the completion index to")
+    parser.add_argument("--shell", default="bash", choices=["bash", "zsh"])
+    args = parser.parse_args(argv)
+
+    target = import_callable(args.parser)
+    if not isinstance(target, argparse.ArgumentParser):
+        target = target()
+    write_index(target, args.index)
+    sys.stdout.write(completion_script(args.prog, args.index, shell=args.shell))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import os
+import json
+import argparse
+import threading
+from typing import Any, Dict, Tuple, Optional
+from .arrays import ArrayAction
+
+# cache of loaded config files keyed by path
+# and validated by modification time and size
+_file_cache:Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_file_cache_lock = threading.Lock()
+
+def file_key(path:str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _parse_toml(f) -> Dict[str, Any]:
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("Loading TOML config files requires python>=3.11 or the `tomli` package")
+    return tomllib.load(f)
+
+def load_config(path:str) -> Dict[str, Any]:
+    """ Load a JSON or TOML config file.
+
+        Loaded files are cached by path and reloaded only when
+        their modification time or size changes.
+    """
+    path = os.path.abspath(path)
+    key = file_key(path)
+    # check cache
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+    if (cached is not None) and (cached[0] == key):
+        return cached[1]
+    # load file
+    if path.endswith('.toml'):
+        with open(path, 'rb') as f:
+            config = _parse_toml(f)
+    else:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("Config file %s must contain a mapping of argument names to values" % path)
+    with _file_cache_lock:
+        _file_cache[path] = (key, config)
+    return config
+
+def _convert_single(parser:argparse.ArgumentParser, action:argparse.Action, value:Any) -> Any:
+    if isinstance(value, str):
+        # convert strings like command line arguments
+        value = parser._get_value(action, value)
+    elif isinstance(action.type, type) and not isinstance(value, action.type):
+        # accept integers for float arguments
+        if (action.type is float) and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        else:
+            raise argparse.ArgumentError(action, "invalid %s value: %r" % (action.type.__name__, value))
+    # check choices
+    parser._check_value(action, value)
+    return value
+
+def convert_value(parser:argparse.ArgumentParser, action:argparse.Action, value:Any) -> Any:
+    """ Check and convert a value for an action.
+
+        Applies the type, choices and number of values of the
+        action to values loaded from a config file or mapping.
+        Raises an `argparse.ArgumentError` for invalid values.
+    """
+    # flags accept boolean values
+    if isinstance(action, (argparse._StoreTrueAction, argparse._StoreFalseAction)):
+        if not isinstance(value, bool):
+            raise argparse.ArgumentError(action, "expected boolean value, got %r" % (value,))
+        return value
+    if action.nargs == 0:
+        raise argparse.ArgumentError(action, "cannot be set from a config value")
+    # arrays accept lists of values and `@path` strings
+    if isinstance(action, ArrayAction):
+        return action.to_array(value if isinstance(value, list) else [value])
+
+    # single values
+    if action.nargs in (None, '?'):
+        return _convert_single(parser, action, value)
+
+    # multiple values
+    if not isinstance(value, list):
+        raise argparse.ArgumentError(action, "expected list value, got %r" % (value,))
+    if (action.nargs == '+') and (len(value) == 0):
+        raise argparse.ArgumentError(action, "expected at least one value")
+    if isinstance(action.nargs, int) and (len(value) != action.nargs):
+        raise argparse.ArgumentError(action, "expected %i values, got %i" % (action.nargs, len(value)))
+    return [_convert_single(parser, action, v) for v in value]
+
+# accepted strings of boolean environment variables
+_TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+_FALSE_STRINGS = ('0', 'false', 'no', 'off', '')
+
+def from_env_string(action:argparse.Action, value:str) -> Any:
+    """ Convert the string of an environment variable to a raw value.
+
+        Flags accept boolean strings and arguments taking multiple
+        values accept whitespace-separated values. The result is
+        checked and converted by `convert_value`.
+    """
+    if isinstance(action, (argparse._StoreTrueAction, argparse._StoreFalseAction)):
+        if value.strip().lower() in _TRUE_STRINGS:
+            return True
+        if value.strip().lower() in _FALSE_STRINGS:
+            return False
+        raise argparse.ArgumentError(action, "expected boolean value, got %r" % (value,))
+    if (action.nargs not in (None, '?')) and not (isinstance(action, ArrayAction) and value.startswith('@')):
+        return value.split()
+    return value
+
+def find_action(parser:argparse.ArgumentParser, name:str) -> Optional[argparse.Action]:
+    # look up by option string or destination, compact records of
+    # `defparse.ArgumentParser` are looked up without materializing them
+    records = getattr(parser, '_records', None) or {}
+    action = parser._option_string_actions.get("--" + name, None)
+    if action is not None:
+        return action
+    if ("--" + name) in records:
+        return parser._record_action(records["--" + name])
+    actions = parser._materialized_actions if len(records) > 0 else parser._actions
+    for action in actions:
+        if (action.dest == name) and (len(action.option_strings) > 0):
+            return action
+    for record in records.values():
+        if record.dest == name:
+            return parser._record_action(record)
+    return None
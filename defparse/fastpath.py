@@ -0,0 +1,364 @@
+import types
+import argparse
+from typing import Any, Callable, Container, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from .arrays import ArrayAction
+
+# action types supported by the compiled parser
+_VALUE_ACTIONS = (argparse._StoreAction, argparse._AppendAction, ArrayAction)
+_CONST_ACTIONS = (argparse._StoreConstAction, argparse._StoreTrueAction, argparse._StoreFalseAction)
+# actions that never match a long option token and
+# thus are handled by the fallback to argparse
+_SKIPPED_ACTIONS = (argparse._HelpAction, argparse._VersionAction)
+
+def _is_plain_converter(parser:argparse.ArgumentParser, convert:Any) -> bool:
+    # values converted by the compiled parser are converted again when
+    # falling back to argparse, so converters with side effects such as
+    # `argparse.FileType('w')` opening files are left to argparse
+    return (
+        isinstance(convert, (type, types.BuiltinFunctionType)) or
+        (convert is parser._registry_get('type', None, None))
+    )
+
+class _Option(object):
+    __slots__ = (
+        'action', 'dest', 'convert', 'convert_all', 'nargs', 'choices', 
+        'const', 'default', 'required', 'takes_values', 'append', 'option_strings'
+    )
+
+    @staticmethod
+    def from_action(parser:argparse.ArgumentParser, action:argparse.Action) -> "_Option":
+        option = _Option()
+        option.action = action
+        option.dest = action.dest
+        option.convert = parser._registry_get('type', action.type, action.type)
+        # converts all values at once, e.g. to an array
+        option.convert_all = action.to_array if isinstance(action, ArrayAction) else None
+        option.nargs = action.nargs
+        option.choices = action.choices
+        option.const = action.const
+        option.default = action.default
+        option.required = action.required
+        option.takes_values = isinstance(action, _VALUE_ACTIONS)
+        option.append = isinstance(action, argparse._AppendAction)
+        option.option_strings = action.option_strings
+        return option
+
+    @staticmethod
+    def from_record(parser:argparse.ArgumentParser, record:Any) -> "_Option":
+        # compact record of a long option that is not yet
+        # materialized into an action, see `ArgumentParser`
+        kwargs = record.arg.action_kwargs
+        action = kwargs.get('action', 'store')
+        option = _Option()
+        option.action = None
+        option.dest = record.dest
+        option.convert = parser._registry_get('type', kwargs.get('type', None), kwargs.get('type', None))
+        option.convert_all = None
+        option.nargs = kwargs.get('nargs', None)
+        option.choices = kwargs.get('choices', None)
+        option.const = None
+        option.default = kwargs.get('default', None)
+        option.required = kwargs['required']
+        option.takes_values = True
+        option.append = False
+        option.option_strings = [record.option_string]
+        if action == 'store_true':
+            option.const, option.nargs, option.takes_values = True, 0, False
+            option.default = kwargs.get('default', False)
+        elif action == 'store_false':
+            option.const, option.nargs, option.takes_values = False, 0, False
+            option.default = kwargs.get('default', True)
+        elif action is ArrayAction:
+            option.convert_all = ArrayAction([], option.dest, dtype=kwargs['dtype']).to_array
+            option.nargs = '+'
+        return option
+
+class CompiledParser(object):
+    """ Specialized parse routine for generated long options.
+
+        Dispatches tokens through a dictionary of option strings
+        with pre-bound converters. Returns `None` whenever the
+        arguments deviate from the simple `--name value` and
+        `--flag` forms or would produce an error, in which case
+        the caller has to fall back to the argparse implementation
+        to get identical results and error messages. Compact records
+        of arguments are compiled without materializing them.
+    """
+
+    def __init__(self, parser:argparse.ArgumentParser):
+        self.parser = parser
+        self.key = CompiledParser.actions_key(parser)
+        self.actions, self.records = CompiledParser._state(parser)
+        self.options, self.entries = CompiledParser._compile(parser, self.actions, self.records)
+        self.required = [option for option in self.entries if option.required]
+        self.appended = {option.dest for option in self.entries if option.append}
+
+    @staticmethod
+    def _state(parser:argparse.ArgumentParser) -> Tuple[List[argparse.Action], List[Any]]:
+        # actions and pending compact records
+        records = getattr(parser, '_records', None)
+        if records:
+            return parser._materialized_actions, list(records.values())
+        return parser._actions, []
+
+    @staticmethod
+    def actions_key(parser:argparse.ArgumentParser) -> Tuple[int, ...]:
+        actions, records = CompiledParser._state(parser)
+        return tuple(map(id, actions)) + (len(records),)
+
+    @staticmethod
+    def _compile(
+        parser:argparse.ArgumentParser,
+        actions:List[argparse.Action],
+        records:List[Any]
+    ) -> Tuple[Optional[Dict[str, _Option]], List[_Option]]:
+        # check for parser features not supported by the compiled parser
+        if (
+            (parser.prefix_chars != '-') or
+            (parser.fromfile_prefix_chars is not None) or
+            (len(parser._mutually_exclusive_groups) > 0)
+        ):
+            return None, []
+
+        entries = []
+        for action in actions:
+            if isinstance(action, _SKIPPED_ACTIONS):
+                continue
+            # only optionals of supported types
+            if (
+                (type(action) not in _VALUE_ACTIONS + _CONST_ACTIONS) or
+                (len(action.option_strings) == 0)
+            ):
+                return None, []
+            entries.append(_Option.from_action(parser, action))
+        entries.extend(_Option.from_record(parser, record) for record in records)
+
+        options = {}
+        for option in entries:
+            # check value type and number of values
+            if option.takes_values and (
+                (not _is_plain_converter(parser, option.convert)) or
+                (option.nargs not in (None, '?', '*', '+') and not isinstance(option.nargs, int))
+            ):
+                return None, []
+            # single values appended to an empty list
+            if option.append and ((option.nargs is not None) or (option.default is not None)):
+                return None, []
+            # index by long option strings
+            for option_string in option.option_strings:
+                if option_string.startswith('--'):
+                    options[option_string] = option
+
+        return options, entries
+
+    @property
+    def supported(self) -> bool:
+        return self.options is not None
+
+    def _convert(self, option:_Option, arg_string:str) -> Any:
+        # raises on invalid values
+        value = option.convert(arg_string)
+        if (option.choices is not None) and (value not in option.choices):
+            raise ValueError(arg_string)
+        return value
+
+    def _scan(self, args:Sequence[str], provided:Container[str] =()) -> Optional[Tuple[Dict[str, Any], set]]:
+        # converted values by destination and the set of given
+        # options, `None` if argparse has to handle the arguments,
+        # required options of `provided` destinations may be missing
+        options = self.options
+        values, seen_options = {}, set()
+        i, n = 0, len(args)
+        try:
+            while i < n:
+                # every segment starts with a known long option
+                option = options.get(args[i])
+                if option is None:
+                    return None
+                # collect following value tokens
+                j = i + 1
+                while (j < n) and not args[j].startswith('-'):
+                    j += 1
+                arg_strings = args[i+1:j]
+                num_values = j - i - 1
+                nargs = option.nargs
+
+                if not option.takes_values:
+                    # flags do not accept values
+                    if num_values > 0:
+                        return None
+                    value = option.const
+                elif nargs is None:
+                    if num_values != 1:
+                        return None
+                    value = self._convert(option, arg_strings[0])
+                elif nargs == '?':
+                    if num_values > 1:
+                        return None
+                    elif num_values == 1:
+                        value = self._convert(option, arg_strings[0])
+                    else:
+                        value = option.const
+                        if isinstance(value, str):
+                            value = self._convert(option, value)
+                        elif (option.choices is not None) and (value not in option.choices):
+                            return None
+                elif nargs == '*':
+                    value = [self._convert(option, s) for s in arg_strings]
+                elif nargs == '+':
+                    if num_values == 0:
+                        return None
+                    if option.convert_all is not None:
+                        value = option.convert_all(arg_strings)
+                    else:
+                        value = [self._convert(option, s) for s in arg_strings]
+                else:
+                    if num_values != nargs:
+                        return None
+                    value = [self._convert(option, s) for s in arg_strings]
+
+                # later options win for shared destinations
+                previous = values.pop(option.dest, None)
+                values[option.dest] = (previous or []) + [value] if option.append else value
+                seen_options.add(option)
+                i = j
+
+        except (argparse.ArgumentError, argparse.ArgumentTypeError, TypeError, ValueError):
+            # invalid value, let argparse report the error
+            return None
+
+        # check required arguments
+        for option in self.required:
+            if (option not in seen_options) and (option.dest not in provided):
+                return None
+        return values, seen_options
+
+    def _convert_default(self, option:_Option, default:str) -> Any:
+        if option.action is not None:
+            return self.parser._get_value(option.action, default)
+        return option.convert(default)
+
+    def parse(
+        self, 
+        args:Sequence[str], 
+        namespace:Optional[argparse.Namespace] =None,
+        provided:Container[str] =()
+    ) -> Optional[argparse.Namespace]:
+        if self.options is None:
+            return None
+
+        parser, options = self.parser, self.options
+        # work on a copy of the given namespace as it must
+        # be left untouched when falling back to argparse
+        if namespace is None:
+            namespace = argparse.Namespace()
+        elif type(namespace) is argparse.Namespace:
+            namespace = argparse.Namespace(**vars(namespace))
+        else:
+            return None
+
+        scanned = self._scan(args, provided)
+        if scanned is None:
+            return None
+        values, seen_options = scanned
+
+        # add any action defaults
+        for action in self.actions:
+            if action.dest is not argparse.SUPPRESS:
+                if not hasattr(namespace, action.dest):
+                    if action.default is not argparse.SUPPRESS:
+                        setattr(namespace, action.dest, action.default)
+        for record in self.records:
+            option = options[record.option_string]
+            if not hasattr(namespace, option.dest):
+                setattr(namespace, option.dest, option.default)
+        # add any parser defaults
+        for dest in parser._defaults:
+            if not hasattr(namespace, dest):
+                setattr(namespace, dest, parser._defaults[dest])
+
+        for dest, value in values.items():
+            if dest in self.appended:
+                # append to values of the given namespace
+                value = list(getattr(namespace, dest, None) or []) + value
+            setattr(namespace, dest, value)
+
+        # convert string defaults
+        try:
+            for option in self.entries:
+                if option not in seen_options:
+                    default = option.action.default if option.action is not None else option.default
+                    if (
+                        isinstance(default, str) and
+                        hasattr(namespace, option.dest) and
+                        (default is getattr(namespace, option.dest))
+                    ):
+                        setattr(namespace, option.dest, self._convert_default(option, default))
+        except (argparse.ArgumentError, argparse.ArgumentTypeError, TypeError, ValueError):
+            return None
+
+        return namespace
+
+    def _column_defaults(self) -> Optional[Dict[str, Any]]:
+        # default value of every destination as filled in by
+        # `parse`, with string defaults converted once
+        defaults, sources = {}, {}
+        for action in self.actions:
+            if (action.dest is not argparse.SUPPRESS) and (action.default is not argparse.SUPPRESS):
+                defaults.setdefault(action.dest, action.default)
+        for record in self.records:
+            option = self.options[record.option_string]
+            defaults.setdefault(option.dest, option.default)
+        for dest, default in self.parser._defaults.items():
+            defaults.setdefault(dest, default)
+        try:
+            for option in self.entries:
+                default = option.action.default if option.action is not None else option.default
+                if isinstance(default, str) and (defaults.get(option.dest, None) is default):
+                    defaults[option.dest] = self._convert_default(option, default)
+        except (argparse.ArgumentError, argparse.ArgumentTypeError, TypeError, ValueError):
+            return None
+        return defaults
+
+    def parse_rows(
+        self,
+        rows:Iterable[Any],
+        fallback:Callable[[Any], Tuple[Dict[str, Any], Optional[str]]]
+    ) -> Optional[Tuple[Dict[str, List[Any]], List[Optional[str]]]]:
+        """ Parse rows of arguments directly into columns.
+
+            Values are appended to one list per destination without
+            building a namespace per row. Rows not handled by the
+            compiled parser, including mappings, are parsed by the
+            `fallback` returning the values and error of a row.
+        """
+        if self.options is None:
+            return None
+        defaults = self._column_defaults()
+        if defaults is None:
+            return None
+
+        columns = {dest: [] for dest in defaults}
+        appenders = [(columns[dest].append, default) for dest, default in defaults.items()]
+        errors = []
+        for i, row in enumerate(rows):
+            scanned = None if isinstance(row, Mapping) else self._scan(row)
+            if scanned is not None:
+                # fill in defaults and overwrite given values
+                for append, default in appenders:
+                    append(default)
+                for dest, value in scanned[0].items():
+                    columns[dest][-1] = value
+                errors.append(None)
+                continue
+            values, error = fallback(row)
+            errors.append(error)
+            for dest, col in columns.items():
+                col.append(values.get(dest, None))
+            # add new columns
+            for dest, value in values.items():
+                if dest not in columns:
+                    columns[dest] = [None] * i + [value]
+            # rows parsed by the compiled parser have no values for new columns
+            appenders = [(col.append, defaults.get(dest, None)) for dest, col in columns.items()]
+        return columns, errors
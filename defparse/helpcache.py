@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .cache import atomic_write
+
+def file_fingerprint(path:str) -> Optional[Tuple[str, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+def main_file() -> Optional[str]:
+    # script building the parser
+    path = getattr(sys.modules.get('__main__'), '__file__', None)
+    return os.path.abspath(path) if path is not None else None
+
+def command_paths(parser:argparse.ArgumentParser, path:Tuple[str, ...] =()) -> Dict[int, Tuple[str, ...]]:
+    """ Subcommand paths of a parser and all its subparsers by parser id. """
+    paths = {id(parser): path}
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            for name, subparser in action.choices.items():
+                paths.update(command_paths(subparser, path + (name,)))
+    return paths
+
+class HelpCache(object):
+    """ Rendered help texts stored in a JSON file.
+
+        Entries are keyed by the program name, the subcommand path,
+        the terminal width, the main script and the python version,
+        and are only valid as long as the source files of all
+        callables registered to the parser are unchanged.
+    """
+
+    def __init__(self, path:str):
+        self.path = os.path.abspath(path)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {'commands': [[]], 'entries': {}}
+        return data
+
+    @staticmethod
+    def _key(prog:str, path:Sequence[str]) -> str:
+        columns = shutil.get_terminal_size().columns
+        return json.dumps([prog, list(path), columns, main_file(), sys.version])
+
+    def lookup(self, prog:str, help_strings:Sequence[str], argv:Sequence[str]) -> Optional[str]:
+        """ Cached help text for the given command line arguments.
+
+            Only handles arguments consisting of subcommand names
+            followed by a single help option, i.e. the cases in which
+            argparse prints the help text without any other output.
+        """
+        if (len(argv) == 0) or (argv[-1] not in help_strings):
+            return None
+        path = list(argv[:-1])
+        if any(token.startswith('-') for token in path):
+            return None
+        data = self._load()
+        if path not in data['commands']:
+            return None
+        entry = data['entries'].get(HelpCache._key(prog, path), None)
+        if entry is None:
+            return None
+        # check that source files are unchanged
+        for fingerprint in entry['sources']:
+            if file_fingerprint(fingerprint[0]) != tuple(fingerprint):
+                return None
+        return entry['help']
+
+    def store(
+        self,
+        prog:str,
+        path:Sequence[str],
+        commands:List[Sequence[str]],
+        text:str,
+        sources:List[Tuple[str, int, int]]
+    ) -> None:
+        data = self._load()
+        data['commands'] = [list(p) for p in commands]
+        # the main script builds the parser
+        main = main_file()
+        if main is not None:
+            sources = sources + [file_fingerprint(main)]
+        data['entries'][HelpCache._key(prog, path)] = {
+            'help': text,
+            'sources': [list(s) for s in sorted(set(s for s in sources if s is not None))]
+        }
+        try:
+            atomic_write(self.path, json.dumps(data).encode('utf-8'))
+        except OSError:
+            # caching help is best effort
+            pass
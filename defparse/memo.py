@@ -0,0 +1,172 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from .cache import callable_key, source_fingerprint, atomic_write
+
+# content hashes of source files keyed by their fingerprint
+_source_hashes:Dict[Tuple[str, int, int], str] = {}
+_source_hashes_lock = threading.Lock()
+
+def source_hash(fn:Callable) -> Optional[str]:
+    """ Hash of the content of the source file defining the callable. """
+    fingerprint = source_fingerprint(fn)
+    if fingerprint is None:
+        return None
+    with _source_hashes_lock:
+        digest = _source_hashes.get(fingerprint, None)
+    if digest is None:
+        import hashlib
+        with open(fingerprint[0], 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with _source_hashes_lock:
+            _source_hashes[fingerprint] = digest
+    return digest
+
+# marks missing entries as `None` is a valid result
+MISSING = object()
+
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+def _canonical(value:Any) -> Any:
+    # pickle memoizes objects by identity, such that equal values
+    # would be serialized differently depending on shared objects,
+    # containers of plain values are thus encoded by their content
+    value_type = type(value)
+    if value_type in _PLAIN_TYPES:
+        return value
+    if value_type in (list, tuple):
+        return (value_type.__name__, tuple(_canonical(v) for v in value))
+    if value_type in (set, frozenset):
+        return (value_type.__name__, tuple(sorted((_canonical(v) for v in value), key=repr)))
+    if value_type is dict:
+        items = ((_canonical(k), _canonical(v)) for k, v in value.items())
+        return ('dict', tuple(sorted(items, key=repr)))
+    import pickle
+    return ('pickle', pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+class ResultStore(object):
+    """ On-disk store of results of callables.
+
+        Results are keyed by the qualified name and the source hash
+        of the callable and its keyword arguments. Entries are written
+        atomically and the least recently used entries are evicted
+        once the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory:str, max_bytes:int =2**30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def check_callable(fn:Callable) -> None:
+        # results can only be attributed to callables identified
+        # across processes and defined in a source file
+        if (callable_key(fn) is None) or (source_fingerprint(fn) is None):
+            raise TypeError("Cannot memoize results of %r, only callables defined at module level in a source file are supported" % fn)
+
+    def key(self, fn:Callable, kwargs:Dict[str, Any]) -> Optional[str]:
+        """ Key of a call, `None` if the arguments cannot be serialized. """
+        import hashlib
+        try:
+            kwargs = tuple(sorted((k, _canonical(v)) for k, v in kwargs.items()))
+        except Exception:
+            return None
+        data = repr((callable_key(fn), source_hash(fn), kwargs)).encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, key:str) -> str:
+        return os.path.join(self.directory, key + '.pickle')
+
+    def get(self, key:str) -> Any:
+        """ Load a result, returns `MISSING` if there is no entry. """
+        import pickle
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except Exception:
+            return MISSING
+        # mark entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key:str, result:Any) -> None:
+        import pickle
+        try:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # results that cannot be serialized are not stored
+            return
+        if len(data) > self.max_bytes:
+            return
+        try:
+            atomic_write(self._path(key), data)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """ Remove least recently used entries exceeding the size bound. """
+        entries, total = [], 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.pickle'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        # remove oldest entries first
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                # removed by another process
+                pass
+            total -= size
+
+    def call(
+        self,
+        fn:Callable,
+        kwargs:Dict[str, Any],
+        call:Callable[[], Any],
+        refresh:bool =False
+    ) -> Any:
+        """ Return the stored result of the call or compute and store it.
+
+            The result is computed by `call` if there is no entry or
+            `refresh` is set, and stored unless it cannot be serialized.
+        """
+        key = self.key(fn, kwargs)
+        if key is None:
+            return call()
+        if not refresh:
+            result = self.get(key)
+            if result is not MISSING:
+                return result
+        result = call()
+        self.put(key, result)
+        return result
+
+class Memoized(object):
+    """ Callable storing the results of `fn` in a result store.
+
+        Picklable as long as `fn` is, i.e. can be sent to the
+        workers of a process pool.
+    """
+
+    def __init__(self, fn:Callable, store:ResultStore, refresh:bool =False):
+        self.fn = fn
+        self.store = store
+        self.refresh = refresh
+
+    def __call__(self, **kwargs) -> Any:
+        return self.store.call(self.fn, kwargs, lambda: self.fn(**kwargs), refresh=self.refresh)
@@ -1,30 +1,116 @@
 from __future__ import annotations
+import os
+import sys
+import copy
+import time
+import atexit
 import inspect
+import weakref
+import threading
+import importlib
 import argparse
-from docstring_parser import parse
-from types import SimpleNamespace
+import contextvars
+from types import SimpleNamespace, MappingProxyType, MethodType
 from dataclasses import dataclass
 # type hints
 from typing import (
     Any,
-    Set, 
+    Dict,
     List,
     Tuple,
     Union,
     Literal, 
     Optional,
     TypeVar, 
-    Callable 
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TYPE_CHECKING
 )
-from typing import get_origin, get_args
-from .typehints import Ignore
-# import to allow correct type inference from type hints
-# like 'typing.Optional' and `defparse.Ignore` in docstring
-import typing
-import defparse.typehints as defparse
+from .resolver import resolve_name, resolve_type
+from .cache import SpecCache, source_fingerprint
+from .fastpath import CompiledParser
+from .arrays import ArrayAction
+from .profiling import Profiler, phase
+from .config import (
+    load_config,
+    file_key as config_file_key,
+    find_action as find_config_action,
+    convert_value as convert_config_value,
+    from_env_string
+)
+
+# heavy modules are imported on first use to keep
+# the import of defparse fast, see `defparse.__init__`
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from .sweep import SweepResult
+    from .memo import ResultStore
 
 T = TypeVar('T')
 
+# raise parse errors instead of exiting, see `ArgumentParser.parse_many`
+_raise_errors = contextvars.ContextVar('defparse_raise_errors', default=False)
+
+class _ParseError(Exception):
+    pass
+
+# values of config files or records left to the arguments of
+# the selected subcommands, see `ArgumentParser.parse_known_args`
+_subcommand_values = contextvars.ContextVar('defparse_subcommand_values', default=None)
+
+def _copy_value(value:Any) -> Any:
+    # deep copy of a mutable value, read-only arrays
+    # mapped from files are shared instead of loaded
+    if type(value) in _LITERAL_TYPES:
+        return value
+    flags = getattr(value, 'flags', None)
+    if (flags is not None) and (getattr(flags, 'writeable', True) is False):
+        return value
+    return copy.deepcopy(value)
+
+# converted values of required arguments given by environment variables,
+# config files or records by placeholder, see `ArgumentParser._provided_args`
+_provided_values = contextvars.ContextVar('defparse_provided_values', default=None)
+
+# number of edits of namespaces returned by `parse_args`
+_namespace_edits = 0
+
+class _Namespace(argparse.Namespace):
+    """ Namespace counting edits to invalidate cached keyword arguments. """
+
+    def __setattr__(self, name:str, value:Any) -> None:
+        global _namespace_edits
+        _namespace_edits += 1
+        super(_Namespace, self).__setattr__(name, value)
+
+    def __delattr__(self, name:str) -> None:
+        global _namespace_edits
+        _namespace_edits += 1
+        super(_Namespace, self).__delattr__(name)
+
+    def __repr__(self) -> str:
+        # shown like the namespaces returned by argparse
+        return repr(argparse.Namespace(**vars(self)))
+
+def parse(doc:str):
+    # parse docstring, importing the parser on first use
+    from docstring_parser import parse as parse_docstring
+    return parse_docstring(doc)
+
+def _has_running_loop() -> bool:
+    # no loop can be running before asyncio is imported
+    asyncio = sys.modules.get('asyncio', None)
+    if asyncio is None:
+        return False
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
 class uses(object):
     USED_FUNCTIONS_KEY = "__uses_functions__"
 
@@ -38,180 +124,1585 @@ class uses(object):
             setattr(fn, uses.USED_FUNCTIONS_KEY, {self.used_fn})
         return fn
 
-@dataclass
-class ArgsContainer():
-    _parser:ArgumentParser
-    _arg_names:Set[str]
-    fn:Callable[[Any, ...], [T]]
+class ArgsContainer(object):
+    __slots__ = (
+        '_parser', '_arg_names', '_keys', 'fn', '_parse_key', '_kwargs', '_store',
+        '_group', '_ignore', '_option_strings', '_digest', '_is_async'
+    )
 
-    @property
-    def kwargs(self) -> Dict[str, Any]:
+    def __init__(
+        self,
+        _parser:ArgumentParser,
+        _arg_names:Iterable[str],
+        fn:Callable[[Any, ...], [T]],
+        _store:Optional[ResultStore] =None
+    ):
+        self._parser = _parser
+        self.fn = fn
+        # checked once, updated whenever the callable is replaced
+        self._is_async = inspect.iscoroutinefunction(fn)
+        # store of memoized results, see `ArgumentParser(result_cache=...)`
+        self._store = _store
+        # keys to extract from the parsed arguments
+        # in order of registration
+        self._keys = tuple(_arg_names)
+        self._arg_names = set(self._keys)
+        # keyword arguments of the last parse result
+        self._parse_key = None
+        self._kwargs = None
+        # registration state, see `ArgumentParser.replace_callable`
+        self._group = None
+        self._ignore = ()
+        self._option_strings = []
+        self._digest = None
+
+    def __repr__(self) -> str:
+        return "%s(fn=%r, arg_names=%r)" % (type(self).__name__, self.fn, self._arg_names)
+
+    def _extract(self, values:Mapping[str, Any]) -> Dict[str, Any]:
+        return {k: values[k] for k in self._keys if k in values}
+
+    def _get_kwargs(self) -> Dict[str, Any]:
         # check if arguments are present
-        if not hasattr(self._parser, '_parsed_args'):
+        parsed_args = getattr(self._parser, '_parsed_args', None)
+        if parsed_args is None:
             raise RuntimeError("No parsed arguments found! Did you forget to call `parse_args`?")
+        # extract arguments once per call of `parse_args` unless
+        # the namespace was edited or provided by the caller
+        key = (self._parser._parse_count, _namespace_edits) if isinstance(parsed_args, _Namespace) else None
+        if (key is None) or (key != self._parse_key):
+            self._kwargs = self._extract(vars(parsed_args))
+            self._parse_key = key
+        return self._kwargs
+
+    def bind(self, result:ParseResult) -> BoundArgs[T]:
+        """ Bind the container to a parse result of `ArgumentParser.parse`. """
+        return BoundArgs(self, self._extract(result.values))
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
         # get all arguments
-        return {k:v for k, v in vars(self._parser._parsed_args).items() if k in self._arg_names}
+        return self._get_kwargs().copy()
+
+    @property
+    def is_async(self) -> bool:
+        return self._is_async
 
     def execute(self, **extra_kwargs) -> T:
-        return self.fn(**self.kwargs, **extra_kwargs)
+        return self._execute(self._get_kwargs(), extra_kwargs)
+
+    async def aexecute(self, **extra_kwargs) -> T:
+        return await self._aexecute(self._get_kwargs(), extra_kwargs)
+
+    def refresh(self, **extra_kwargs) -> T:
+        """ Execute the callable and replace its memoized result. """
+        return self._execute(self._get_kwargs(), extra_kwargs, memo='refresh')
+
+    def execute_uncached(self, **extra_kwargs) -> T:
+        """ Execute the callable bypassing its memoized results. """
+        return self._execute(self._get_kwargs(), extra_kwargs, memo='bypass')
+
+    def _executable(self, memo:str ='use') -> Callable[..., T]:
+        # callable executing the container, results of memoized
+        # containers are handled by a picklable wrapper
+        if (self._store is None) or (memo == 'bypass'):
+            return self.fn
+        from .memo import Memoized
+        return Memoized(self.fn, self._store, refresh=(memo == 'refresh'))
+
+    def _call(self, kwargs:Dict[str, Any], extra_kwargs:Dict[str, Any], memo:str ='use') -> T:
+        if self._store is None:
+            return self.fn(**kwargs, **extra_kwargs)
+        return self._executable(memo)(**kwargs, **extra_kwargs)
+
+    def _execute(self, kwargs:Dict[str, Any], extra_kwargs:Dict[str, Any], memo:str ='use') -> T:
+        if not self._is_async:
+            profiler = self._parser.profiler
+            if profiler is None:
+                return self._call(kwargs, extra_kwargs, memo)
+            with profiler.phase(self.fn, 'execute'):
+                return self._call(kwargs, extra_kwargs, memo)
+        # run coroutine functions in a new event loop unless
+        # called from a running loop, where the coroutine
+        # is returned to be awaited by the caller
+        if not _has_running_loop():
+            import asyncio
+            return asyncio.run(self._aexecute(kwargs, extra_kwargs))
+        with phase(self._parser.profiler, self.fn, 'execute'):
+            return self._call(kwargs, extra_kwargs, memo)
+
+    async def _aexecute(self, kwargs:Dict[str, Any], extra_kwargs:Dict[str, Any], memo:str ='use') -> T:
+        if self._is_async:
+            with phase(self._parser.profiler, self.fn, 'execute'):
+                return await self.fn(**kwargs, **extra_kwargs)
+        # run synchronous callables in a thread to
+        # avoid blocking the event loop
+        import asyncio
+        return await asyncio.to_thread(self._call, kwargs, extra_kwargs, memo)
 
     def __call__(self, **extra_kwargs) -> T:
         return self.execute(**extra_kwargs)
 
+    def sweep(
+        self,
+        *,
+        over:Optional[Sequence[str]] =None,
+        mode:Literal['product', 'zip'] ='product',
+        executor:Union[Literal['process', 'thread'], Executor] ='process',
+        max_workers:Optional[int] =None,
+        chunksize:int =1,
+        ordered:bool =True,
+        **extra_kwargs
+    ) -> Iterator[SweepResult]:
+        """ Execute the callable for all points of a sweep.
+
+            Sweeps over the arguments marked by `Sweep` or the
+            arguments given in `over`, which must hold lists, sets
+            or tuples. Arguments are parsed once and the callable
+            is executed on a process or thread pool, see
+            `defparse.sweep.run_sweep`.
+        """
+        from .sweep import expand, run_sweep
+        kwargs = self._get_kwargs().copy()
+        if over is None:
+            # sweep over arguments marked by `Sweep`
+            over = [k for k in self._keys if k in self._parser._sweep_dests]
+            for k in over:
+                if not isinstance(kwargs[k], (list, tuple, set, frozenset)):
+                    kwargs[k] = [kwargs[k]]
+        return run_sweep(
+            self.fn,
+            expand(kwargs, over, mode=mode),
+            executor=executor,
+            max_workers=max_workers,
+            chunksize=chunksize,
+            ordered=ordered,
+            extra_kwargs=extra_kwargs
+        )
+
+    def execute_batch(self, batch:BatchResult, **extra_kwargs) -> List[Optional[T]]:
+        """ Execute the callable for all valid rows of a batch.
+
+            Returns the results in the order of the rows of the batch.
+            Rows that failed to parse result in `None`.
+        """
+        results = [None] * len(batch)
+        for i, kwargs in batch.iter_kwargs(self):
+            results[i] = self._execute(kwargs, extra_kwargs)
+        return results
+
+class _ArgRecord(object):
+    """ Compact registered argument, see `ArgumentParser(compact=True)`. """
+    __slots__ = ('option_string', 'arg', 'group', 'fn', 'deferred_help', 'detached')
+
+    def __init__(self, option_string:str, arg:ArgumentSpec, group:_LazyGroup, fn:Callable, deferred_help:bool):
+        self.option_string = option_string
+        self.arg = arg
+        self.group = group
+        self.fn = fn
+        self.deferred_help = deferred_help
+        # action not added to the parser, see `ArgumentParser._record_action`
+        self.detached = None
+
+    @property
+    def dest(self) -> str:
+        return self.option_string[2:].replace('-', '_')
+
+class _LazyGroup(object):
+    """ Argument group created when its first argument is materialized. """
+    __slots__ = ('title', 'group')
+
+    def __init__(self, title:str):
+        self.title = title
+        self.group = None
+
+    def resolve(self, parser:argparse.ArgumentParser) -> argparse._ArgumentGroup:
+        if self.group is None:
+            self.group = parser.add_argument_group(self.title)
+        return self.group
+
+class BoundArgs(object):
+    """ Argument container bound to a parse result.
+
+        Holds the keyword arguments extracted from the parse result,
+        independent of any later parse of the parser.
+    """
+    __slots__ = ('container', '_kwargs')
+
+    def __init__(self, container:ArgsContainer[T], kwargs:Dict[str, Any]):
+        self.container = container
+        self._kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return "%s(fn=%r, kwargs=%r)" % (type(self).__name__, self.container.fn, self._kwargs)
+
+    @property
+    def fn(self) -> Callable[..., T]:
+        return self.container.fn
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return self._kwargs.copy()
+
+    def execute(self, **extra_kwargs) -> T:
+        return self.container._execute(self._kwargs, extra_kwargs)
+
+    async def aexecute(self, **extra_kwargs) -> T:
+        return await self.container._aexecute(self._kwargs, extra_kwargs)
+
+    def refresh(self, **extra_kwargs) -> T:
+        return self.container._execute(self._kwargs, extra_kwargs, memo='refresh')
+
+    def execute_uncached(self, **extra_kwargs) -> T:
+        return self.container._execute(self._kwargs, extra_kwargs, memo='bypass')
+
+    def __call__(self, **extra_kwargs) -> T:
+        return self.execute(**extra_kwargs)
+
+@dataclass(frozen=True)
+class ParseResult():
+    """ Immutable result of `ArgumentParser.parse`.
+
+        Parsed values are accessible as attributes. Containers are
+        bound to the result by `result[container]`, which is safe to
+        use while other threads parse with the same parser.
+    """
+    values:Mapping[str, Any]
+
+    def __getattr__(self, name:str) -> Any:
+        # only called for names that are no attributes
+        if name == 'values':
+            raise AttributeError(name)
+        try:
+            return self.values[name]
+        except KeyError:
+            raise AttributeError("%s has no argument `%s`" % (type(self).__name__, name))
+
+    def __getitem__(self, target:Union[ArgsContainer[T], Subcommands]) -> BoundArgs[T]:
+        return target.bind(self)
+
+    def __contains__(self, name:str) -> bool:
+        return name in self.values
+
+    @property
+    def namespace(self) -> argparse.Namespace:
+        return argparse.Namespace(**self.values)
+
+@dataclass
+class BatchResult():
+    """ Columnar result of `ArgumentParser.parse_many`.
+
+        Holds one list of values per argument and one error message
+        per row. Values of rows that failed to parse are `None`.
+    """
+    columns:Dict[str, List[Any]]
+    errors:List[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    @property
+    def valid_rows(self) -> List[int]:
+        return [i for i, error in enumerate(self.errors) if error is None]
+
+    def kwargs(self, container:ArgsContainer, row:int) -> Dict[str, Any]:
+        # check if row was parsed successfully
+        if self.errors[row] is not None:
+            raise RuntimeError("Row %i failed to parse: %s" % (row, self.errors[row]))
+        return {k: self.columns[k][row] for k in container._keys if k in self.columns}
+
+    def iter_kwargs(self, container:ArgsContainer) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        # only keep columns relevant to the container
+        columns = [(k, self.columns[k]) for k in container._keys if k in self.columns]
+        for i, error in enumerate(self.errors):
+            if error is None:
+                yield i, {k: col[i] for k, col in columns}
+
+# marks missing types and default values
+_empty = inspect.Parameter.empty
+
+@dataclass(frozen=True)
+class ArgumentSpec():
+    name:str
+    type:Any =_empty
+    default:Any =_empty
+    required:bool =True
+    nargs:Union[int, str, None] =None
+    choices:Optional[Tuple[Any, ...]] =None
+    help:Optional[str] =None
+    sweep:bool =False
+    array:bool =False
+    error:Optional[Exception] =None
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        # build keyword arguments for `add_argument`
+        kwargs = {'required': self.required}
+        if self.default is not _empty:
+            kwargs['default'] = self.default
+        if self.type is not _empty:
+            kwargs['type'] = self.type
+        if self.nargs is not None:
+            kwargs['nargs'] = self.nargs
+        if self.choices is not None:
+            kwargs['choices'] = self.choices
+        if self.help is not None:
+            kwargs['help'] = self.help
+        return kwargs
+
+    @property
+    def action_kwargs(self) -> Dict[str, Any]:
+        # keyword arguments for `add_argument` including the action
+        kwargs = self.kwargs
+        if self.array:
+            # convert all values to a numpy array at once
+            kwargs['action'] = ArrayAction
+            kwargs['dtype'] = kwargs.pop('type')
+        # simple boolean arguments as options
+        elif (kwargs['type'] is bool) and ('nargs' not in kwargs):
+            kwargs['action'] = 'store_false' if kwargs.get('default', False) else 'store_true'
+            kwargs.pop('type')
+        return kwargs
+
+# default values keeping their meaning when loaded from the
+# persistent cache, others are compared by identity, e.g. sentinels
+_LITERAL_TYPES = (type(None), bool, int, float, str)
+
+def _is_literal(value:Any) -> bool:
+    if type(value) is tuple:
+        return all(_is_literal(v) for v in value)
+    return type(value) in _LITERAL_TYPES
+
+@dataclass(frozen=True)
+class CallableSpec():
+    arguments:Tuple[ArgumentSpec, ...]
+    has_var_keyword:bool =False
+    uses:Tuple[Callable, ...] =()
+    has_help:bool =True
+
+    @property
+    def persistent(self) -> bool:
+        # loaded defaults are copies of the original values
+        return all((arg.default is _empty) or _is_literal(arg.default) for arg in self.arguments)
+
+    @staticmethod
+    def from_callable(
+        fn:Callable[[Any], T], 
+        cache:Optional[SpecCache] =None,
+        help:bool =True,
+        profiler:Optional[Profiler] =None
+    ) -> CallableSpec:
+        """ Get the memoized spec of a callable.
+
+            Specs are built once per callable and shared by all
+            parsers of the process. Optionally the spec is also
+            loaded from and stored to a persistent cache. Without
+            `help` the docstring is only parsed if it is required
+            for type inference.
+        """
+        # check the process-wide memo
+        try:
+            with phase(profiler, fn, 'memo'):
+                spec = _spec_memo[fn]
+            if spec.has_help or not help:
+                return spec
+        except (KeyError, TypeError):
+            pass
+        # try to load the spec from the persistent cache
+        spec = None
+        if cache is not None:
+            with phase(profiler, fn, 'cache'):
+                spec = cache.load(fn)
+        if (spec is None) or (help and not spec.has_help) or not spec.persistent:
+            # introspect callable and store the result
+            spec = _build_callable_spec(fn, help=help, profiler=profiler)
+            if (cache is not None) and spec.persistent:
+                cache.store(fn, spec)
+        try:
+            _spec_memo[fn] = spec
+        except TypeError:
+            # callable cannot be weakly referenced
+            pass
+        return spec
+
+# process-wide memo of callable specs
+_spec_memo = weakref.WeakKeyDictionary()
+
+def _build_argument_spec(
+    name:str,
+    param:inspect.Parameter,
+    doc_params:Dict[str, Any],
+    fn:Callable[[Any], T] =None,
+    profiler:Optional[Profiler] =None
+) -> Optional[ArgumentSpec]:
+
+    kwargs = {'required': True}
+    sweep, array = False, False
+
+    # add default value
+    if param.default != param.empty:
+        kwargs['default'] = param.default
+        kwargs['required'] = False
+
+    # find/infer parameter type
+    if param.annotation != param.empty:
+        kwargs['type'] = param.annotation
+        # resolve string annotations in the namespace of the callable
+        if isinstance(kwargs['type'], str):
+            with phase(profiler, fn, 'eval'):
+                kwargs['type'] = resolve_name(kwargs['type'], fn)
+    elif name in doc_params:
+        with phase(profiler, fn, 'eval'):
+            kwargs['type'] = resolve_name(doc_params[name].type_name, fn)
+
+    # handle type hints
+    if 'type' in kwargs:
+
+        with phase(profiler, fn, 'typing'):
+            desc = resolve_type(kwargs['type'])
+
+        if desc.ignore:
+            # break by ignore type hint
+            return None
+
+        # update keyword arguments
+        kwargs['type'] = desc.type
+        if desc.nargs is not None:
+            kwargs['nargs'] = desc.nargs
+        if desc.choices is not None:
+            kwargs['choices'] = desc.choices
+        if desc.optional:
+            # mark as not required
+            kwargs['required'] = False
+        sweep, array = desc.sweep, desc.array
+
+    elif 'default' in kwargs:
+        # no type found, then infer from default
+        kwargs['type'] = type(kwargs['default'])
+
+    # get description from docstring
+    if name in doc_params:
+        kwargs['help'] = doc_params[name].description.replace('\n', ' ')
+
+    return ArgumentSpec(name, sweep=sweep, array=array, **kwargs)
+
+def _build_callable_spec(
+    fn:Callable[[Any], T], 
+    help:bool =True, 
+    profiler:Optional[Profiler] =None
+) -> CallableSpec:
+
+    # get function signature
+    with phase(profiler, fn, 'signature'):
+        sig = inspect.signature(fn)
+
+    # the docstring is only needed for help texts and
+    # to infer types of arguments without annotation
+    has_help = help or any(
+        (p.annotation == p.empty) and (p.kind != p.VAR_KEYWORD)
+        for p in sig.parameters.values()
+    )
+
+    # parse docstring
+    with phase(profiler, fn, 'docstring'):
+        doc = inspect.getdoc(fn) if has_help else None
+        doc_params = {p.arg_name: p for p in parse(doc).params} if doc is not None else {}
+
+    arguments = []
+    for name, param in sig.parameters.items():
+        # variable keywords are populated by used functions
+        if param.kind == param.VAR_KEYWORD:
+            continue
+        try:
+            arg = _build_argument_spec(name, param, doc_params, fn=fn, profiler=profiler)
+        except Exception as e:
+            # defer error until the argument is actually added
+            # as it might be ignored by the caller
+            arg = ArgumentSpec(name, error=e)
+        # skip arguments marked by ignore type hint
+        if arg is not None:
+            arguments.append(arg)
+
+    return CallableSpec(
+        arguments=tuple(arguments),
+        has_var_keyword=any((p.kind == p.VAR_KEYWORD for p in sig.parameters.values())),
+        uses=tuple(getattr(fn, uses.USED_FUNCTIONS_KEY, ())),
+        has_help=has_help
+    )
+
+def resolve_uses(
+    fn:Callable[[Any], T],
+    cache:Optional[SpecCache] =None,
+    help:bool =True,
+    profiler:Optional[Profiler] =None
+) -> List[Tuple[Callable, CallableSpec]]:
+    """ Resolve the graph of callables registered via `uses`.
+
+        Returns the callable and all callables populating its
+        variable keyword arguments in topological order, i.e.
+        used callables precede the callables using them. Each
+        callable is visited once, even if it is used by several
+        callables. Raises a `RuntimeError` on cyclic dependencies.
+    """
+    resolved = []
+    # callables that are fully resolved
+    visited = set()
+    # path of callables currently being resolved
+    path, on_path = [], set()
+    # stack of (callable, spec, iterator over used callables)
+    spec = CallableSpec.from_callable(fn, cache=cache, help=help, profiler=profiler)
+    stack = [(fn, spec, iter(spec.uses if spec.has_var_keyword else ()))]
+    path.append(fn); on_path.add(fn)
+
+    while len(stack) > 0:
+        node, spec, children = stack[-1]
+        # find next used callable that is not resolved yet
+        for child in children:
+            if child in on_path:
+                cycle = path[path.index(child):] + [child]
+                raise RuntimeError("Cyclic `uses` dependency: %s" % " -> ".join(
+                    getattr(f, '__qualname__', repr(f)) for f in cycle
+                ))
+            if child not in visited:
+                break
+        else:
+            # all used callables are resolved
+            stack.pop()
+            path.pop(); on_path.remove(node)
+            visited.add(node)
+            resolved.append((node, spec))
+            continue
+        # descend into used callable
+        child_spec = CallableSpec.from_callable(child, cache=cache, help=help, profiler=profiler)
+        stack.append((child, child_spec, iter(child_spec.uses if child_spec.has_var_keyword else ())))
+        path.append(child); on_path.add(child)
+
+    return resolved
+
+def _used_callables(fn:Callable) -> List[Callable]:
+    # the callable and all callables it uses
+    found, stack = [], [fn]
+    while len(stack) > 0:
+        f = stack.pop()
+        if f not in found:
+            found.append(f)
+            stack.extend(getattr(f, uses.USED_FUNCTIONS_KEY, ()))
+    return found
+
+def _callable_digest(fn:Callable) -> int:
+    # hash of the signatures and docstrings the arguments
+    # of a callable and its used callables are built from
+    parts = []
+    for f in _used_callables(fn):
+        try:
+            signature = str(inspect.signature(f))
+        except (TypeError, ValueError):
+            signature = None
+        parts.append((getattr(f, '__qualname__', repr(f)), signature, getattr(f, '__doc__', None)))
+    return hash(tuple(sorted(parts, key=repr)))
+
+def _current_callable(fn:Callable) -> Callable:
+    # callable currently bound to the qualified name of the
+    # given callable, e.g. after reloading or redefining it,
+    # the callable itself if the name cannot be resolved
+    if inspect.ismethod(fn):
+        # bind the current function to the same object
+        func = _current_callable(fn.__func__)
+        return MethodType(func, fn.__self__) if inspect.isfunction(func) else fn
+    obj = sys.modules.get(getattr(fn, '__module__', None), None)
+    for attr in getattr(fn, '__qualname__', '<locals>').split('.'):
+        obj = getattr(obj, attr, None)
+    if (type(obj) is not type(fn)) or not callable(obj):
+        return fn
+    return obj
+
+def _check_arg_type(argname:str, registered_type:Any, arg:ArgumentSpec, fn:Callable) -> None:
+    # parameters sharing a registered argument need matching types
+    kwargs = arg.kwargs
+    if ('type' in kwargs) and (
+        (registered_type != kwargs['type']) if arg.array else
+        (registered_type is not kwargs['type'])
+    ):
+        raise TypeError("Type conflict between registered argument `%s?`:`%s` and corresponding parameter of callable %s" % (argname, registered_type, fn))
+
 class ArgumentParser(argparse.ArgumentParser):
 
-    def __init__(self, *args, formatter:Callable[[str], str] =lambda n: n, **kwargs):
+    def __init__(
+        self, 
+        *args, 
+        formatter:Callable[[str], str] =lambda n: n, 
+        cache_dir:Optional[str] =None,
+        lazy_help:bool =False,
+        fast_path:bool =True,
+        config_option:Optional[str] =None,
+        compact:bool =False,
+        profiler:Optional[Profiler] =None,
+        profile_option:Optional[str] =None,
+        help_cache:Optional[str] =None,
+        env_prefix:Optional[str] =None,
+        result_cache:Optional[str] =None,
+        result_cache_size:int =2**30,
+        **kwargs
+    ):
         super(ArgumentParser, self).__init__(*args, **kwargs)
+        # print help from cache before any callable is registered
+        self._help_cache = None
+        self._help_sources = set()
+        if help_cache is not None:
+            from .helpcache import HelpCache
+            self._help_cache = HelpCache(help_cache)
+            self._print_cached_help()
         # save argument formatter
         self.formatter = formatter
+        # persistent cache for introspected callables
+        self._spec_cache = SpecCache(cache_dir) if cache_dir is not None else None
+        # on-disk store of results of memoized callables
+        self._result_store = None
+        if result_cache is not None:
+            from .memo import ResultStore
+            self._result_store = ResultStore(result_cache, max_bytes=result_cache_size)
+        # number of calls of `parse_args`, see `ArgsContainer._get_kwargs`
+        self._parse_count = 0
+        # lazily registered subcommand, see `add_subcommands`
+        self._subcommand = None
+        self._populate_lock = threading.Lock()
+        # defer help texts from docstrings until help is rendered
+        self._lazy_help = lazy_help
+        self._deferred_help = []
+        # destinations of arguments marked by `Sweep`
+        self._sweep_dests = set()
+        # specialized parser compiled from registered actions
+        self._fast_path = fast_path
+        self._compiled = None
+        # compact records of registered arguments by option string
+        # which are materialized into actions on first access
+        self._compact = compact
+        self._records = {}
+        self._materialize_lock = threading.RLock()
+        self._materializing = False
+        # registered containers and number of callables
+        # using each argument added from a callable
+        self._containers = {}
+        self._arg_refs = {}
+        # collect timings of introspection, parsing and execution
+        self.profiler = profiler
+        self._profile_dest = None
+        if profile_option is not None:
+            self._profile_dest = self.add_argument(
+                profile_option, 
+                action='store_true', 
+                help="print a breakdown of the time spent by defparse on exit"
+            ).dest
+            # profiling needs to be enabled before any callable
+            # is registered, i.e. before arguments are parsed
+            if (self.profiler is None) and (profile_option in sys.argv[1:]):
+                self._enable_profiler()
+        # option to load argument values from config files
+        self._config_option = config_option
+        self._config_values = {}
+        # bind options to environment variables `PREFIX_<NAME>`
+        self._env_prefix = env_prefix.rstrip('_') + '_' if env_prefix is not None else None
+        self._env_actions = None
+        if config_option is not None:
+            self.add_argument(
+                config_option, 
+                action='append', 
+                default=None, 
+                metavar='PATH',
+                help="JSON or TOML file providing argument values, can be given multiple times, command line arguments take precedence"
+            )
 
-    def parse_args(self, *args, **kwargs):
+    @property
+    def _actions(self) -> List[argparse.Action]:
+        # argparse and anything else accessing the actions
+        # requires all compact records to be materialized
+        if self.__dict__.get('_records', None):
+            self._materialize()
+        return self.__dict__['_action_list']
+
+    @_actions.setter
+    def _actions(self, actions:List[argparse.Action]) -> None:
+        self.__dict__['_action_list'] = actions
+
+    @property
+    def _materialized_actions(self) -> List[argparse.Action]:
+        # actions without materializing compact records
+        return self.__dict__['_action_list']
+
+    def _argument_group(self, title:str) -> Union[argparse._ArgumentGroup, _LazyGroup]:
+        return _LazyGroup(title) if self._compact else self.add_argument_group(title)
+
+    def _materialize(self) -> None:
+        # create groups and actions of all compact records
+        with self._materialize_lock:
+            if self._materializing or (len(self._records) == 0):
+                return
+            self._materializing = True
+            try:
+                deferred = {}
+                for record in self._records.values():
+                    group = record.group.resolve(self)
+                    with phase(self.profiler, record.fn, 'register'):
+                        action = group.add_argument(record.option_string, **record.arg.action_kwargs)
+                    # help text is added when help is rendered
+                    if record.deferred_help:
+                        deferred.setdefault(record.fn, {})[record.arg.name] = action
+                self._deferred_help.extend(deferred.items())
+                self._records = {}
+            finally:
+                self._materializing = False
+
+    def _print_cached_help(self) -> None:
+        help_strings = [
+            option_string 
+            for action in self._actions if isinstance(action, argparse._HelpAction)
+            for option_string in action.option_strings
+        ]
+        text = self._help_cache.lookup(self.prog, help_strings, sys.argv[1:])
+        if text is not None:
+            self._print_message(text, sys.stdout)
+            self.exit()
+
+    def _store_help(self, text:str) -> None:
+        root = self._subcommand.root if self._subcommand is not None else self
+        if root._help_cache is None:
+            return
+        from .helpcache import command_paths
+        paths = command_paths(root)
+        if id(self) in paths:
+            root._help_cache.store(root.prog, paths[id(self)], list(paths.values()), text, list(self._help_sources))
+
+    def _record_action(self, record:_ArgRecord) -> argparse.Action:
+        # action of a compact record that is not added to the parser,
+        # e.g. to convert values from environment variables or config
+        # files without materializing all records
+        if record.detached is None:
+            kwargs = self._get_optional_kwargs(record.option_string, **record.arg.action_kwargs)
+            if ('default' not in kwargs) and (kwargs['dest'] in self._defaults):
+                kwargs['default'] = self._defaults[kwargs['dest']]
+            record.detached = self._pop_action_class(kwargs)(**kwargs)
+        return record.detached
+
+    def _env_index(self) -> Dict[str, argparse.Action]:
+        # index of environment variable names to actions
+        # rebuilt whenever actions are added to the parser
+        key = CompiledParser.actions_key(self)
+        if (self._env_actions is None) or (self._env_actions[0] != key):
+            index = {}
+            actions = self._materialized_actions + [self._record_action(r) for r in self._records.values()]
+            for action in actions:
+                if isinstance(action, (argparse._HelpAction, argparse._VersionAction)):
+                    continue
+                if (self._config_option is not None) and (self._config_option in action.option_strings):
+                    continue
+                for option_string in action.option_strings:
+                    if option_string.startswith('--'):
+                        name = option_string[2:].upper().replace('-', '_')
+                        index[self._env_prefix + name] = action
+            self._env_actions = (key, index)
+        return self._env_actions[1]
+
+    def _apply_value(
+        self,
+        action:argparse.Action,
+        value:Any,
+        namespace:argparse.Namespace,
+        provided:Dict[str, argparse.Action]
+    ) -> List[str]:
+        # set a converted value unless given before, returns the
+        # arguments of flags, command line arguments following
+        # them take precedence
+        if action.required and (action.nargs == 0):
+            # required flags need to be present in the arguments
+            return [action.option_strings[0]] if value == action.const else []
+        if not hasattr(namespace, action.dest):
+            setattr(namespace, action.dest, value)
+            if action.required:
+                provided[action.dest] = action
+        return []
+
+    def _provided_args(
+        self,
+        namespace:argparse.Namespace,
+        provided:Dict[str, argparse.Action]
+    ) -> List[str]:
+        # argparse requires required arguments to be present in the
+        # arguments, values in the namespace are passed by placeholders
+        # resolved in `_get_values` instead of converting them back
+        # to strings, which would not be the same for all values
+        values = _provided_values.get()
+        args = []
+        for dest, action in provided.items():
+            marker = "\0defparse:%i" % len(values)
+            values[marker] = getattr(namespace, dest)
+            if isinstance(action.nargs, int):
+                args.extend([action.option_strings[0]] + [marker] * action.nargs)
+            else:
+                args.append("%s=%s" % (action.option_strings[0], marker))
+        return args
+
+    def _get_values(self, action:argparse.Action, arg_strings:List[str]) -> Any:
+        if (len(arg_strings) > 0) and arg_strings[0].startswith("\0defparse:"):
+            values = _provided_values.get()
+            if (values is not None) and (arg_strings[0] in values):
+                return values[arg_strings[0]]
+        return super(ArgumentParser, self)._get_values(action, arg_strings)
+
+    def _apply_env(
+        self, 
+        args:List[str], 
+        namespace:Optional[argparse.Namespace],
+        provided:Dict[str, argparse.Action]
+    ) -> Tuple[List[str], Optional[argparse.Namespace]]:
+        index = self._env_index()
+        namespace = argparse.Namespace(**vars(namespace)) if namespace is not None else argparse.Namespace()
+        env_args = []
+        # single pass over the environment
+        for name, raw_value in os.environ.items():
+            if not name.startswith(self._env_prefix):
+                continue
+            action = index.get(name, None)
+            if action is None:
+                continue
+            try:
+                value = convert_config_value(self, action, from_env_string(action, raw_value))
+            except argparse.ArgumentError as e:
+                self.error("environment variable %s: %s" % (name, e))
+            env_args.extend(self._apply_value(action, value, namespace, provided))
+        return env_args + args, namespace
+
+    def _parse_compiled(
+        self, 
+        args:List[str], 
+        namespace:Optional[argparse.Namespace],
+        provided:Dict[str, argparse.Action]
+    ) -> Optional[argparse.Namespace]:
+        compiled = self._compiled_parser()
+        return compiled.parse(args, namespace, provided) if compiled is not None else None
+
+    def _compiled_parser(self) -> Optional[CompiledParser]:
+        if not self._fast_path:
+            return None
+        # recompile whenever the registered actions change
+        compiled = self._compiled
+        if (compiled is None) or (compiled.key != CompiledParser.actions_key(self)):
+            compiled = self._compiled = CompiledParser(self)
+        return compiled
+
+    def _parse_args(
+        self, 
+        args:Optional[Sequence[str]] =None, 
+        namespace:Optional[argparse.Namespace] =None,
+        pending:Optional[Dict[str, Tuple[str, Any]]] =None,
+        provided:Optional[Dict[str, argparse.Action]] =None
+    ) -> argparse.Namespace:
+        args = sys.argv[1:] if args is None else list(args)
+        pending = {} if pending is None else pending
+        # required arguments with values in the namespace
+        provided = {} if provided is None else provided
+        # apply values from environment variables, which
+        # take precedence over values from config files
+        if self._env_prefix is not None:
+            args, namespace = self._apply_env(args, namespace, provided)
+        # apply values from config files
+        if self._config_option is not None:
+            args, namespace = self._apply_config(args, namespace, pending, provided)
+        # try the compiled parser and fall back to argparse
+        # for anything it does not handle
+        with phase(self.profiler, '<parser>', 'parse'):
+            parsed_args = self._parse_compiled(args, namespace, provided)
+            if parsed_args is None:
+                tokens = (_subcommand_values.set(pending), _provided_values.set({}))
+                try:
+                    args = self._provided_args(namespace, provided) + args
+                    parsed_args = super(ArgumentParser, self).parse_args(args, namespace)
+                finally:
+                    _provided_values.reset(tokens[1])
+                    _subcommand_values.reset(tokens[0])
+        # values not taken by any selected subcommand
+        for name, (source, _) in pending.items():
+            self.error("unrecognized argument in %s: %s" % (source, name))
+        return parsed_args
+
+    def _scan_config_paths(self, args:List[str]) -> List[str]:
+        # find paths passed to the config option,
+        # each occurrence takes a single path
+        option, paths, i = self._config_option, [], 0
+        while i < len(args):
+            if args[i] == '--':
+                break
+            elif (args[i] == option) and (i + 1 < len(args)):
+                paths.append(args[i+1])
+                i += 1
+            elif args[i].startswith(option + '='):
+                paths.append(args[i][len(option)+1:])
+            i += 1
+        return paths
+
+    def _load_config_values(
+        self, 
+        path:str
+    ) -> Tuple[Dict[str, Tuple[argparse.Action, Any]], Dict[str, Tuple[str, Any]]]:
+        # load config file
+        try:
+            path = os.path.abspath(path)
+            key = (path, config_file_key(path), CompiledParser.actions_key(self))
+            # check values cache
+            if key in self._config_values:
+                return self._config_values[key]
+            config = load_config(path)
+        except (OSError, ValueError, ImportError) as e:
+            self.error("cannot load config file %s: %s" % (path, e))
+        unknown = {}
+        values = self._convert_values(config, "config file %s" % path, unknown)
+        # only keep values of the latest version of the file
+        self._config_values = {k: v for k, v in self._config_values.items() if k[0] != path}
+        self._config_values[key] = (values, unknown)
+        return values, unknown
+
+    def _convert_values(
+        self, 
+        mapping:Mapping[str, Any], 
+        source:str,
+        unknown:Optional[Dict[str, Tuple[str, Any]]] =None
+    ) -> Dict[str, Tuple[argparse.Action, Any]]:
+        # check and convert values by argument name, unknown
+        # names are collected for subcommands if requested
+        values = {}
+        config_dest = self._config_option.lstrip('-').replace('-', '_') if self._config_option is not None else None
+        for name, value in mapping.items():
+            action = find_config_action(self, name)
+            if (action is None) and (unknown is not None) and (self._subparsers is not None):
+                unknown[name] = (source, value)
+                continue
+            if (action is None) or (action.dest == config_dest):
+                self.error("unrecognized argument in %s: %s" % (source, name))
+            try:
+                values[action.dest] = (action, convert_config_value(self, action, value))
+            except argparse.ArgumentError as e:
+                self.error("%s: %s" % (source, e))
+        return values
+
+    def _apply_values(
+        self,
+        values:Dict[str, Tuple[argparse.Action, Any]],
+        args:List[str],
+        namespace:Optional[argparse.Namespace],
+        provided:Dict[str, argparse.Action]
+    ) -> Tuple[List[str], Optional[argparse.Namespace]]:
+        # build namespace from converted values
+        namespace = argparse.Namespace(**vars(namespace)) if namespace is not None else argparse.Namespace()
+        value_args = []
+        for action, value in values.values():
+            value_args.extend(self._apply_value(action, value, namespace, provided))
+        return value_args + args, namespace
+
+    def _apply_config(
+        self, 
+        args:List[str], 
+        namespace:Optional[argparse.Namespace],
+        pending:Dict[str, Tuple[str, Any]],
+        provided:Dict[str, argparse.Action]
+    ) -> Tuple[List[str], Optional[argparse.Namespace]]:
+        # check for config files
+        paths = self._scan_config_paths(args)
+        if len(paths) == 0:
+            return args, namespace
+        # merge config files, later files take precedence
+        values = {}
+        for path in paths:
+            path_values, unknown = self._load_config_values(path)
+            values.update(path_values)
+            pending.update(unknown)
+        # cached values are shared across parses, copy them such
+        # that changes to one namespace do not leak into others
+        values = {dest: (action, _copy_value(value)) for dest, (action, value) in values.items()}
+        return self._apply_values(values, args, namespace, provided)
+
+    def _apply_subcommand_values(
+        self, 
+        args:List[str], 
+        namespace:Optional[argparse.Namespace]
+    ) -> Tuple[List[str], Optional[argparse.Namespace]]:
+        # environment variables and values of config files or
+        # records passed to the root parser in the same order
+        provided = {}
+        if self._env_prefix is not None:
+            args, namespace = self._apply_env(args, namespace, provided)
+        pending = _subcommand_values.get()
+        if pending:
+            values = {}
+            for name in [name for name in pending if find_config_action(self, name) is not None]:
+                source, value = pending.pop(name)
+                values.update(self._convert_values({name: value}, source))
+            args, namespace = self._apply_values(values, args, namespace, provided)
+        return self._provided_args(namespace, provided) + args, namespace
+
+    def parse(self, args:Optional[Sequence[str]] =None, namespace:Optional[argparse.Namespace] =None) -> ParseResult:
+        """ Parse arguments into an immutable result without storing it.
+
+            Reentrant and thread-safe, bind containers to the result
+            by `result[container]` or `container.bind(result)`.
+        """
+        return ParseResult(MappingProxyType(vars(self._parse_args(args, namespace))))
+
+    def _enable_profiler(self) -> None:
+        # profile option given after construction, e.g. in the
+        # arguments passed to `parse_args` explicitly
+        self.profiler = Profiler()
+        atexit.register(self.profiler.report)
+        for action in self._materialized_actions:
+            if isinstance(action, argparse._SubParsersAction):
+                for parser in action.choices.values():
+                    parser.profiler = self.profiler
+
+    def parse_args(self, args:Optional[Sequence[str]] =None, namespace:Optional[argparse.Namespace] =None) -> argparse.Namespace:
         # parse arguments and store them
-        self._parsed_args = super(ArgumentParser, self).parse_args(*args, **kwargs)
-        return self._parsed_args
+        if (self._profile_dest is not None) and (self.profiler is None):
+            start = time.perf_counter()
+            parsed_args = self._parse_args(args, namespace)
+            if getattr(parsed_args, self._profile_dest, False):
+                self._enable_profiler()
+                self.profiler.record('<parser>', 'parse', time.perf_counter() - start)
+        else:
+            parsed_args = self._parse_args(args, namespace)
+        if (namespace is None) and (type(parsed_args) is argparse.Namespace):
+            # track edits of the returned namespace
+            parsed_args.__class__ = _Namespace
+        self._parsed_args = parsed_args
+        self._parse_count += 1
+        return parsed_args
+
+    def _parse_row(self, row:Union[Sequence[str], Mapping[str, Any]]) -> Tuple[Dict[str, Any], Optional[str]]:
+        # parse a single row of a batch into its values
+        # and the error message instead of exiting
+        token = _raise_errors.set(True)
+        try:
+            if isinstance(row, Mapping):
+                # values are converted like values of config files
+                pending, provided = {}, {}
+                args, namespace = self._apply_values(self._convert_values(row, "record", pending), [], None, provided)
+                return vars(self._parse_args(args, namespace, pending, provided)), None
+            return vars(self._parse_args(row)), None
+        except _ParseError as e:
+            return {}, str(e)
+        except SystemExit as e:
+            # help or version actions exit the parser
+            return {}, "Parser exited with status %s" % e.code
+        finally:
+            _raise_errors.reset(token)
+
+    def parse_many(self, rows:Iterable[Union[Sequence[str], Mapping[str, Any]]]) -> BatchResult:
+        """ Parse a batch of argument vectors or mappings.
+
+            Mappings of argument names to values are checked and
+            converted like values of config files. Errors are
+            collected per row instead of exiting. The result is
+            columnar, holding one list of values per argument
+            instead of one namespace per row.
+        """
+        # parse rows directly into columns unless environment
+        # variables or config files contribute values
+        compiled = self._compiled_parser()
+        if (compiled is not None) and (self._env_prefix is None) and (self._config_option is None):
+            parsed = compiled.parse_rows(rows, self._parse_row)
+            if parsed is not None:
+                return BatchResult(*parsed)
+
+        columns, errors = {}, []
+        for i, row in enumerate(rows):
+            values, error = self._parse_row(row)
+            errors.append(error)
+            # append values to existing columns
+            for k, col in columns.items():
+                col.append(values.get(k, None))
+            # add new columns
+            for k, v in values.items():
+                if k not in columns:
+                    columns[k] = [None] * i + [v]
+        return BatchResult(columns, errors)
+
+    def parse_sweep(
+        self,
+        container:ArgsContainer,
+        args:Optional[Sequence[str]] =None,
+        **sweep_kwargs
+    ) -> Iterator[SweepResult]:
+        """ Parse arguments and sweep the container, see `ArgsContainer.sweep`. """
+        self.parse_args(args)
+        return container.sweep(**sweep_kwargs)
+
+    def error(self, message:str):
+        # raise errors when parsing batches
+        if _raise_errors.get():
+            raise _ParseError(message)
+        super(ArgumentParser, self).error(message)
+
+    def _print_message(self, message:str, file:Optional[Any] =None) -> None:
+        # help and version actions would print into the output
+        # of batches, the rows fail with the exit status instead
+        if _raise_errors.get():
+            return
+        super(ArgumentParser, self)._print_message(message, file)
+
+    def parse_known_args(self, args:Optional[Sequence[str]] =None, namespace:Optional[argparse.Namespace] =None):
+        # placeholders of subcommands parsed without `parse_args`
+        token = _provided_values.set({}) if _provided_values.get() is None else None
+        try:
+            # make sure lazy subcommands are populated
+            # before their arguments are parsed
+            if self._populate_subcommand() is not None:
+                args = sys.argv[1:] if args is None else list(args)
+                args, namespace = self._apply_subcommand_values(args, namespace)
+            return super(ArgumentParser, self).parse_known_args(args, namespace)
+        finally:
+            if token is not None:
+                _provided_values.reset(token)
+
+    def format_help(self) -> str:
+        self._populate_subcommand()
+        self._materialize()
+        self._resolve_deferred_help()
+        text = super(ArgumentParser, self).format_help()
+        self._store_help(text)
+        return text
+
+    def _resolve_deferred_help(self) -> None:
+        # attach help texts to actions of callables
+        # which were registered without them
+        while len(self._deferred_help) > 0:
+            fn, actions = self._deferred_help.pop()
+            spec = CallableSpec.from_callable(fn, cache=self._spec_cache, profiler=self.profiler)
+            for arg in spec.arguments:
+                if (arg.name in actions) and (arg.help is not None):
+                    actions[arg.name].help = arg.help
+
+    def format_usage(self) -> str:
+        self._populate_subcommand()
+        return super(ArgumentParser, self).format_usage()
+
+    def _populate_subcommand(self) -> Optional[ArgsContainer]:
+        # check if parser is a lazy subcommand
+        if self._subcommand is None:
+            return None
+        # add arguments from callable on first use
+        subcommand = self._subcommand
+        if subcommand.container is not None:
+            return subcommand.container
+        with self._populate_lock:
+            if subcommand.container is not None:
+                return subcommand.container
+            fn = subcommand.target
+            if isinstance(fn, str):
+                fn = import_callable(fn)
+            group = self._argument_group(fn.__name__)
+            option_strings = []
+            added_args = self._add_args_from_callable(
+                fn=fn,
+                group=group,
+                ignore=subcommand.ignore,
+                option_strings=option_strings
+            )
+            # parsed arguments are stored in the root parser
+            container = ArgsContainer(
+                subcommand.root, 
+                added_args, 
+                fn, 
+                self._memo_store(fn) if subcommand.memoize else None
+            )
+            self._register_container(container, group, subcommand.ignore, option_strings)
+            subcommand.container = container
+        return subcommand.container
 
     def _add_args_from_callable(
         self, 
         fn:Callable[[Any], T],
         group:object,
-        ignore:List[str]
-    ) -> Set[str]:
+        ignore:List[str],
+        option_strings:Optional[List[str]] =None
+    ) -> List[str]:
 
-        # list of all added arguments    
-        added_args = set()
+        # list of all added arguments in order of registration
+        added_args = {}
+        # add arguments of all used functions before the
+        # arguments of the functions using them
+        root = self._subcommand.root if self._subcommand is not None else self
+        for sub_fn, spec in resolve_uses(fn, cache=self._spec_cache, help=not self._lazy_help, profiler=self.profiler):
+            added_args.update(dict.fromkeys(self._add_args_from_spec(sub_fn, spec, group, ignore, option_strings)))
+            # cached help is invalidated by changes to the source
+            if root._help_cache is not None:
+                self._help_sources.add(source_fingerprint(sub_fn))
+        # return list of added arguments
+        return list(added_args)
 
-        # get function signature
-        sig = inspect.signature(fn)
+    def _add_args_from_spec(
+        self,
+        fn:Callable[[Any], T],
+        spec:CallableSpec,
+        group:object,
+        ignore:List[str],
+        option_strings:Optional[List[str]] =None
+    ) -> List[str]:
 
-        # parse docstring
-        doc = inspect.getdoc(fn)
-        doc_params = {p.arg_name: p for p in parse(doc).params} if doc is not None else {}
+        # list of all added arguments    
+        added_args = []
+        # actions missing their help text
+        deferred_actions = {}
 
-        # check if function has keyword arguments
-        if any((p.kind == p.VAR_KEYWORD for p in sig.parameters.values())):
-            # add all arguments of used functions
-            # which populate the variable keyword arguments
-            if hasattr(fn, uses.USED_FUNCTIONS_KEY):
-                added_args = set.union(*(
-                    self._add_args_from_callable(
-                        fn=sub_fn,
-                        group=group,
-                        ignore=ignore
-                    )
-                    for sub_fn in getattr(fn, uses.USED_FUNCTIONS_KEY)
-                ))
-        
-        for name, param in sig.parameters.items():            
+        for arg in spec.arguments:
             # check if parameter should be ignored
-            # or is of kind variable keywords
-            if (name in ignore) or (param.kind == param.VAR_KEYWORD):
+            if arg.name in ignore:
                 continue
+            # raise errors that occured during introspection
+            if arg.error is not None:
+                raise arg.error
 
-            name = self.formatter(name)
+            name = self.formatter(arg.name)
             argname = "--" + name
-            kwargs = {'required': True}
-
-            # add default value
-            if param.default != param.empty:
-                kwargs['default'] = param.default
-                kwargs['required'] = False
-
-            # find/infer parameter type
-            if param.annotation != param.empty:
-                kwargs['type'] = param.annotation
-            elif name in doc_params:
-                kwargs['type'] = eval(doc_params[name].type_name)
-
-            # handle type hints
-            if 'type' in kwargs:
-                
-                origin = True
-                while origin is not None:
-                    # get origin and args
-                    origin = get_origin(kwargs['type'])
-                    args = get_args(kwargs['type'])
-                    # check if type is marked as ignore
-                    if origin is Ignore:
-                        break
-                    elif origin is Union:
-                        # check if argument is marked by Optional
-                        if args[1] is type(None):
-                            # mark as not required and update type
-                            kwargs['type'] = args[0]
-                            kwargs['required'] = False
-                        else:
-                            # Union is not supported
-                            raise TypeError("Argument Type cannot be Union of multiple types!")
-                    elif origin is Literal:
-                        # infer type from args and add choices argument
-                        kwargs['type'] = type(args[0])
-                        kwargs['choices'] = args
-                    elif origin is set:
-                        # update keyword arguments
-                        kwargs['type'] = args[0]
-                        kwargs['nargs'] = '*'
-                    elif origin is list:
-                        # update keyword arguments
-                        kwargs['type'] = args[0]
-                        kwargs['nargs'] = '+'
-                    elif origin is tuple:
-                        # check that types match and update keyword arguments
-                        assert all(type(arg) is type(args[0]) for arg in args[1:]), "All types must match"
-                        kwargs['type'] = args[0]
-                        kwargs['nargs'] = len(args)
-                
-                if origin is Ignore:
-                    # break by ignore type hint
-                    continue
+            kwargs = arg.kwargs
+
+            # remember arguments to sweep over
+            if arg.sweep:
+                self._sweep_dests.add(name.replace('-', '_'))
 
-            elif 'default' in kwargs:
-                # no type found, then infer from default
-                kwargs['type'] = type(kwargs['default'])
-            
             # check for conflict
-            if argname in self._option_string_actions:
+            if (argname in self._option_string_actions) or (argname in self._records):
                 # argument with same name already registered
-                action = self._option_string_actions[argname]
-                # check if types match
-                if ('type' in kwargs) and (action.type is not kwargs['type']):
-                    # type conflict
-                    raise TypeError("Type conflict between registered argument `%s?`:`%s` and corresponding parameter of callable %s" % (argname, action.type, fn))
+                _check_arg_type(argname, self._registered_type(argname), arg, fn)
                 # if types match than there is no conflict
                 # the argument is just used multiple times
-                added_args.add(name.replace('-', '_'))
+                added_args.append(name.replace('-', '_'))
+                if argname in self._arg_refs:
+                    self._arg_refs[argname] += 1
+                if option_strings is not None:
+                    option_strings.append(argname)
                 continue
 
             if 'type' not in kwargs:
                 raise AttributeError("Cannot find argument type for argument %s in callable %s" % (name, fn))
 
-            # simple boolean arguments as options
-            if (kwargs['type'] is bool) and ('nargs' not in kwargs):
-                kwargs['action'] = 'store_false' if kwargs.get('default', False) else 'store_true'
-                kwargs.pop('type')
+            # count callables using the argument
+            self._arg_refs[argname] = 1
+            if option_strings is not None:
+                option_strings.append(argname)
 
-            # get description from docstring
-            if name in doc_params:
-                kwargs['help'] = doc_params[name].description.replace('\n', ' ')
+            if self._compact:
+                # record argument, the action is created on demand
+                self._records[argname] = _ArgRecord(argname, arg, group, fn, not spec.has_help)
+                added_args.append(name.replace('-', '_'))
+                continue
 
             # add arguments from signature
-            group.add_argument(argname, **kwargs)
-            added_args.add(name.replace('-', '_'))
+            with phase(self.profiler, fn, 'register'):
+                action = group.add_argument(argname, **arg.action_kwargs)
+            added_args.append(name.replace('-', '_'))
+            # help text is added when help is rendered
+            if not spec.has_help:
+                deferred_actions[arg.name] = action
+
+        if len(deferred_actions) > 0:
+            self._deferred_help.append((fn, deferred_actions))
 
         # return list of added arguments
         return added_args
 
+    def _memo_store(self, fn:Callable) -> ResultStore:
+        # check that results of the callable can be memoized
+        if self._result_store is None:
+            raise RuntimeError("Memoizing results of %r requires a result cache, see `ArgumentParser(result_cache=...)`" % fn)
+        if inspect.iscoroutinefunction(fn):
+            raise TypeError("Cannot memoize results of coroutine function %r" % fn)
+        self._result_store.check_callable(fn)
+        return self._result_store
+
     def add_args_from_callable(
         self, 
         fn:Callable[[Any], T], 
         *,
         group:str =None,
-        ignore:List[str] =[]
+        ignore:List[str] =[],
+        memoize:bool =False
     ) -> ArgsContainer[T]: 
+        """ Add the arguments of a callable to the parser.
+
+            With `memoize` set, results of the callable are stored in
+            the result cache of the parser and reused for equal
+            arguments and an unchanged source file.
+        """
+        store = self._memo_store(fn) if memoize else None
         # add arguments to parser
+        group = self._argument_group(group or fn.__name__)
+        option_strings = []
         added_args = self._add_args_from_callable(
             fn=fn, 
-            group=self.add_argument_group(group or fn.__name__), 
-            ignore=ignore
+            group=group, 
+            ignore=ignore,
+            option_strings=option_strings
         )
         # return argument container
-        return ArgsContainer(self, added_args, fn)
+        container = ArgsContainer(self, added_args, fn, store)
+        self._register_container(container, group, ignore, option_strings)
+        return container
+
+    def _register_container(
+        self,
+        container:ArgsContainer,
+        group:object,
+        ignore:List[str],
+        option_strings:List[str]
+    ) -> None:
+        container._group = group
+        container._ignore = tuple(ignore)
+        container._option_strings = option_strings
+        # digest at registration to detect changes made in place
+        container._digest = _callable_digest(container.fn)
+        self._containers[id(container)] = container
+
+    def _registered_type(self, argname:str) -> Any:
+        if argname in self._records:
+            record_kwargs = self._records[argname].arg.action_kwargs
+            return record_kwargs.get('dtype', record_kwargs.get('type', None))
+        action = self._option_string_actions[argname]
+        return getattr(action, 'dtype', action.type)
+
+    def _check_callable(self, fn:Callable, ignore:Sequence[str], released:Sequence[str]) -> None:
+        # raise the errors registering the arguments of a callable would
+        # raise without changing the parser, ignoring the registration
+        # of the released arguments which are removed before
+        released = set(released)
+        registered = {}
+        for sub_fn, spec in resolve_uses(fn, cache=self._spec_cache, help=not self._lazy_help, profiler=self.profiler):
+            for arg in spec.arguments:
+                if arg.name in ignore:
+                    continue
+                if arg.error is not None:
+                    raise arg.error
+                argname = "--" + self.formatter(arg.name)
+                if argname in registered:
+                    _check_arg_type(argname, registered[argname], arg, sub_fn)
+                elif (argname not in released) and (
+                    (argname in self._option_string_actions) or (argname in self._records)
+                ):
+                    _check_arg_type(argname, self._registered_type(argname), arg, sub_fn)
+                elif 'type' not in arg.kwargs:
+                    raise AttributeError("Cannot find argument type for argument %s in callable %s" % (argname[2:], sub_fn))
+                else:
+                    action_kwargs = arg.action_kwargs
+                    registered[argname] = action_kwargs.get('dtype', action_kwargs.get('type', None))
+
+    def _check_registered(self, container:ArgsContainer) -> None:
+        if self._containers.get(id(container), None) is not container:
+            raise RuntimeError("Callable %r is not registered to this parser" % container.fn)
+
+    def _remove_args(self, option_strings:List[str]) -> None:
+        # release the arguments of a callable and remove
+        # those that are not used by any other callable
+        removed = []
+        for argname in option_strings:
+            refs = self._arg_refs.get(argname, None)
+            if refs is None:
+                # added by other means than a callable
+                continue
+            if refs > 1:
+                self._arg_refs[argname] = refs - 1
+                continue
+            del self._arg_refs[argname]
+            removed.append(argname)
+            self._sweep_dests.discard(argname[2:].replace('-', '_'))
+        # remove compact records and actions
+        actions = {}
+        for argname in removed:
+            if self._records.pop(argname, None) is None:
+                action = self._option_string_actions[argname]
+                actions[id(action)] = action
+        if len(actions) > 0:
+            for action in actions.values():
+                for option_string in action.option_strings:
+                    self._option_string_actions.pop(option_string, None)
+                action.container._group_actions.remove(action)
+            # groups share the list of actions of the parser
+            action_list = self._materialized_actions
+            action_list[:] = [a for a in action_list if id(a) not in actions]
+            self._deferred_help = [
+                (fn, {name: a for name, a in deferred.items() if id(a) not in actions})
+                for fn, deferred in self._deferred_help
+            ]
+        # compiled parsers and indices are rebuilt on next use
+        self._compiled = None
+        self._env_actions = None
+
+    def remove_callable(self, container:ArgsContainer) -> None:
+        """ Remove the arguments of a registered callable.
+
+            Arguments shared with other callables are kept until
+            the last callable using them is removed.
+        """
+        with self._materialize_lock:
+            self._check_registered(container)
+            self._remove_args(container._option_strings)
+            container._option_strings = []
+            del self._containers[id(container)]
+
+    def replace_callable(self, container:ArgsContainer, fn:Optional[Callable] =None) -> ArgsContainer:
+        """ Re-register the arguments of a container from a callable.
+
+            Replaces the arguments added for the container by the
+            arguments of `fn`, or of the callable of the container
+            if not given, in the same group. The container is
+            updated in place and returned.
+        """
+        fn = container.fn if fn is None else fn
+        if container._store is not None:
+            self._result_store.check_callable(fn)
+        with self._materialize_lock:
+            self._check_registered(container)
+            # arguments only used by the container are removed, check
+            # the new arguments before to leave the parser untouched
+            # on conflicts
+            counts = {}
+            for argname in container._option_strings:
+                counts[argname] = counts.get(argname, 0) + 1
+            released = [a for a, n in counts.items() if (a in self._arg_refs) and (self._arg_refs[a] <= n)]
+            self._check_callable(fn, container._ignore, released)
+            self._remove_args(container._option_strings)
+            option_strings = []
+            added_args = self._add_args_from_callable(
+                fn=fn,
+                group=container._group,
+                ignore=container._ignore,
+                option_strings=option_strings
+            )
+            container.fn = fn
+            container._is_async = inspect.iscoroutinefunction(fn)
+            container._keys = tuple(added_args)
+            container._arg_names = set(container._keys)
+            container._option_strings = option_strings
+            container._digest = _callable_digest(fn)
+            container._parse_key = container._kwargs = None
+        return container
+
+    def refresh(self) -> List[ArgsContainer]:
+        """ Re-register callables that changed since registration.
+
+            Callables are looked up by their qualified name to pick
+            up reloaded modules and redefined functions. Only callables
+            whose signature or docstring, or those of the callables
+            they use, changed are re-registered. Populated subcommands
+            are refreshed as well. Returns the updated containers.
+        """
+        updated = []
+        for container in list(self._containers.values()):
+            fn = _current_callable(container.fn)
+            digest = _callable_digest(fn)
+            if digest != container._digest:
+                # drop specs of callables changed in place
+                for f in _used_callables(fn):
+                    _spec_memo.pop(f, None)
+                self.replace_callable(container, fn)
+                updated.append(container)
+            elif fn is not container.fn:
+                container.fn = fn
+                container._is_async = inspect.iscoroutinefunction(fn)
+        # refresh populated subcommands
+        for action in self._materialized_actions:
+            if isinstance(action, argparse._SubParsersAction):
+                for parser in action.choices.values():
+                    if isinstance(parser, ArgumentParser):
+                        updated.extend(parser.refresh())
+        return updated
+
+    def add_subcommands(
+        self,
+        commands:Dict[str, Union[Callable, str]],
+        *,
+        dest:str ='command',
+        ignore:List[str] =[],
+        memoize:bool =False,
+        **kwargs
+    ) -> Subcommands:
+        """ Add lazily populated subcommands to the parser.
+
+            Commands map names to callables or import paths of the
+            form `package.module:function`. Modules are imported and
+            callables are introspected only when the corresponding
+            subcommand is selected or its help is rendered.
+        """
+        if memoize and (self._result_store is None):
+            raise RuntimeError("Memoizing results of subcommands requires a result cache, see `ArgumentParser(result_cache=...)`")
+        # root parser storing the parsed arguments
+        root = self._subcommand.root if self._subcommand is not None else self
+        subparsers = self.add_subparsers(dest=dest, **kwargs)
+        parsers = {}
+        for name, target in commands.items():
+            parser = subparsers.add_parser(name, formatter=self.formatter)
+            parser._spec_cache = self._spec_cache
+            parser._result_store = self._result_store
+            parser._lazy_help = self._lazy_help
+            parser._fast_path = self._fast_path
+            parser._compact = self._compact
+            parser._env_prefix = self._env_prefix
+            parser._sweep_dests = root._sweep_dests
+            parser.profiler = self.profiler
+            parser._subcommand = _Subcommand(root, target, ignore, memoize)
+            parsers[name] = parser
+        return Subcommands(root, dest, parsers)
+
+def import_callable(path:str) -> Callable:
+    """ Import a callable from a path of the form `package.module:qualname`. """
+    if ':' not in path:
+        raise ValueError("Invalid import path `%s`, expected `package.module:qualname`" % path)
+    module, qualname = path.split(':', 1)
+    obj = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+@dataclass
+class _Subcommand():
+    root:ArgumentParser
+    target:Union[Callable, str]
+    ignore:List[str]
+    memoize:bool =False
+    container:Optional[ArgsContainer] =None
+
+class Subcommands(object):
+    """ Lazily populated argument containers of subcommands. """
+
+    def __init__(self, parser:ArgumentParser, dest:str, parsers:Dict[str, ArgumentParser]):
+        self._parser = parser
+        self._dest = dest
+        self._parsers = parsers
+
+    def __getitem__(self, name:str) -> ArgsContainer:
+        return self._parsers[name]._populate_subcommand()
+
+    def __iter__(self):
+        return iter(self._parsers)
+
+    def __len__(self) -> int:
+        return len(self._parsers)
+
+    @property
+    def selected(self) -> Optional[ArgsContainer]:
+        # check if arguments are present
+        if not hasattr(self._parser, '_parsed_args'):
+            raise RuntimeError("No parsed arguments found! Did you forget to call `parse_args`?")
+        # get container of selected subcommand
+        name = getattr(self._parser._parsed_args, self._dest, None)
+        return self[name] if name is not None else None
+
+    def bind(self, result:ParseResult) -> BoundArgs:
+        """ Bind the container of the subcommand selected in a parse result. """
+        name = result.values.get(self._dest, None)
+        if name is None:
+            raise RuntimeError("No subcommand selected!")
+        return self[name].bind(result)
+
+    def execute(self, **extra_kwargs) -> Any:
+        container = self.selected
+        if container is None:
+            raise RuntimeError("No subcommand selected!")
+        return container.execute(**extra_kwargs)
+
+    def __call__(self, **extra_kwargs) -> Any:
+        return self.execute(**extra_kwargs)
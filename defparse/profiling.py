@@ -0,0 +1,62 @@
+import sys
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Tuple, Callable, Optional, TextIO
+
+def callable_name(fn:Any) -> str:
+    if isinstance(fn, str):
+        return fn
+    return getattr(fn, '__qualname__', None) or repr(fn)
+
+class Profiler(object):
+    """ Collects per-callable and per-phase timings.
+
+        Phases recorded by defparse are `memo`, `cache` (loading
+        from the persistent spec cache), `signature`, `docstring`,
+        `eval` (types named in docstrings), `typing` (resolution
+        of type hints), `register` (argparse registration), `parse`
+        and `execute`. An optional callback is invoked for every
+        recorded timing.
+    """
+
+    def __init__(self, callback:Optional[Callable[[str, str, float], None]] =None):
+        self.callback = callback
+        # (callable name, phase) -> [count, total seconds]
+        self.stats:Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, fn:Any, phase:str, elapsed:float) -> None:
+        name = callable_name(fn)
+        with self._lock:
+            stats = self.stats.setdefault((name, phase), [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+        if self.callback is not None:
+            self.callback(name, phase, elapsed)
+
+    @contextmanager
+    def phase(self, fn:Any, phase:str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(fn, phase, time.perf_counter() - start)
+
+    def report(self, file:TextIO =None) -> None:
+        """ Print the timings sorted by total time. """
+        file = sys.stderr if file is None else file
+        with self._lock:
+            stats = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        total = sum(t for _, (_, t) in stats)
+        print("defparse profile (total %.3f ms)" % (total * 1e3), file=file)
+        print("%10s %8s %7s  %-10s %s" % ("time [ms]", "count", "share", "phase", "callable"), file=file)
+        for (name, phase), (count, elapsed) in stats:
+            share = elapsed / total if total > 0 else 0.0
+            print("%10.3f %8i %6.1f%%  %-10s %s" % (elapsed * 1e3, count, share * 100, phase, name), file=file)
+
+def phase(profiler:Optional[Profiler], fn:Any, name:str):
+    # no-op context when profiling is disabled
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(fn, name)
@@ -0,0 +1,159 @@
+import sys
+import typing
+import inspect
+import functools
+import threading
+from collections import ChainMap
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple, Union, Literal, Callable, Optional
+from typing import get_origin, get_args
+import defparse.typehints as defparse
+from .typehints import Ignore, Sweep, Array
+
+# names available when resolving type names in docstrings
+# and string annotations, e.g. `Optional[int]`, `typing.List[int]`
+# and `defparse.Ignore[int]`, in addition to the names defined
+# in the module of the callable
+DEFAULT_NAMESPACE = {
+    **{name: getattr(typing, name) for name in typing.__all__},
+    'typing': typing,
+    'defparse': defparse,
+    'Ignore': Ignore,
+    'Sweep': Sweep,
+    'Array': Array
+}
+
+@dataclass(frozen=True)
+class TypeDescriptor():
+    """ Compiled argument type derived from a type hint.
+
+        Describes the type to convert single values to, the number
+        of values, the valid choices and whether the type hint marks
+        the argument as optional, ignored, to sweep over or as array.
+    """
+    type:Any
+    nargs:Union[int, str, None] =None
+    choices:Optional[Tuple[Any, ...]] =None
+    optional:bool =False
+    ignore:bool =False
+    sweep:bool =False
+    array:bool =False
+
+def _resolve_type(tp:Any) -> TypeDescriptor:
+    kwargs = {'type': tp}
+    origin = True
+    while origin is not None:
+        # get origin and args
+        origin = get_origin(kwargs['type'])
+        args = get_args(kwargs['type'])
+        # check if type is marked as ignore
+        if origin is Ignore:
+            return TypeDescriptor(tp, ignore=True)
+        elif origin is Union:
+            # check if argument is marked by Optional
+            if args[1] is type(None):
+                # mark as optional and update type
+                kwargs['type'] = args[0]
+                kwargs['optional'] = True
+            else:
+                # Union is not supported
+                raise TypeError("Argument Type cannot be Union of multiple types!")
+        elif origin is Sweep:
+            # accept multiple values to sweep over
+            kwargs['type'] = args[0]
+            kwargs['nargs'] = '+'
+            kwargs['sweep'] = True
+        elif origin is Array:
+            # collect values into array of the given dtype
+            kwargs['type'] = args[0]
+            kwargs['nargs'] = '+'
+            kwargs['array'] = True
+        elif origin is Literal:
+            # infer type from args and add choices argument
+            kwargs['type'] = type(args[0])
+            kwargs['choices'] = args
+        elif origin is set:
+            # update keyword arguments
+            kwargs['type'] = args[0]
+            kwargs['nargs'] = '*'
+        elif origin is list:
+            # update keyword arguments
+            kwargs['type'] = args[0]
+            kwargs['nargs'] = '+'
+        elif origin is tuple:
+            # check that types match and update keyword arguments
+            assert all(type(arg) is type(args[0]) for arg in args[1:]), "All types must match"
+            kwargs['type'] = args[0]
+            kwargs['nargs'] = len(args)
+
+    return TypeDescriptor(**kwargs)
+
+@functools.lru_cache(maxsize=None)
+def _resolve_type_cached(tp:Any) -> TypeDescriptor:
+    return _resolve_type(tp)
+
+def resolve_type(tp:Any) -> TypeDescriptor:
+    """ Compile a type hint into a type descriptor.
+
+        Descriptors are cached per distinct type hint and shared
+        across parameters, callables and parsers.
+    """
+    try:
+        return _resolve_type_cached(tp)
+    except TypeError:
+        # unhashable type hint, e.g. literal of unhashable values
+        try:
+            hash(tp)
+        except TypeError:
+            return _resolve_type(tp)
+        raise
+
+def callable_globals(fn:Callable) -> Dict[str, Any]:
+    """ Global namespace of the module defining the callable. """
+    fn = inspect.unwrap(fn) if callable(fn) else fn
+    namespace = getattr(fn, '__globals__', None)
+    if namespace is None:
+        # classes, partials and other callable objects
+        fn = getattr(fn, 'func', fn)
+        namespace = getattr(fn, '__globals__', None)
+    if namespace is None:
+        module = sys.modules.get(getattr(fn, '__module__', None), None)
+        namespace = vars(module) if module is not None else {}
+    return namespace
+
+@functools.lru_cache(maxsize=None)
+def _compile_name(type_name:str):
+    return compile(type_name, '<type name>', 'eval')
+
+# evaluated type names keyed by the name and the id of the global
+# namespace, which is referenced by the entry to keep the id valid
+_names:Dict[Tuple[str, int], Tuple[Dict[str, Any], Tuple[Any, ...], Any]] = {}
+_names_lock = threading.Lock()
+
+def resolve_name(type_name:str, fn:Callable) -> Any:
+    """ Evaluate a type name in the namespace of a callable.
+
+        Used for type names in docstrings and string annotations,
+        e.g. under `from __future__ import annotations`. Names of
+        the module defining the callable take precedence over the
+        default namespace. Results are cached per module and
+        invalidated when the names used in the type name are
+        rebound, e.g. by reloading the module.
+    """
+    namespace = callable_globals(fn)
+    code = _compile_name(type_name)
+    bindings = tuple(namespace.get(name, None) for name in code.co_names)
+    # check cache
+    key = (type_name, id(namespace))
+    entry = _names.get(key, None)
+    if (
+        (entry is not None) and 
+        (entry[0] is namespace) and 
+        all(a is b for a, b in zip(entry[1], bindings))
+    ):
+        return entry[2]
+    # evaluate type name
+    tp = eval(code, namespace, ChainMap(namespace, DEFAULT_NAMESPACE))
+    with _names_lock:
+        _names[key] = (namespace, bindings, tp)
+    return tp
@@ -0,0 +1,244 @@
+""" Streaming job runner.
+
+    Executes an argument container for every record of a JSON Lines
+    stream. Records are either arrays of command line arguments or
+    objects mapping argument names to values:
+
+        ["--learning-rate", "0.1", "--epochs", "5"]
+        {"learning_rate": 0.1, "epochs": 5}
+
+    Records are read lazily and executed on a bounded thread or
+    process pool, i.e. reading pauses while the pool is saturated.
+    Results and per-record errors are written as JSON Lines:
+
+        {"index": 0, "result": ...}
+        {"index": 1, "error": "..."}
+
+    Usage:
+        python -m defparse.runner package.module:function [--input PATH] [--output PATH]
+"""
+import os
+import sys
+import json
+import argparse
+from collections import deque
+from types import MappingProxyType
+from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Tuple, Union, Literal, Callable, Iterable, Iterator, Optional, TextIO
+from .parser import ArgumentParser, ArgsContainer, BoundArgs, Subcommands, ParseResult
+from .sweep import run_chunk, chunk_results, make_executor
+
+@dataclass
+class RecordResult():
+    """ Result of a single record.
+
+        Holds either the return value of the callable or the
+        message of the parse or execution error in `error`.
+    """
+    index:int
+    result:Any =None
+    error:Optional[str] =None
+
+    def to_json(self) -> str:
+        if self.error is not None:
+            return json.dumps({'index': self.index, 'error': self.error})
+        try:
+            return json.dumps({'index': self.index, 'result': self.result})
+        except (TypeError, ValueError) as e:
+            return json.dumps({'index': self.index, 'error': "Result is not JSON serializable: %s" % e})
+
+def read_records(f:TextIO) -> Iterator[str]:
+    """ Lazily read the non-empty lines of a JSON Lines stream. """
+    for line in f:
+        line = line.strip()
+        if len(line) > 0:
+            yield line
+
+def _error_message(e:BaseException) -> str:
+    return "%s: %s" % (type(e).__name__, e)
+
+def _bind(
+    parser:ArgumentParser,
+    target:Union[ArgsContainer, Subcommands],
+    record:Any
+) -> Tuple[Optional[BoundArgs], Optional[str]]:
+    # parse a record and bind the target to it
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except ValueError as e:
+            return None, "Invalid JSON: %s" % e
+    if isinstance(record, list):
+        if not all(isinstance(token, str) for token in record):
+            return None, "Argument arrays must only contain strings"
+    elif not isinstance(record, dict):
+        return None, "Expected array of arguments or object of values, got %s" % type(record).__name__
+    values, error = parser._parse_row(record)
+    if error is not None:
+        return None, error
+    try:
+        return target.bind(ParseResult(MappingProxyType(values))), None
+    except RuntimeError as e:
+        # e.g. no subcommand selected
+        return None, str(e)
+
+def _to_records(results:List[Tuple[int, Any, Optional[BaseException]]]) -> List[RecordResult]:
+    return [
+        RecordResult(i, result=result) if error is None else RecordResult(i, error=_error_message(error))
+        for i, result, error in results
+    ]
+
+def run_records(
+    parser:ArgumentParser,
+    target:Union[ArgsContainer, Subcommands],
+    records:Iterable[Any],
+    *,
+    executor:Union[Literal['process', 'thread'], Executor] ='thread',
+    max_workers:Optional[int] =None,
+    max_pending:Optional[int] =None,
+    chunksize:int =1,
+    ordered:bool =True,
+    extra_kwargs:Dict[str, Any] ={}
+) -> Iterator[RecordResult]:
+    """ Execute a container for all records of a stream.
+
+        Records are JSON strings or decoded arrays of command line
+        arguments and objects of values, which are checked and
+        converted like values of config files. Records are parsed
+        in the calling thread and executed in chunks of `chunksize`
+        on a process or thread pool. At most `max_pending` chunks
+        are in flight, further records are only read once results
+        are consumed. Results are streamed in the order of the
+        records if `ordered` is set and as they complete otherwise.
+    """
+    if chunksize < 1:
+        raise ValueError("Chunk size must be positive, got %i" % chunksize)
+    if max_pending is None:
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    if max_pending < 1:
+        raise ValueError("Number of pending chunks must be positive, got %i" % max_pending)
+
+    executor, own_executor = make_executor(executor, max_workers)
+    # bound containers hold the parser and cannot be sent to
+    # worker processes, which execute the callables directly
+    detach = isinstance(executor, ProcessPoolExecutor)
+
+    # pending entries, i.e. futures of submitted chunks or
+    # results of records that failed to parse, with their chunks
+    pending = deque() if ordered else {}
+
+    def collect(entry:Any, chunk:List[Tuple[int, Callable, Dict[str, Any]]]) -> List[RecordResult]:
+        # entries are futures or results of failed records
+        return entry if isinstance(entry, list) else _to_records(chunk_results(entry, chunk))
+
+    def drain(limit:int) -> Iterator[RecordResult]:
+        # stream results until at most `limit` entries are pending
+        while len(pending) > limit:
+            if ordered:
+                yield from collect(*pending.popleft())
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from collect(future, pending.pop(future))
+
+    def submit(chunk:List[Tuple[int, Callable, Dict[str, Any]]]) -> Iterator[RecordResult]:
+        # wait for pending chunks before submitting more
+        # to keep the memory bounded
+        yield from drain(max_pending - 1)
+        future = executor.submit(run_chunk, chunk, extra_kwargs)
+        if ordered:
+            pending.append((future, chunk))
+        else:
+            pending[future] = chunk
+
+    try:
+        chunk = []
+        for i, record in enumerate(records):
+            bound, error = _bind(parser, target, record)
+            if (error is None) and detach and bound.container.is_async:
+                error = "Cannot run coroutine function %r in a process pool" % bound.fn
+            if error is None:
+                # execute through the container, e.g. to memoize results
+                if detach:
+                    chunk.append((i, bound.container._executable(), bound.kwargs))
+                else:
+                    chunk.append((i, bound.execute, {}))
+                if len(chunk) == chunksize:
+                    yield from submit(chunk)
+                    chunk = []
+            elif ordered:
+                # keep errors in the order of the records
+                if len(chunk) > 0:
+                    yield from submit(chunk)
+                    chunk = []
+                yield from drain(max_pending - 1)
+                pending.append(([RecordResult(i, error=error)], []))
+            else:
+                yield RecordResult(i, error=error)
+        if len(chunk) > 0:
+            yield from submit(chunk)
+        yield from drain(0)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def run_jsonl(
+    parser:ArgumentParser,
+    target:Union[ArgsContainer, Subcommands],
+    input:TextIO,
+    output:TextIO,
+    **kwargs
+) -> int:
+    """ Execute a container for all records of a JSON Lines stream.
+
+        Writes one JSON line per record to `output`, see `run_records`
+        for the keyword arguments. Returns the number of failed records.
+    """
+    failed = 0
+    for result in run_records(parser, target, read_records(input), **kwargs):
+        failed += int(result.error is not None)
+        output.write(result.to_json() + '\n')
+    output.flush()
+    return failed
+
+def main(argv:Optional[List[str]] =None) -> None:
+    from .parser import import_callable
+    parser = argparse.ArgumentParser(prog="python -m defparse.runner", description="Execute a callable for every record of a JSON Lines stream.")
+    parser.add_argument("callable", help="callable to execute, e.g. `package.module:function`")
+    parser.add_argument("--input", default=None, metavar="PATH", help="JSON Lines file of records, defaults to standard input")
+    parser.add_argument("--output", default=None, metavar="PATH", help="JSON Lines file of results, defaults to standard output")
+    parser.add_argument("--executor", default="thread", choices=["thread", "process"])
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--max-pending", type=int, default=None, help="maximum number of chunks in flight")
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--unordered", action="store_true", help="write results as they complete")
+    args = parser.parse_args(argv)
+
+    fn = import_callable(args.callable)
+    target_parser = ArgumentParser(prog=args.callable)
+    container = target_parser.add_args_from_callable(fn)
+
+    input = open(args.input, 'r') if args.input is not None else sys.stdin
+    output = open(args.output, 'w') if args.output is not None else sys.stdout
+    try:
+        failed = run_jsonl(
+            target_parser,
+            container,
+            input,
+            output,
+            executor=args.executor,
+            max_workers=args.max_workers,
+            max_pending=args.max_pending,
+            chunksize=args.chunksize,
+            ordered=not args.unordered
+        )
+    finally:
+        if args.input is not None:
+            input.close()
+        if args.output is not None:
+            output.close()
+    sys.exit(1 if failed > 0 else 0)
+
+if __name__ == '__main__':
+    main()
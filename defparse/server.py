@@ -0,0 +1,188 @@
+""" Server mode keeping a built parser warm in a long-lived process.
+
+    The server listens on a Unix socket and handles one request per
+    connection. Requests and responses are single lines of JSON:
+
+        request:  {"argv": [...], "stdin": "..."}
+        response: {"stdout": "...", "stderr": "...", "exit_code": 0}
+
+    Use `defparse.client` to forward the command line arguments, the
+    standard input and the exit code of an invocation to the server.
+"""
+import io
+import os
+import sys
+import stat
+import json
+import socket
+import threading
+import traceback
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Union
+from .parser import ArgumentParser, ArgsContainer, Subcommands
+
+class _ThreadLocalStream(object):
+    """ Redirects a standard stream to a per-thread stream. """
+
+    def __init__(self, default:Any):
+        self._default = default
+        self._local = threading.local()
+
+    def redirect(self, stream:Optional[Any]) -> None:
+        self._local.stream = stream
+
+    def __getattr__(self, name:str) -> Any:
+        stream = getattr(self._local, 'stream', None)
+        return getattr(self._default if stream is None else stream, name)
+
+_STREAMS = ('stdout', 'stderr', 'stdin')
+_streams_lock = threading.Lock()
+
+def _redirect(*targets:Any) -> None:
+    # redirect standard streams of the current thread, the
+    # streams are replaced on demand as others, e.g. test
+    # runners, may replace them as well
+    with _streams_lock:
+        for name, target in zip(_STREAMS, targets):
+            stream = getattr(sys, name)
+            if not isinstance(stream, _ThreadLocalStream):
+                if target is None:
+                    continue
+                stream = _ThreadLocalStream(stream)
+                setattr(sys, name, stream)
+            stream.redirect(target)
+
+def _restore() -> None:
+    with _streams_lock:
+        for name in _STREAMS:
+            stream = getattr(sys, name)
+            if isinstance(stream, _ThreadLocalStream):
+                setattr(sys, name, stream._default)
+
+def _exit_code(e:SystemExit) -> int:
+    # mirror the interpreter handling of exit codes
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    print(e.code, file=sys.stderr)
+    return 1
+
+def read_message(sock:socket.socket) -> Optional[Dict[str, Any]]:
+    # read a single line of JSON
+    data = bytearray()
+    while not data.endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if len(chunk) == 0:
+            break
+        data.extend(chunk)
+    return json.loads(data.decode('utf-8')) if len(data) > 0 else None
+
+def write_message(sock:socket.socket, message:Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+class Server(object):
+    """ Serve parse and execute requests for a prebuilt parser.
+
+        Every request parses its command line arguments with the
+        given parser and executes the target, i.e. an argument
+        container or the subcommands of the parser. Output written
+        to the standard streams is captured per request. Requests
+        are handled by a pool of `max_workers` threads or the given
+        executor, sharing the parser through reentrant parsing.
+    """
+
+    def __init__(
+        self,
+        parser:ArgumentParser,
+        target:Union[ArgsContainer, Subcommands],
+        path:str,
+        *,
+        executor:Optional[Executor] =None,
+        max_workers:Optional[int] =None
+    ):
+        self.parser = parser
+        self.target = target
+        self.path = path
+        self._executor = executor
+        self._max_workers = max_workers
+        self._closed = threading.Event()
+        # remove stale socket of previous server but
+        # never anything else existing at the path
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            if not stat.S_ISSOCK(mode):
+                raise RuntimeError("Cannot bind server to %s, path exists and is not a socket" % self.path)
+            os.unlink(self.path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.path)
+        self._socket.listen()
+
+    def handle(self, request:Dict[str, Any]) -> Dict[str, Any]:
+        """ Handle a single request and build the response. """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        _redirect(stdout, stderr, io.StringIO(request.get('stdin', None) or ''))
+        try:
+            result = self.parser.parse(list(request.get('argv', [])))
+            result[self.target].execute()
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = _exit_code(e)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            _redirect(None, None, None)
+        return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit_code': exit_code}
+
+    def _handle_connection(self, conn:socket.socket) -> None:
+        with conn:
+            try:
+                request = read_message(conn)
+                if request is not None:
+                    write_message(conn, self.handle(request))
+            except (OSError, ValueError):
+                # client disconnected or sent invalid request
+                pass
+
+    def serve_forever(self) -> None:
+        """ Accept and handle connections until `shutdown` is called. """
+        executor = self._executor or ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            while not self._closed.is_set():
+                try:
+                    conn, _ = self._socket.accept()
+                except OSError:
+                    # socket closed by shutdown
+                    break
+                executor.submit(self._handle_connection, conn)
+        finally:
+            if self._executor is None:
+                executor.shutdown(wait=True)
+            _restore()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def shutdown(self) -> None:
+        """ Stop accepting connections. """
+        self._closed.set()
+        try:
+            # wake up the accept call
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+def serve(
+    parser:ArgumentParser,
+    target:Union[ArgsContainer, Subcommands],
+    path:str,
+    *,
+    executor:Optional[Executor] =None,
+    max_workers:Optional[int] =None
+) -> None:
+    """ Serve requests for a parser on a Unix socket, see `Server`. """
+    Server(parser, target, path, executor=executor, max_workers=max_workers).serve_forever()
@@ -0,0 +1,133 @@
+import itertools
+from dataclasses import dataclass
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    as_completed
+)
+from typing import Any, Dict, List, Tuple, Union, Literal, Callable, Iterator, Optional, Sequence
+
+@dataclass
+class SweepResult():
+    """ Result of a single point of a sweep.
+
+        Holds either the return value of the callable or the
+        exception raised by it in `error`.
+    """
+    index:int
+    kwargs:Dict[str, Any]
+    result:Any =None
+    error:Optional[BaseException] =None
+
+def expand(
+    kwargs:Dict[str, Any],
+    over:Sequence[str],
+    mode:Literal['product', 'zip'] ='product'
+) -> List[Dict[str, Any]]:
+    """ Expand keyword arguments into the points of a sweep.
+
+        The values of all arguments in `over` must be sequences or
+        sets. In `product` mode all combinations of the values are
+        generated, in `zip` mode the values are combined element-wise.
+    """
+    values = []
+    for name in over:
+        if name not in kwargs:
+            raise KeyError("Cannot sweep over unknown argument `%s`" % name)
+        if not isinstance(kwargs[name], (list, tuple, set, frozenset)):
+            raise TypeError("Cannot sweep over argument `%s` of type %s" % (name, type(kwargs[name])))
+        values.append(list(kwargs[name]))
+
+    if mode == 'product':
+        points = itertools.product(*values)
+    elif mode == 'zip':
+        if len(set(map(len, values))) > 1:
+            raise ValueError("Cannot zip arguments of different lengths: %s" % ", ".join(
+                "%s=%i" % (name, len(vals)) for name, vals in zip(over, values)
+            ))
+        points = zip(*values)
+    else:
+        raise ValueError("Unknown sweep mode `%s`" % mode)
+
+    return [{**kwargs, **dict(zip(over, point))} for point in points]
+
+def run_chunk(
+    chunk:List[Tuple[int, Callable, Dict[str, Any]]],
+    extra_kwargs:Dict[str, Any]
+) -> List[Tuple[int, Any, Optional[BaseException]]]:
+    """ Call the callables of a chunk and capture failures per item. """
+    results = []
+    for i, fn, kwargs in chunk:
+        try:
+            results.append((i, fn(**kwargs, **extra_kwargs), None))
+        except Exception as e:
+            results.append((i, None, e))
+    return results
+
+def chunk_results(
+    future:Future,
+    chunk:List[Tuple[int, Callable, Dict[str, Any]]]
+) -> List[Tuple[int, Any, Optional[BaseException]]]:
+    """ Results of a chunk submitted with `run_chunk`. """
+    try:
+        return future.result()
+    except Exception as e:
+        # the chunk failed as a whole, e.g. due to
+        # the callable not being picklable
+        return [(i, None, e) for i, _, _ in chunk]
+
+def make_executor(
+    executor:Union[Literal['process', 'thread'], Executor],
+    max_workers:Optional[int] =None
+) -> Tuple[Executor, bool]:
+    """ Create a process or thread pool unless an executor is given.
+
+        Returns the executor and whether it was created, i.e. needs
+        to be shut down by the caller.
+    """
+    if isinstance(executor, Executor):
+        return executor, False
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers), True
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers), True
+    raise ValueError("Unknown executor `%s`" % executor)
+
+def run_sweep(
+    fn:Callable,
+    points:List[Dict[str, Any]],
+    *,
+    executor:Union[Literal['process', 'thread'], Executor] ='process',
+    max_workers:Optional[int] =None,
+    chunksize:int =1,
+    ordered:bool =True,
+    extra_kwargs:Dict[str, Any] ={}
+) -> Iterator[SweepResult]:
+    """ Execute a callable for all points of a sweep.
+
+        Points are distributed in chunks of `chunksize` to a process
+        or thread pool. Results are streamed in the order of the
+        points if `ordered` is set and as they complete otherwise.
+    """
+    if chunksize < 1:
+        raise ValueError("Chunk size must be positive, got %i" % chunksize)
+
+    executor, own_executor = make_executor(executor, max_workers)
+    try:
+        # submit chunks of points
+        points = [(i, fn, kwargs) for i, kwargs in enumerate(points)]
+        chunks = [points[i:i+chunksize] for i in range(0, len(points), chunksize)]
+        futures = {
+            executor.submit(run_chunk, chunk, extra_kwargs): chunk
+            for chunk in chunks
+        }
+        # stream results
+        for future in (futures if ordered else as_completed(futures)):
+            chunk = futures[future]
+            for (i, result, error), (_, _, kwargs) in zip(chunk_results(future, chunk), chunk):
+                yield SweepResult(i, kwargs, result=result, error=error)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
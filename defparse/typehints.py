@@ -1,12 +1,38 @@
-from typing import _type_check, _SpecialForm, _GenericAlias
+import types
 
-@_SpecialForm
-def Ignore(self, parameter):
+class _TypeModifier(object):
+    """ Base of type modifiers subscripted by a single type. """
+
+    def __new__(cls, *args, **kwargs):
+        raise TypeError("Cannot instantiate %s" % cls.__name__)
+
+    def __class_getitem__(cls, parameter):
+        # check type
+        if isinstance(parameter, tuple):
+            raise TypeError("%s requires a single type." % cls.__name__)
+        return types.GenericAlias(cls, (parameter,))
+
+class Ignore(_TypeModifier):
     """ Type Modifier to mark an argument as ignore.
 
         Arguments with types marked by `Ignore` are not added
         to the argument parser.
     """
-    # check type
-    arg = _type_check(parameter, msg=f"{self} requires a single type.")
-    return _GenericAlias(self, (arg,))
+
+class Sweep(_TypeModifier):
+    """ Type Modifier to mark an argument to sweep over.
+
+        Arguments marked by `Sweep` accept multiple values on the
+        command line. `ArgsContainer.sweep` calls the callable once
+        per value, see `defparse.sweep`.
+    """
+
+class Array(_TypeModifier):
+    """ Type Modifier to mark an argument as NumPy array.
+
+        Values of arguments typed by `Array[dtype]` are converted
+        to a NumPy array of the given dtype in a single step. A
+        single value of the form `@path` loads the array from a
+        `.npy` or raw binary file as read-only memory map. NumPy
+        is only imported when such an argument is registered.
+    """
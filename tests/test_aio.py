@@ -0,0 +1,127 @@
+import asyncio
+from defparse import ArgumentParser, run_concurrently
+from defparse.aio import gather
+
+class TestAsync():
+
+    def test_execute_coroutine_function(self):
+
+        async def test_function_A(A:int, B:float =0.3):
+            await asyncio.sleep(0)
+            return (A, B)
+
+        # create parser
+        parser = ArgumentParser()
+        test_function_A = parser.add_args_from_callable(test_function_A)
+        assert test_function_A.is_async
+
+        # execute runs the coroutine
+        parser.parse_args("--A 1".split())
+        assert test_function_A() == (1, 0.3)
+
+        # awaitable within a running loop
+        async def main():
+            return (
+                await test_function_A.aexecute(),
+                await test_function_A()
+            )
+        assert asyncio.run(main()) == ((1, 0.3), (1, 0.3))
+
+    def test_aexecute_sync_function(self):
+
+        def test_function_A(A:int):
+            return A
+
+        # create parser
+        parser = ArgumentParser()
+        test_function_A = parser.add_args_from_callable(test_function_A)
+        assert not test_function_A.is_async
+
+        parser.parse_args("--A 2".split())
+        assert asyncio.run(test_function_A.aexecute()) == 2
+
+    def test_replace_with_coroutine_function(self):
+
+        def test_function_A(A:int):
+            return A
+
+        async def test_function_B(A:int):
+            await asyncio.sleep(0)
+            return -A
+
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(test_function_A)
+        parser.parse_args("--A 3".split())
+        assert container() == 3
+
+        # replaced callables are checked again
+        parser.replace_callable(container, test_function_B)
+        assert container.is_async
+        parser.parse_args("--A 3".split())
+        assert container() == -3
+        parser.replace_callable(container, test_function_A)
+        assert not container.is_async
+        assert container() == 3
+
+    def test_execute_batch(self):
+
+        async def test_function_A(A:int):
+            await asyncio.sleep(0)
+            return A * 2
+
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(test_function_A)
+
+        # coroutines of every row are run
+        batch = parser.parse_many([["--A", "1"], ["--A", "x"], ["--A", "3"]])
+        assert container.execute_batch(batch) == [2, None, 6]
+
+    def test_run_concurrently_with_limit(self):
+
+        running, max_running = 0, 0
+
+        async def fetch(url:str ="a"):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return url
+
+        async def upload(target:str ="b"):
+            await asyncio.sleep(0.01)
+            return target
+
+        def check(C:int =3):
+            return C
+
+        # create parser
+        parser = ArgumentParser()
+        fetch = parser.add_args_from_callable(fetch)
+        upload = parser.add_args_from_callable(upload)
+        check = parser.add_args_from_callable(check)
+
+        parser.parse_args("--url x".split())
+        results = run_concurrently([fetch, upload, check, fetch, fetch], limit=2)
+        assert results == ["x", "b", 3, "x", "x"]
+        assert max_running <= 2
+
+    def test_gather_exceptions(self):
+
+        async def fail(A:int =1):
+            raise ValueError(A)
+
+        async def succeed(B:int =2):
+            return B
+
+        # create parser
+        parser = ArgumentParser()
+        fail = parser.add_args_from_callable(fail)
+        succeed = parser.add_args_from_callable(succeed)
+
+        parser.parse_args("")
+        results = asyncio.run(gather([fail, succeed], return_exceptions=True))
+        assert isinstance(results[0], ValueError)
+        assert results[1] == 2
@@ -0,0 +1,70 @@
+import json
+import pytest
+from defparse import ArgumentParser, Array
+
+np = pytest.importorskip("numpy")
+
+def scale(x:Array[float], factor:float =2.0):
+    return x * factor
+
+class TestArrays():
+
+    def test_values(self):
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(scale)
+
+        args = parser.parse_args("--x 1 2.5 3".split())
+        assert isinstance(args.x, np.ndarray)
+        assert args.x.dtype == np.float64
+        assert (container() == np.array([2.0, 5.0, 6.0])).all()
+
+    def test_invalid_values(self, capsys):
+        # create parser
+        parser = ArgumentParser()
+        parser.add_args_from_callable(scale)
+
+        with pytest.raises(SystemExit):
+            parser.parse_args("--x 1 a".split())
+        assert "invalid float64 array value" in capsys.readouterr().err
+
+    def test_load_files(self, tmp_path):
+        # create parser
+        parser = ArgumentParser()
+        parser.add_args_from_callable(scale)
+
+        # npy file is memory mapped
+        path = str(tmp_path / "x.npy")
+        np.save(path, np.arange(4, dtype=np.float64))
+        x = parser.parse_args(["--x", "@" + path]).x
+        assert isinstance(x, np.memmap) and not x.flags.writeable
+        assert (x == np.arange(4)).all()
+        # raw binary file interpreted by dtype
+        path = str(tmp_path / "x.bin")
+        np.arange(3, dtype=np.float64).tofile(path)
+        assert (parser.parse_args(["--x", "@" + path]).x == np.arange(3)).all()
+
+    def test_load_files_dtype_mismatch(self, tmp_path, capsys):
+        # create parser
+        parser = ArgumentParser()
+        parser.add_args_from_callable(scale)
+
+        path = str(tmp_path / "x.npy")
+        np.save(path, np.arange(4, dtype=np.int32))
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--x", "@" + path])
+        assert "expected array of dtype float64, got int32" in capsys.readouterr().err
+
+    def test_fallback_and_config(self, tmp_path):
+        # create parser
+        parser = ArgumentParser(config_option="--config")
+        parser.add_args_from_callable(scale)
+
+        # fast path and argparse produce the same arrays
+        fast = parser.parse_args("--x 1 2".split()).x
+        slow = parser.parse_args("--x 1 2 --fac 1".split()).x
+        assert (fast == slow).all() and (fast.dtype == slow.dtype)
+        # arrays from config files
+        config = tmp_path / "config.json"
+        config.write_text(json.dumps({"x": [1, 2, 3]}))
+        assert (parser.parse_args(["--config", str(config)]).x == np.array([1.0, 2.0, 3.0])).all()
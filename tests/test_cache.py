@@ -0,0 +1,102 @@
+import os
+import sys
+import importlib
+import defparse.parser
+from defparse import ArgumentParser
+
+MODULE_SOURCE = '''
+def test_function_A(A:int, B:float =0.3):
+    """ Test function
+
+        Args:
+            A (int): description of argument A
+            B (float): description of argument B
+    """
+    return (A, B)
+'''
+
+def _write_module(path, source):
+    with open(path, 'w') as f:
+        f.write(source)
+    # make sure the modification time changes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+class TestSpecCache():
+
+    def _import(self, tmp_path, monkeypatch, source):
+        _write_module(tmp_path / "cached_module.py", source)
+        monkeypatch.syspath_prepend(str(tmp_path))
+        sys.modules.pop("cached_module", None)
+        importlib.invalidate_caches()
+        return importlib.import_module("cached_module")
+
+    def test_warm_start_skips_introspection(self, tmp_path, monkeypatch):
+        module = self._import(tmp_path, monkeypatch, MODULE_SOURCE)
+        cache_dir = str(tmp_path / "cache")
+
+        # cold start populates the cache
+        parser = ArgumentParser(cache_dir=cache_dir)
+        parser.add_args_from_callable(module.test_function_A)
+        assert len(os.listdir(cache_dir)) == 1
+
+        # warm start must not introspect the callable
+        defparse.parser._spec_memo.clear()
+        def fail(fn, **kwargs):
+            assert False, "Expected spec to be loaded from cache"
+        monkeypatch.setattr(defparse.parser, "_build_callable_spec", fail)
+
+        parser = ArgumentParser(cache_dir=cache_dir)
+        test_function_A = parser.add_args_from_callable(module.test_function_A)
+        # check args
+        assert parser._option_string_actions['--A'].type is int
+        assert parser._option_string_actions['--A'].required is True
+        assert parser._option_string_actions['--B'].help == "description of argument B"
+        # parse and execute
+        parser.parse_args("--A 2".split())
+        assert test_function_A() == (2, 0.3)
+
+    def test_default_identity(self, tmp_path, monkeypatch):
+        module = self._import(tmp_path, monkeypatch, '''
+_MISSING = object()
+
+def test_function_A(A:int, B:object =_MISSING, C:tuple =(1, "a")):
+    return (B is _MISSING, C)
+''')
+        cache_dir = str(tmp_path / "cache")
+
+        # specs with defaults that are not literals are not cached
+        for _ in range(2):
+            defparse.parser._spec_memo.clear()
+            parser = ArgumentParser(cache_dir=cache_dir)
+            test_function_A = parser.add_args_from_callable(module.test_function_A)
+            parser.parse_args("--A 1".split())
+            assert test_function_A() == (True, (1, "a"))
+        assert not os.path.exists(cache_dir) or len(os.listdir(cache_dir)) == 0
+
+    def test_invalidation_on_source_change(self, tmp_path, monkeypatch):
+        module = self._import(tmp_path, monkeypatch, MODULE_SOURCE)
+        cache_dir = str(tmp_path / "cache")
+
+        parser = ArgumentParser(cache_dir=cache_dir)
+        parser.add_args_from_callable(module.test_function_A)
+        assert parser._option_string_actions['--B'].type is float
+
+        # change the signature of the callable
+        module = self._import(tmp_path, monkeypatch, MODULE_SOURCE.replace("B:float =0.3", "B:int =3"))
+
+        parser = ArgumentParser(cache_dir=cache_dir)
+        parser.add_args_from_callable(module.test_function_A)
+        assert parser._option_string_actions['--B'].type is int
+        assert parser._option_string_actions['--B'].default == 3
+
+    def test_local_callables_are_not_cached(self, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+
+        def test_function_A(A:int):
+            return A
+
+        parser = ArgumentParser(cache_dir=cache_dir)
+        parser.add_args_from_callable(test_function_A)
+        assert "--A" in parser._option_string_actions
+        assert len(os.listdir(cache_dir)) == 0
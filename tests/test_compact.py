@@ -0,0 +1,93 @@
+import argparse
+import pytest
+from defparse import ArgumentParser
+from test_fastpath import example_function, FAST_ARGVS, FALLBACK_ARGVS
+
+def other_function(K:int =3, L:bool =False):
+    """ Test function
+
+        Args:
+            K (int): description of argument K
+            L (bool): description of argument L
+    """
+    return (K, L)
+
+class TestCompactParser():
+
+    def _parser(self, compact, **kwargs):
+        # create parser
+        parser = ArgumentParser(prog="test", compact=compact, **kwargs)
+        parser.add_args_from_callable(example_function)
+        parser.add_args_from_callable(other_function)
+        return parser
+
+    @pytest.mark.parametrize("argv", FAST_ARGVS + FALLBACK_ARGVS)
+    def test_identical_results(self, argv, capsys):
+        results = []
+        for compact in (False, True):
+            try:
+                results.append(vars(self._parser(compact).parse_args(argv.split())))
+            except SystemExit:
+                results.append(capsys.readouterr().err)
+        assert results[0] == results[1]
+
+    def test_lazy_materialization(self, monkeypatch):
+        parser = self._parser(compact=True)
+        num_actions = len(parser._materialized_actions)
+        assert len(parser._records) == 12
+        assert len(parser._action_groups) == 2
+
+        # fast path parses records without materializing them
+        def fail(*args, **kwargs):
+            assert False, "Expected compiled parser to handle arguments"
+        with monkeypatch.context() as m:
+            m.setattr(argparse.ArgumentParser, "parse_known_args", fail)
+            args = parser.parse_args("--A 1 --K 5 --L".split())
+        assert (args.A, args.K, args.L) == (1, 5, True)
+        assert len(parser._materialized_actions) == num_actions
+
+        # fallback to argparse materializes records
+        args = parser.parse_args("--A=2".split())
+        assert args.A == 2
+        assert len(parser._records) == 0
+        assert len(parser._materialized_actions) == num_actions + 12
+        assert len(parser._action_groups) == 4
+
+    def test_identical_help(self):
+        for lazy_help in (False, True):
+            help_texts = [
+                self._parser(compact, lazy_help=lazy_help).format_help()
+                for compact in (False, True)
+            ]
+            assert help_texts[0] == help_texts[1]
+            assert "description of argument K" in help_texts[1]
+
+    def test_conflicts(self):
+        parser = self._parser(compact=True)
+        # arguments used by multiple callables
+        def test_function_C(K:int =1):
+            return K
+        container = parser.add_args_from_callable(test_function_C)
+        parser.parse_args("--A 1 --K 4".split())
+        assert container() == 4
+        # type conflicts with compact records
+        def test_function_D(K:str ="a"):
+            return K
+        with pytest.raises(TypeError):
+            parser.add_args_from_callable(test_function_D)
+
+    def test_env_and_config(self, tmp_path, monkeypatch):
+        config = tmp_path / "config.json"
+        config.write_text('{"K": 5, "D": "y", "E": [4]}')
+        monkeypatch.setenv("APP_A", "1")
+        monkeypatch.setenv("APP_E", "2 3")
+        monkeypatch.setenv("APP_L", "true")
+
+        results = []
+        for compact in (False, True):
+            parser = self._parser(compact, env_prefix="APP", config_option="--config")
+            results.append(vars(parser.parse_args(["--config", str(config)])))
+        assert results[0] == results[1]
+        assert (results[1]['A'], results[1]['D'], results[1]['E'], results[1]['K'], results[1]['L']) == (1, "y", [2, 3], 5, True)
+        # values are converted without materializing records
+        assert len(parser._records) == 12
@@ -0,0 +1,52 @@
+import shutil
+import subprocess
+import pytest
+from typing import Literal
+from defparse import ArgumentParser
+from defparse.completion import build_index, write_index, completion_script
+
+def train(lr:float, mode:Literal["fast", "slow"] ="fast", verbose:bool =False):
+    return (lr, mode, verbose)
+
+def evaluate(split:Literal["val", "test"] ="val"):
+    return split
+
+def _parser():
+    parser = ArgumentParser(prog="tool")
+    parser.add_subcommands({"train": train, "evaluate": evaluate})
+    return parser
+
+class TestCompletion():
+
+    def test_index(self):
+        lines = build_index(_parser()).splitlines()[1:]
+        entries = {tuple(line.split('\t')[:3]): line.split('\t')[3] for line in lines}
+        # subcommands and their options
+        assert entries[('', 'command', 'train')] == ''
+        assert entries[('train', 'value', '--lr')] == ''
+        assert entries[('train', 'value', '--mode')] == 'fast slow'
+        assert entries[('train', 'flag', '--verbose')] == ''
+        assert entries[('evaluate', 'value', '--split')] == 'val test'
+        assert ('', 'flag', '--help') in entries
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="requires bash")
+    def test_bash_script(self, tmp_path):
+        index = str(tmp_path / "tool.index")
+        write_index(_parser(), index)
+        script = completion_script("tool", index, shell="bash")
+
+        def complete(*words):
+            # simulate completion of the last word
+            words = ["tool"] + list(words)
+            code = script + (
+                "\nCOMP_WORDS=(%s); COMP_CWORD=%i; _defparse_tool; echo \"${COMPREPLY[*]}\"" 
+                % (" ".join("'%s'" % w for w in words), len(words) - 1)
+            )
+            out = subprocess.run(["bash", "-c", code], capture_output=True, text=True, check=True)
+            return sorted(out.stdout.split())
+
+        assert complete("") == ["--help", "-h", "evaluate", "train"]
+        assert complete("train", "--m") == ["--mode"]
+        assert complete("train", "--mode", "") == ["fast", "slow"]
+        assert complete("evaluate", "--split", "t") == ["test"]
+        assert complete("train", "--lr", "") == []
@@ -0,0 +1,100 @@
+import os
+import json
+import pytest
+import defparse.config
+from typing import List, Literal
+from defparse import ArgumentParser
+
+def train(lr:float, epochs:int =3, layers:List[int] =[8], mode:Literal["a", "b"] ="a", verbose:bool =False):
+    return (lr, epochs, layers, mode, verbose)
+
+def _write(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+    return str(path)
+
+class TestConfig():
+
+    def _parser(self):
+        parser = ArgumentParser(config_option="--config")
+        container = parser.add_args_from_callable(train)
+        return parser, container
+
+    def test_precedence(self, tmp_path):
+        parser, container = self._parser()
+        config = _write(tmp_path / "config.json", json.dumps({
+            "lr": 0.1, "epochs": 5, "layers": [4, 4], "verbose": True
+        }))
+
+        # config overrides defaults
+        parser.parse_args(["--config", config])
+        assert container() == (0.1, 5, [4, 4], "a", True)
+        # command line overrides config
+        parser.parse_args(["--config", config, "--lr", "0.5", "--epochs", "7"])
+        assert container() == (0.5, 7, [4, 4], "a", True)
+
+    def test_layered_files(self, tmp_path):
+        parser, container = self._parser()
+        base = _write(tmp_path / "base.json", json.dumps({"lr": 0.1, "epochs": 5}))
+        override = _write(tmp_path / "override.toml", 'epochs = 9\nmode = "b"\n')
+
+        # later files take precedence
+        parser.parse_args(["--config", base, "--config", override])
+        assert container() == (0.1, 9, [8], "b", False)
+
+    def test_invalid_values(self, tmp_path, capsys):
+        parser, container = self._parser()
+
+        config = _write(tmp_path / "type.json", json.dumps({"lr": 0.1, "epochs": "x"}))
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--config", config])
+        assert "invalid int value: 'x'" in capsys.readouterr().err
+
+        config = _write(tmp_path / "choice.json", json.dumps({"lr": 0.1, "mode": "c"}))
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--config", config])
+        assert "invalid choice: 'c'" in capsys.readouterr().err
+
+        config = _write(tmp_path / "unknown.json", json.dumps({"lr": 0.1, "unknown": 1}))
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--config", config])
+        assert "unrecognized argument in config file" in capsys.readouterr().err
+
+    def test_file_cache(self, tmp_path, monkeypatch):
+        parser, container = self._parser()
+        path = tmp_path / "config.json"
+        config = _write(path, json.dumps({"lr": 0.1}))
+
+        # count loaded files
+        loads = []
+        json_load = json.load
+        def load(f):
+            loads.append(f.name)
+            return json_load(f)
+        monkeypatch.setattr(defparse.config.json, "load", load)
+
+        for _ in range(3):
+            parser.parse_args(["--config", config])
+        assert len(loads) == 1
+        # file is shared across parsers
+        other_parser, other_container = self._parser()
+        other_parser.parse_args(["--config", config])
+        assert len(loads) == 1
+        assert other_container() == (0.1, 3, [8], "a", False)
+
+        # modified files are reloaded
+        _write(path, json.dumps({"lr": 0.2}))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        parser.parse_args(["--config", config])
+        assert len(loads) == 2
+        assert container() == (0.2, 3, [8], "a", False)
+
+    def test_cached_values_copied(self, tmp_path):
+        parser, container = self._parser()
+        config = _write(tmp_path / "config.json", json.dumps({"lr": 0.1, "layers": [4, 4]}))
+
+        # changes of a namespace do not leak into later parses
+        parser.parse_args(["--config", config]).layers.append(99)
+        assert parser.parse_args(["--config", config]).layers == [4, 4]
+        assert parser.parse(["--config", config]).layers == [4, 4]
@@ -0,0 +1,116 @@
+import json
+import pytest
+from typing import List, Literal
+from defparse import ArgumentParser
+
+def train(learning_rate:float, epochs:int =3, layers:List[int] =[8], mode:Literal["a", "b"] ="a", verbose:bool =False):
+    return (learning_rate, epochs, layers, mode, verbose)
+
+def tag(names:List[str], offset:float =0.0):
+    return (names, offset)
+
+class TestEnv():
+
+    def _parser(self, **kwargs):
+        # create parser
+        parser = ArgumentParser(env_prefix="APP", formatter=lambda n: n.replace('_', '-'), **kwargs)
+        container = parser.add_args_from_callable(train)
+        return parser, container
+
+    def test_env_values(self, monkeypatch):
+        parser, container = self._parser()
+        monkeypatch.setenv("APP_LEARNING_RATE", "0.1")
+        monkeypatch.setenv("APP_LAYERS", "4 4")
+        monkeypatch.setenv("APP_MODE", "b")
+        monkeypatch.setenv("APP_VERBOSE", "true")
+        monkeypatch.setenv("APP_UNKNOWN", "1")
+        monkeypatch.setenv("OTHER_EPOCHS", "1")
+
+        parser.parse_args([])
+        assert container() == (0.1, 3, [4, 4], "b", True)
+        # command line overrides environment
+        parser.parse_args(["--learning-rate", "0.5", "--mode", "a"])
+        assert container() == (0.5, 3, [4, 4], "a", True)
+
+    def test_env_over_config(self, tmp_path, monkeypatch):
+        parser, container = self._parser(config_option="--config")
+        config = tmp_path / "config.json"
+        config.write_text(json.dumps({"learning_rate": 0.1, "epochs": 5}))
+        monkeypatch.setenv("APP_LEARNING_RATE", "0.2")
+        monkeypatch.setenv("APP_EPOCHS", "7")
+
+        parser.parse_args(["--config", str(config)])
+        assert container() == (0.2, 7, [8], "a", False)
+
+    def test_required_values(self, monkeypatch):
+        # create parser
+        parser = ArgumentParser(env_prefix="APP")
+        container = parser.add_args_from_callable(tag)
+        monkeypatch.setenv("APP_NAMES", "-a b")
+
+        parser.parse_args([])
+        assert container() == (["-a", "b"], 0.0)
+        # parsed by argparse
+        parser.parse_args(["--offset=-1"])
+        assert container() == (["-a", "b"], -1.0)
+        # command line overrides environment
+        parser.parse_args(["--names", "c"])
+        assert container() == (["c"], 0.0)
+
+        # values of subcommands
+        parser = ArgumentParser(env_prefix="APP")
+        commands = parser.add_subcommands({"tag": tag})
+        parser.parse_args(["tag", "--offset", "1"])
+        assert commands.execute() == (["-a", "b"], 1.0)
+
+    def test_invalid_values(self, monkeypatch, capsys):
+        parser, container = self._parser()
+        monkeypatch.setenv("APP_LEARNING_RATE", "0.1")
+
+        monkeypatch.setenv("APP_EPOCHS", "x")
+        with pytest.raises(SystemExit):
+            parser.parse_args([])
+        assert "environment variable APP_EPOCHS: argument --epochs: invalid int value: 'x'" in capsys.readouterr().err
+
+        monkeypatch.setenv("APP_EPOCHS", "1")
+        monkeypatch.setenv("APP_VERBOSE", "maybe")
+        with pytest.raises(SystemExit):
+            parser.parse_args([])
+        assert "expected boolean value" in capsys.readouterr().err
+
+    def test_index_rebuilt(self, monkeypatch):
+        parser, container = self._parser()
+        monkeypatch.setenv("APP_LEARNING_RATE", "0.1")
+        monkeypatch.setenv("APP_SEED", "3")
+        parser.parse_args([])
+
+        # new arguments are bound as well
+        def seed(seed:int =0):
+            return seed
+        container = parser.add_args_from_callable(seed)
+        parser.parse_args([])
+        assert container() == 3
+
+    def test_subcommands(self, tmp_path, monkeypatch, capsys):
+        # create parser
+        parser = ArgumentParser(env_prefix="APP", config_option="--config")
+        commands = parser.add_subcommands({"train": train})
+        monkeypatch.setenv("APP_LEARNING_RATE", "0.1")
+        monkeypatch.setenv("APP_EPOCHS", "5")
+
+        parser.parse_args(["train"])
+        assert commands.execute() == (0.1, 5, [8], "a", False)
+        # config files apply to subcommands, environment takes precedence
+        config = tmp_path / "config.json"
+        config.write_text(json.dumps({"epochs": 7, "mode": "b"}))
+        parser.parse_args(["--config", str(config), "train"])
+        assert commands.execute() == (0.1, 5, [8], "b", False)
+        # command line takes precedence
+        parser.parse_args(["--config", str(config), "train", "--epochs", "9"])
+        assert commands.execute() == (0.1, 9, [8], "b", False)
+
+        # names unknown to the selected subcommand
+        config.write_text(json.dumps({"unknown": 1}))
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--config", str(config), "train"])
+        assert "unrecognized argument in config file %s: unknown" % config in capsys.readouterr().err
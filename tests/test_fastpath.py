@@ -0,0 +1,124 @@
+import argparse
+import pytest
+from defparse import ArgumentParser
+from defparse.fastpath import CompiledParser
+from typing import Literal, List, Set, Tuple, Optional
+
+def example_function(
+    A:int,
+    B:float =0.3,
+    C:str ="c",
+    D:Literal["x", "y"] ="x",
+    E:List[int] =[1],
+    F:Set[str] =set(),
+    G:Tuple[float, float] =(0.0, 0.0),
+    H:bool =False,
+    I:bool =True,
+    J:Optional[int] =None
+):
+    return (A, B, C, D, E, F, G, H, I, J)
+
+FAST_ARGVS = [
+    "--A 1",
+    "--A 1 --B 2.5 --C hello",
+    "--A 1 --A 2",
+    "--A 1 --D y",
+    "--A 1 --E 1 2 3 --F a b",
+    "--A 1 --F",
+    "--A 1 --G 1 2 --H --I",
+    "--A 1 --J 4",
+    "--C x --A 3",
+    "--A 1 --P 1 --P 2",
+]
+
+FALLBACK_ARGVS = [
+    "",
+    "--A",
+    "--A x",
+    "--A 1 2",
+    "--A 1 --D z",
+    "--A 1 --E",
+    "--A 1 --G 1",
+    "--A 1 --G 1 2 3",
+    "--A 1 --H 1",
+    "--A -1",
+    "--A=1",
+    "--A 1 --unknown 2",
+    "--A 1 -- --B 2",
+    "--A 1 --P 1 2",
+]
+
+class TestCompiledParser():
+
+    def _parser(self):
+        parser = ArgumentParser(prog="test")
+        parser.add_args_from_callable(example_function)
+        parser.add_argument("--P", type=int, action="append")
+        return parser
+
+    @pytest.mark.parametrize("argv", FAST_ARGVS + FALLBACK_ARGVS)
+    def test_identical_results(self, argv):
+        parser = self._parser()
+        argv = argv.split()
+        # parse with argparse
+        try:
+            expected = argparse.ArgumentParser.parse_args(parser, argv)
+        except SystemExit:
+            expected = None
+        # compiled parser only handles valid arguments
+        parsed = CompiledParser(parser).parse(argv)
+        if " ".join(argv) in FAST_ARGVS:
+            assert vars(parsed) == vars(expected)
+        else:
+            assert parsed is None
+
+    def test_fast_path_is_used(self, monkeypatch):
+        parser = self._parser()
+        # fail on fallback to argparse
+        def fail(*args, **kwargs):
+            assert False, "Expected compiled parser to handle arguments"
+        monkeypatch.setattr(argparse.ArgumentParser, "parse_known_args", fail)
+        args = parser.parse_args("--A 1 --E 4 5 --H".split())
+        assert args.A == 1
+        assert args.E == [4, 5]
+        assert args.H is True
+
+    def test_fallback_error_messages(self, capsys):
+        parser = self._parser()
+        with pytest.raises(SystemExit):
+            parser.parse_args("--A 1 --D z".split())
+        assert "argument --D: invalid choice: 'z'" in capsys.readouterr().err
+
+    def test_recompile_on_new_actions(self):
+        parser = self._parser()
+        parser.parse_args("--A 1".split())
+        compiled = parser._compiled
+        # register more arguments
+        def test_function_B(K:int =3):
+            return K
+        parser.add_args_from_callable(test_function_B)
+        args = parser.parse_args("--A 1 --K 5".split())
+        assert parser._compiled is not compiled
+        assert args.K == 5
+
+    def test_unsupported_parser(self):
+        parser = self._parser()
+        parser.add_argument("positional")
+        assert not CompiledParser(parser).supported
+        args = parser.parse_args("pos --A 1".split())
+        assert args.positional == "pos"
+
+    def test_unsupported_converter(self, tmp_path, monkeypatch):
+        parser = self._parser()
+        parser.add_argument("--out", type=argparse.FileType('w'))
+        assert not CompiledParser(parser).supported
+
+        # files are opened once by argparse
+        opened = []
+        def counting_open(*args, **kwargs):
+            opened.append(args[0])
+            return open(*args, **kwargs)
+        monkeypatch.setattr(argparse, "open", counting_open, raising=False)
+        args = parser.parse_args(["--out", str(tmp_path / "out.txt"), "--A=1"])
+        args.out.close()
+        assert opened == [str(tmp_path / "out.txt")]
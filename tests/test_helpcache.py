@@ -0,0 +1,90 @@
+import os
+import sys
+import pytest
+import importlib
+from defparse import ArgumentParser
+
+SOURCE = '''
+def train(lr:float, epochs:int =3):
+    """ Train model
+
+        Args:
+            lr (float): learning rate
+            epochs (int): number of epochs
+    """
+'''
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    # module in a file that can be modified
+    path = tmp_path / "helpcache_module.py"
+    path.write_text(SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module("helpcache_module"), path
+    sys.modules.pop("helpcache_module", None)
+
+def _run(build, capsys):
+    # print help either from cache or by argparse
+    with pytest.raises(SystemExit) as e:
+        build()
+    assert e.value.code == 0
+    return capsys.readouterr().out
+
+class TestHelpCache():
+
+    def test_cached_help(self, tmp_path, module, monkeypatch, capsys):
+        module, source = module
+        cache = str(tmp_path / "help.json")
+        registered = []
+
+        def build():
+            # create parser
+            parser = ArgumentParser(prog="tool", help_cache=cache)
+            registered.append(parser)
+            parser.add_args_from_callable(module.train)
+            parser.parse_args()
+
+        monkeypatch.setattr(sys, "argv", ["tool", "--help"])
+        text = _run(build, capsys)
+        assert "learning rate" in text
+        assert len(registered) == 1
+        # printed from cache before registration
+        assert _run(build, capsys) == text
+        assert len(registered) == 1
+        monkeypatch.setattr(sys, "argv", ["tool", "-h"])
+        assert _run(build, capsys) == text
+        assert len(registered) == 1
+
+        # modified sources invalidate the cache
+        stat = os.stat(source)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert _run(build, capsys) == text
+        assert len(registered) == 2
+        assert _run(build, capsys) == text
+        assert len(registered) == 2
+
+    def test_cached_subcommand_help(self, tmp_path, module, monkeypatch, capsys):
+        module, source = module
+        cache = str(tmp_path / "help.json")
+        populated = []
+
+        def build():
+            # create parser
+            parser = ArgumentParser(prog="tool", help_cache=cache)
+            populated.append(parser)
+            parser.add_subcommands({"train": "helpcache_module:train", "other": "helpcache_module:train"})
+            parser.parse_args()
+
+        monkeypatch.setattr(sys, "argv", ["tool", "train", "-h"])
+        text = _run(build, capsys)
+        assert text.startswith("usage: tool train")
+        assert _run(build, capsys) == text
+        assert len(populated) == 1
+        # other subcommands and root are not cached yet
+        monkeypatch.setattr(sys, "argv", ["tool", "other", "-h"])
+        assert _run(build, capsys).startswith("usage: tool other")
+        assert len(populated) == 2
+        # arguments other than subcommands are not served from cache
+        monkeypatch.setattr(sys, "argv", ["tool", "train", "--lr", "1", "-h"])
+        assert _run(build, capsys) == text
+        assert len(populated) == 3
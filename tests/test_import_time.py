@@ -0,0 +1,69 @@
+import os
+import sys
+import subprocess
+import pytest
+
+# modules that must not be imported by `import defparse` or
+# the parser module, they are imported on first use instead
+DEFERRED_MODULES = [
+    'asyncio',
+    'concurrent.futures',
+    'docstring_parser',
+    'numpy',
+    'tempfile',
+    'pickle',
+    'defparse.sweep',
+    'defparse.aio',
+    'defparse.helpcache'
+]
+# budget for the time spent in defparse modules themselves
+BUDGET_US = int(os.environ.get("DEFPARSE_IMPORT_BUDGET_US", 30000))
+
+def importtime(code, cache_dir):
+    # byte code is cached in a separate directory and the
+    # import is measured after a warm up run writing it
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(cache_dir))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [sys.executable, "-X", "importtime", "-c", code]
+    subprocess.run(cmd, env=env, check=True, capture_output=True)
+    stderr = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True).stderr
+    # parse lines of the form `import time: self | cumulative | name`
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            self_us, _, name = line[len("import time:"):].split("|")
+            if self_us.strip().isdigit():
+                times[name.strip()] = int(self_us)
+    return times
+
+class TestImportTime():
+
+    def test_package_import(self, tmp_path):
+        times = importtime("import defparse", tmp_path)
+        # names are resolved on first access
+        assert [name for name in times if name.startswith("defparse")] == ["defparse"]
+        assert not any(module in times for module in DEFERRED_MODULES + ['argparse', 'inspect'])
+
+    def test_parser_import(self, tmp_path):
+        times = importtime("import defparse.parser", tmp_path)
+        assert "defparse.parser" in times
+        imported = [module for module in DEFERRED_MODULES if module in times]
+        assert imported == []
+        # time spent in defparse modules
+        total = sum(t for name, t in times.items() if name.startswith("defparse"))
+        assert total < BUDGET_US, "Import of defparse took %i us, budget is %i us" % (total, BUDGET_US)
+
+    def test_lazy_names(self):
+        import defparse
+        for name in defparse.__all__:
+            assert getattr(defparse, name) is not None
+        with pytest.raises(AttributeError):
+            defparse.unknown
+
+    def test_lazy_submodules(self):
+        # submodules are available as attributes without importing them first
+        code = "import defparse; print(defparse.typehints.Ignore, defparse.parser.ArgumentParser)"
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        assert "Ignore" in output and "ArgumentParser" in output
+        import defparse
+        assert not hasattr(defparse, "unknown_module")
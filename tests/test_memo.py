@@ -0,0 +1,98 @@
+import os
+import pytest
+from defparse import ArgumentParser
+from defparse.memo import ResultStore
+
+# number of calls of the memoized callables
+calls = []
+
+def square(x:int, offset:int =0):
+    calls.append(x)
+    return x * x + offset
+
+def payload(n:int):
+    calls.append(n)
+    return b"x" * n
+
+class TestMemo():
+
+    def test_memoize_results(self, tmp_path):
+        calls.clear()
+        # create parser
+        parser = ArgumentParser(result_cache=str(tmp_path))
+        container = parser.add_args_from_callable(square, ignore=["offset"], memoize=True)
+
+        parser.parse_args(["--x", "3"])
+        assert container() == 9
+        assert container() == 9
+        assert calls == [3]
+        # extra keyword arguments are part of the key
+        assert container(offset=1) == 10
+        assert calls == [3, 3]
+        # different arguments
+        parser.parse_args(["--x", "4"])
+        assert container() == 16
+        assert calls == [3, 3, 4]
+
+        # results are shared with other parsers
+        parser = ArgumentParser(result_cache=str(tmp_path))
+        container = parser.add_args_from_callable(square, ignore=["offset"], memoize=True)
+        result = parser.parse(["--x", "3"])
+        assert result[container].execute() == 9
+        assert calls == [3, 3, 4]
+
+    def test_refresh_and_bypass(self, tmp_path):
+        calls.clear()
+        # create parser
+        parser = ArgumentParser(result_cache=str(tmp_path))
+        container = parser.add_args_from_callable(square, ignore=["offset"], memoize=True)
+
+        parser.parse_args(["--x", "2"])
+        assert container.execute_uncached() == 4
+        assert len(os.listdir(tmp_path)) == 0
+        assert container() == 4
+        assert container.refresh() == 4
+        assert container() == 4
+        assert calls == [2, 2, 2]
+
+    def test_eviction(self, tmp_path):
+        calls.clear()
+        # create parser with room for about two results
+        parser = ArgumentParser(result_cache=str(tmp_path), result_cache_size=2500)
+        container = parser.add_args_from_callable(payload, memoize=True)
+
+        for n in (1000, 1001, 1002):
+            parser.parse_args(["--n", str(n)])
+            container()
+        assert len(os.listdir(tmp_path)) == 2
+        # least recently used result was evicted
+        parser.parse_args(["--n", "1000"])
+        container()
+        assert calls == [1000, 1001, 1002, 1000]
+
+    def test_invalid(self, tmp_path):
+        # memoization requires a result cache
+        with pytest.raises(RuntimeError):
+            ArgumentParser().add_args_from_callable(square, memoize=True)
+        # local callables cannot be identified across processes
+        def local(x:int):
+            return x
+        with pytest.raises(TypeError):
+            ArgumentParser(result_cache=str(tmp_path)).add_args_from_callable(local, memoize=True)
+
+    def test_unpicklable_arguments(self, tmp_path):
+        store = ResultStore(str(tmp_path))
+        assert store.key(square, {'x': lambda: None}) is None
+        assert store.call(square, {'x': 1}, lambda: (lambda: None)) is not None
+        assert len(os.listdir(tmp_path)) == 0
+
+    def test_equal_arguments(self, tmp_path):
+        store = ResultStore(str(tmp_path))
+        a, b = [1, 2], [1, 2]
+        # keys only depend on the values of the arguments
+        assert store.key(square, {'x': a, 'offset': a}) == store.key(square, {'x': a, 'offset': b})
+        assert store.key(square, {'x': {'u': 1, 'v': a}}) == store.key(square, {'x': {'v': b, 'u': 1}})
+        # values of different types are distinguished
+        assert store.key(square, {'x': [1, 2]}) != store.key(square, {'x': (1, 2)})
+        assert store.key(square, {'x': {1: 0}}) != store.key(square, {'x': {'1': 0}})
+        assert store.key(square, {'x': 1}) != store.key(square, {'x': True})
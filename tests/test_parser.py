@@ -1,6 +1,10 @@
-from defparse import ArgumentParser, Ignore, uses
+import argparse
+import pytest
+import defparse.parser
+from defparse import ArgumentParser, CallableSpec, Ignore, uses
 from argparse import _StoreTrueAction, _StoreFalseAction
 from typing import Literal, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 class TestFunctionParsing():
 
@@ -402,3 +406,366 @@ class TestFunctionParsing():
         # parse execute
         parser.parse_args("")
         test_function_outer()
+
+    def test_callable_spec(self):
+
+        def test_function_A(A:Optional[List[int]], B:Literal["a", "b"] ="a", C:Ignore[int] =None):
+            """ Test function
+
+                Args:
+                    A (Optional[List[int]]): description of argument A
+            """
+            return (A, B)
+
+        # build spec
+        spec = CallableSpec.from_callable(test_function_A)
+        # check spec
+        assert [arg.name for arg in spec.arguments] == ["A", "B"]
+        assert spec.arguments[0].type is int
+        assert spec.arguments[0].nargs == '+'
+        assert spec.arguments[0].required is False
+        assert spec.arguments[0].help == "description of argument A"
+        assert spec.arguments[1].choices == ("a", "b")
+        assert spec.arguments[1].default == "a"
+        # spec is memoized
+        assert CallableSpec.from_callable(test_function_A) is spec
+
+    def test_callable_spec_shared_across_parsers(self, monkeypatch):
+
+        def test_function_A(A:int, B:float =0.3):
+            return (A, B)
+
+        # first parser introspects the callable
+        ArgumentParser().add_args_from_callable(test_function_A)
+
+        # following parsers replay the memoized spec
+        def fail(fn, **kwargs):
+            assert False, "Expected memoized spec"
+        monkeypatch.setattr(defparse.parser, "_build_callable_spec", fail)
+
+        for i in range(3):
+            parser = ArgumentParser()
+            test_function = parser.add_args_from_callable(test_function_A)
+            parser.parse_args(["--A", str(i)])
+            assert test_function() == (i, 0.3)
+
+    def test_lazy_help(self, monkeypatch):
+
+        # record parsed docstrings
+        parsed_docs = []
+        parse = defparse.parser.parse
+        def record(doc):
+            parsed_docs.append(doc)
+            return parse(doc)
+        monkeypatch.setattr(defparse.parser, "parse", record)
+
+        def test_function_A(A:int, B:float =0.3):
+            """ Test function with type annotations and defaults
+
+                Args:
+                    A (int): description of argument A
+                    B (float): description of argument B
+            """
+            return (A, B)
+
+        # create parser
+        parser = ArgumentParser(lazy_help=True)
+        test_function_A = parser.add_args_from_callable(test_function_A)
+
+        # parse and execute without parsing the docstring
+        parser.parse_args("--A 3".split())
+        assert test_function_A() == (3, 0.3)
+        assert len(parsed_docs) == 0
+        assert parser._option_string_actions['--A'].help is None
+
+        # render help
+        help_text = parser.format_help()
+        assert len(parsed_docs) == 1
+        assert "description of argument A" in help_text
+        assert parser._option_string_actions['--B'].help == "description of argument B"
+
+    def test_lazy_help_with_type_from_docstring(self):
+
+        def test_function_A(A, B:float =0.3):
+            """ Test function with type annotations and defaults
+
+                Args:
+                    A (int): description of argument A
+                    B (float): description of argument B
+            """
+            return (A, B)
+
+        # create parser
+        parser = ArgumentParser(lazy_help=True)
+        parser.add_args_from_callable(test_function_A)
+
+        # docstring is required to infer the type of A
+        assert parser._option_string_actions['--A'].type is int
+        assert parser._option_string_actions['--A'].help == "description of argument A"
+
+    def test_uses_diamond(self, monkeypatch):
+
+        # record introspected callables
+        introspected = []
+        build_callable_spec = defparse.parser._build_callable_spec
+        def record(fn, **kwargs):
+            introspected.append(fn.__name__)
+            return build_callable_spec(fn, **kwargs)
+        monkeypatch.setattr(defparse.parser, "_build_callable_spec", record)
+
+        def test_function_shared(S:int =1):
+            return S
+
+        @uses(test_function_shared)
+        def test_function_left(L:int =2, **kwargs):
+            return L
+
+        @uses(test_function_shared)
+        def test_function_right(R:int =3, **kwargs):
+            return R
+
+        @uses(test_function_left)
+        @uses(test_function_right)
+        def test_function_outer(**kwargs):
+            return kwargs
+
+        # create parser
+        parser = ArgumentParser()
+        test_function_outer = parser.add_args_from_callable(test_function_outer)
+
+        # shared callable is visited once
+        assert sorted(introspected) == sorted([
+            "test_function_outer", "test_function_left", 
+            "test_function_right", "test_function_shared"
+        ])
+        # parse and execute
+        parser.parse_args("--S 4".split())
+        assert test_function_outer() == {'S': 4, 'L': 2, 'R': 3}
+
+    def test_uses_cycle(self):
+
+        def test_function_A(A:int =1, **kwargs):
+            return A
+
+        @uses(test_function_A)
+        def test_function_B(B:int =2, **kwargs):
+            return B
+
+        # close the cycle
+        uses(test_function_B)(test_function_A)
+
+        # create parser
+        parser = ArgumentParser()
+        try:
+            parser.add_args_from_callable(test_function_A)
+            assert False, "Expected RuntimeError due to cyclic dependency"
+        except RuntimeError as e:
+            assert "test_function_A" in str(e)
+
+    def test_uses_empty(self):
+
+        def test_function_A(A:int =1, **kwargs):
+            return A
+
+        # callable with empty set of used callables
+        setattr(test_function_A, uses.USED_FUNCTIONS_KEY, set())
+
+        # create parser
+        parser = ArgumentParser()
+        test_function_A = parser.add_args_from_callable(test_function_A)
+        parser.parse_args("")
+        assert test_function_A() == 1
+
+    def test_container_kwargs_per_parse_result(self):
+
+        # create parser
+        parser = ArgumentParser()
+
+        def test_function_A(A:int, B:float =0.3):
+            return (A, B)
+
+        def test_function_B(C:int =1):
+            return C
+
+        # add arguments from callables
+        test_function_A = parser.add_args_from_callable(test_function_A)
+        parser.add_args_from_callable(test_function_B)
+
+        # kwargs only contain arguments of the callable
+        parser.parse_args("--A 1".split())
+        assert test_function_A.kwargs == {'A': 1, 'B': 0.3}
+        # modifying the returned kwargs does not affect the container
+        test_function_A.kwargs['A'] = 5
+        assert test_function_A() == (1, 0.3)
+
+        # kwargs are updated by parsing again
+        parser.parse_args("--A 2 --B 0.5".split())
+        assert test_function_A.kwargs == {'A': 2, 'B': 0.5}
+        assert test_function_A() == (2, 0.5)
+
+    def test_parse_many(self):
+
+        # create parser
+        parser = ArgumentParser()
+
+        def test_function_A(A:int, B:Literal[1, 2] =1):
+            return (A, B)
+
+        # add arguments from callable
+        test_function_A = parser.add_args_from_callable(test_function_A)
+
+        # parse batch including invalid rows
+        batch = parser.parse_many([
+            "--A 1".split(),
+            "--A x".split(),
+            "--A 3 --B 2".split(),
+            "--B 2".split(),
+            "--A 5 --B 3".split(),
+        ])
+        # check columns
+        assert len(batch) == 5
+        assert batch.columns['A'] == [1, None, 3, None, None]
+        assert batch.columns['B'] == [1, None, 2, None, None]
+        # check errors
+        assert batch.valid_rows == [0, 2]
+        assert "invalid int value" in batch.errors[1]
+        assert "required" in batch.errors[3]
+        assert "invalid choice" in batch.errors[4]
+        # no arguments are stored on the parser
+        assert not hasattr(parser, '_parsed_args')
+
+        # execute callable on batch
+        assert test_function_A.execute_batch(batch) == [(1, 1), None, (3, 2), None, None]
+
+    def test_parse_many_mixed(self, capsys):
+
+        # create parser
+        parser = ArgumentParser()
+
+        def test_function_A(A:int, B:float =0.5, C:str ="1"):
+            return (A, B, C)
+
+        # add arguments from callable
+        parser.add_args_from_callable(test_function_A)
+
+        # compiled rows mixed with rows parsed by argparse
+        rows = [
+            "--A 1".split(),
+            {"A": 2, "B": 1.5},
+            "--A 3 --B -1".split(),
+            ["-h"],
+            "--A=4".split(),
+            "--A 5 --C x".split(),
+        ]
+        batch = parser.parse_many(rows)
+        # help is not printed
+        assert capsys.readouterr().out == ""
+        assert batch.errors[3] == "Parser exited with status 0"
+        # columns match parsing every row on its own
+        for i in (0, 2, 4, 5):
+            assert batch.errors[i] is None
+            assert {k: col[i] for k, col in batch.columns.items()} == dict(parser.parse(rows[i]).values)
+        assert {k: col[1] for k, col in batch.columns.items()} == {'A': 2, 'B': 1.5, 'C': "1"}
+        assert batch.columns['A'] == [1, 2, 3, None, 4, 5]
+        assert batch.columns['B'] == [0.5, 1.5, -1.0, None, 0.5, 0.5]
+
+    @pytest.mark.parametrize("fast_path", [True, False])
+    def test_parse_many_required(self, fast_path):
+
+        # create parser
+        parser = ArgumentParser(fast_path=fast_path)
+
+        def test_function_A(names:List[str], pair:Tuple[int, int], offset:float =0.0):
+            return (names, pair, offset)
+
+        # add arguments from callable
+        parser.add_args_from_callable(test_function_A)
+
+        # values of required arguments are taken as they are
+        batch = parser.parse_many([
+            {'names': ['-a', 'b'], 'pair': [1, -2], 'offset': 1.0},
+            {'names': ['-a'], 'pair': [1, 2]},
+            {'pair': [3, 4]},
+        ])
+        assert batch.columns['names'] == [['-a', 'b'], ['-a'], None]
+        assert batch.columns['pair'] == [[1, -2], [1, 2], None]
+        assert batch.columns['offset'] == [1.0, 0.0, None]
+        assert "required: --names" in batch.errors[2]
+
+    def test_parse_result(self):
+
+        # create parser
+        parser = ArgumentParser()
+
+        def test_function_A(A:int, B:float =0.5):
+            return (A, B)
+
+        # add arguments from callable
+        test_function_A = parser.add_args_from_callable(test_function_A)
+
+        # parse into immutable results
+        result_1 = parser.parse("--A 1".split())
+        result_2 = parser.parse("--A 2 --B 0.1".split())
+        assert not hasattr(parser, '_parsed_args')
+        assert (result_1.A, result_1.B) == (1, 0.5)
+        with pytest.raises(TypeError):
+            result_1.values['A'] = 3
+        with pytest.raises(AttributeError):
+            result_1.C
+
+        # bind container to results
+        assert result_1[test_function_A]() == (1, 0.5)
+        assert test_function_A.bind(result_2).kwargs == {'A': 2, 'B': 0.1}
+        # bound containers are independent of later parses
+        bound = result_2[test_function_A]
+        parser.parse_args("--A 3".split())
+        assert bound() == (2, 0.1)
+        assert test_function_A() == (3, 0.5)
+
+    def test_parse_concurrent(self):
+
+        # create parser
+        parser = ArgumentParser()
+
+        def test_function_A(A:int, B:List[int] =[]):
+            return (A, B)
+
+        # add arguments from callable
+        test_function_A = parser.add_args_from_callable(test_function_A)
+
+        def run(i):
+            result = parser.parse(["--A", str(i), "--B"] + [str(i)] * 3)
+            return result[test_function_A]()
+
+        # parse with one parser from multiple threads
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run, range(200)))
+        assert results == [(i, [i] * 3) for i in range(200)]
+
+    def test_kwargs_invalidation(self):
+
+        # create parser
+        parser = ArgumentParser()
+
+        def test_function_A(A:int, B:float =0.5):
+            return (A, B)
+
+        # add arguments from callable
+        test_function_A = parser.add_args_from_callable(test_function_A)
+
+        # parse into the same namespace multiple times
+        namespace = argparse.Namespace()
+        parser.parse_args(["--A=2"], namespace=namespace)
+        assert test_function_A.kwargs == {'A': 2, 'B': 0.5}
+        parser.parse_args(["--A=3"], namespace=namespace)
+        assert test_function_A.kwargs == {'A': 3, 'B': 0.5}
+        namespace.B = 0.1
+        assert test_function_A.kwargs == {'A': 3, 'B': 0.1}
+
+        # edits of the returned namespace are visible
+        args = parser.parse_args(["--A", "4"])
+        assert test_function_A() == (4, 0.5)
+        args.A = 5
+        assert test_function_A() == (5, 0.5)
+        assert isinstance(args, argparse.Namespace)
+        assert repr(args) == "Namespace(A=5, B=0.5)"
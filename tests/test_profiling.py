@@ -0,0 +1,81 @@
+import io
+import sys
+import defparse.parser
+from defparse import ArgumentParser
+from defparse.profiling import Profiler
+
+class TestProfiling():
+
+    def test_phases(self):
+
+        def test_function_A(A, B:float =0.3):
+            """ Test function
+
+                Args:
+                    A (int): description of argument A
+                    B (float): description of argument B
+            """
+            return (A, B)
+
+        # record timings through callback
+        recorded = []
+        profiler = Profiler(callback=lambda name, phase, elapsed: recorded.append(phase))
+
+        # create parser
+        parser = ArgumentParser(profiler=profiler)
+        test_function_A = parser.add_args_from_callable(test_function_A)
+        parser.parse_args("--A 1".split())
+        test_function_A()
+
+        # check recorded phases
+        phases = {phase for _, phase in profiler.stats}
+        assert {'signature', 'docstring', 'eval', 'typing', 'register', 'parse', 'execute'} <= phases
+        assert set(recorded) == phases
+        # one eval for the type of A from the docstring
+        name = test_function_A.fn.__qualname__
+        assert profiler.stats[(name, 'eval')][0] == 1
+        assert profiler.stats[(name, 'register')][0] == 2
+
+        # report is sorted by total time
+        out = io.StringIO()
+        profiler.report(file=out)
+        lines = out.getvalue().splitlines()
+        assert lines[0].startswith("defparse profile")
+        times = [float(line.split()[0]) for line in lines[2:]]
+        assert times == sorted(times, reverse=True)
+
+    def test_profile_option(self, monkeypatch):
+        # enabled by option in command line arguments
+        monkeypatch.setattr(sys, "argv", ["prog", "--defparse-profile"])
+        registered = []
+        monkeypatch.setattr(defparse.parser.atexit, "register", registered.append)
+        parser = ArgumentParser(profile_option="--defparse-profile")
+        assert parser.profiler is not None
+        assert registered == [parser.profiler.report]
+        assert parser.parse_args().defparse_profile is True
+
+        # disabled without option
+        monkeypatch.setattr(sys, "argv", ["prog"])
+        parser = ArgumentParser(profile_option="--defparse-profile")
+        assert parser.profiler is None
+
+    def test_profile_option_in_args(self, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["prog"])
+        registered = []
+        monkeypatch.setattr(defparse.parser.atexit, "register", registered.append)
+
+        def test_function_A(A:int):
+            return A
+
+        # create parser
+        parser = ArgumentParser(profile_option="--defparse-profile")
+        test_function_A = parser.add_args_from_callable(test_function_A)
+        parser.parse_args(["--A", "1"])
+        assert parser.profiler is None
+
+        # enabled by option in explicitly passed arguments
+        parser.parse_args(["--A", "2", "--defparse-profile"])
+        assert registered == [parser.profiler.report]
+        assert test_function_A() == 2
+        phases = {phase for _, phase in parser.profiler.stats}
+        assert {'parse', 'execute'} <= phases
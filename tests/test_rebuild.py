@@ -0,0 +1,140 @@
+import sys
+import pytest
+import importlib
+from defparse import ArgumentParser
+
+def f(a:int, b:int =2):
+    return (a, b)
+
+def g(b:int, c:int =3):
+    return (b, c)
+
+def h(a:int, d:str ="x"):
+    return (a, d)
+
+def k(z:int, b:str ="x"):
+    return (z, b)
+
+class Trainer():
+    def run(self, lr:float =0.1):
+        return lr
+
+class TestRebuild():
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_remove_shared(self, compact):
+        # create parser
+        parser = ArgumentParser(compact=compact)
+        container_f = parser.add_args_from_callable(f)
+        container_g = parser.add_args_from_callable(g)
+
+        # shared argument is kept for the remaining callable
+        parser.remove_callable(container_f)
+        parser.parse_args(["--b", "1"])
+        assert container_g() == (1, 3)
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--a", "1", "--b", "1"])
+
+        parser.remove_callable(container_g)
+        assert vars(parser.parse_args([])) == {}
+        assert "--b" not in parser.format_help()
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--b", "1"])
+        # removed callables are unknown to the parser
+        with pytest.raises(RuntimeError):
+            parser.remove_callable(container_g)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_replace(self, compact):
+        # create parser
+        parser = ArgumentParser(compact=compact)
+        container = parser.add_args_from_callable(f)
+        other = parser.add_args_from_callable(g)
+
+        assert parser.replace_callable(container, h) is container
+        parser.parse_args(["--a", "1", "--d", "y", "--b", "4"])
+        assert container() == (1, "y")
+        assert other() == (4, 3)
+        # argument shared by the replaced callable was kept
+        assert parser.parse_args(["--a", "1", "--b", "5"]).b == 5
+        # help lists the new arguments in the group of the callable
+        assert "--d" in parser.format_help()
+        assert "--c" in parser.format_help()
+
+    def test_refresh(self, tmp_path, monkeypatch):
+        module = tmp_path / "rebuild_module.py"
+        module.write_text("def run(x:int):\n    return x\n\ndef keep(y:int =0):\n    return y\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        import rebuild_module
+        # create parser
+        parser = ArgumentParser()
+        run = parser.add_args_from_callable(rebuild_module.run)
+        keep = parser.add_args_from_callable(rebuild_module.keep)
+        commands = parser.add_subcommands({"sub": "rebuild_module:run"})
+        assert parser.refresh() == []
+
+        # change the signature of one callable
+        parser.parse_args(["--x", "1", "sub", "--x", "2"])
+        module.write_text("def run(x:int, scale:int =10):\n    return x * scale\n\ndef keep(y:int =0):\n    return y\n")
+        importlib.invalidate_caches()
+        importlib.reload(rebuild_module)
+        updated = parser.refresh()
+        assert updated == [run, commands["sub"]]
+        assert keep.fn is rebuild_module.keep
+
+        # root and subcommand share the namespace
+        parser.parse_args(["--x", "1", "--scale", "3", "sub", "--x", "1", "--scale", "3"])
+        assert run() == 3
+        assert commands.execute() == 3
+        sys.modules.pop("rebuild_module", None)
+
+    def test_refresh_in_place(self):
+        def run(x:int):
+            return x
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(run)
+
+        # changes made in place before the first refresh are detected
+        def patched(x:float, scale:float =2.0):
+            return x * scale
+        run.__code__ = patched.__code__
+        run.__defaults__ = patched.__defaults__
+        run.__annotations__ = patched.__annotations__
+        assert parser.refresh() == [container]
+        parser.parse_args(["--x", "1.5", "--scale", "3"])
+        assert container() == 4.5
+        assert parser.refresh() == []
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_replace_conflict(self, compact):
+        # create parser
+        parser = ArgumentParser(compact=compact)
+        container_f = parser.add_args_from_callable(f)
+        container_g = parser.add_args_from_callable(g)
+
+        # conflicting types leave the parser unchanged
+        with pytest.raises(TypeError):
+            parser.replace_callable(container_f, k)
+        assert container_f.fn is f
+        parser.parse_args(["--a", "1", "--b", "2"])
+        assert container_f() == (1, 2)
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--a", "1", "--z", "2"])
+
+        # shared argument is kept for the remaining callable
+        parser.remove_callable(container_f)
+        parser.parse_args(["--b", "4"])
+        assert container_g() == (4, 3)
+
+    def test_refresh_bound_method(self):
+        # create parser
+        parser = ArgumentParser()
+        trainer = Trainer()
+        container = parser.add_args_from_callable(trainer.run)
+
+        # bound methods are looked up on the class and bound again
+        assert parser.refresh() == []
+        assert container.fn == trainer.run
+        parser.parse_args(["--lr", "0.5"])
+        assert container() == 0.5
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import List, Literal, Optional
+from defparse import ArgumentParser
+from defparse.resolver import resolve_type, resolve_name
+
+class Color(str):
+    pass
+
+def paint(color:Color, sizes:Optional[List[int]] =None, mode:Literal["a", "b"] ="a"):
+    return (color, sizes, mode)
+
+def paint_doc(color, size=1):
+    """ Paint
+
+        Args:
+            color (Color): color defined in this module
+            size (Optional[int]): size
+    """
+    return (color, size)
+
+class TestResolver():
+
+    def test_string_annotations(self):
+        # annotations are strings due to postponed evaluation
+        assert paint.__annotations__['color'] == "Color"
+
+        # create parser
+        parser = ArgumentParser()
+        paint_container = parser.add_args_from_callable(paint)
+        # check args
+        assert parser._option_string_actions['--color'].type is Color
+        assert parser._option_string_actions['--sizes'].type is int
+        assert parser._option_string_actions['--sizes'].nargs == '+'
+        assert parser._option_string_actions['--sizes'].required is False
+        assert parser._option_string_actions['--mode'].choices == ("a", "b")
+        # parse and execute
+        parser.parse_args("--color red --sizes 1 2".split())
+        color, sizes, mode = paint_container()
+        assert isinstance(color, Color)
+        assert sizes == [1, 2]
+
+    def test_docstring_types_from_callable_module(self):
+        # create parser
+        parser = ArgumentParser()
+        parser.add_args_from_callable(paint_doc)
+        assert parser._option_string_actions['--color'].type is Color
+        assert parser._option_string_actions['--size'].type is int
+
+    def test_descriptors_are_shared(self):
+        desc = resolve_type(Optional[List[Literal[1, 2]]])
+        assert resolve_type(Optional[List[Literal[1, 2]]]) is desc
+        assert desc.type is int
+        assert desc.nargs == '+'
+        assert desc.choices == (1, 2)
+        assert desc.optional
+
+    def test_name_cache_invalidation(self):
+        namespace = {}
+        def fn():
+            pass
+        # evaluate name in a namespace that is rebound later
+        fn = type(fn)(fn.__code__, namespace)
+        namespace['Value'] = int
+        assert resolve_name("List[Value]", fn) == List[int]
+        namespace['Value'] = float
+        assert resolve_name("List[Value]", fn) == List[float]
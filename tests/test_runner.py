@@ -0,0 +1,124 @@
+import io
+import json
+import pytest
+from typing import List, Literal
+from defparse import ArgumentParser
+from defparse.runner import run_records, run_jsonl, main
+
+def job(x:int, scale:float =1.0, tags:List[str] =[], mode:Literal["add", "mul"] ="mul"):
+    if x < 0:
+        raise ValueError("negative x")
+    return [x * scale if mode == "mul" else x + scale, tags]
+
+class TestRunner():
+
+    def _parser(self):
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(job)
+        return parser, container
+
+    def test_records(self):
+        parser, container = self._parser()
+        records = [
+            '["--x", "2", "--scale", "1.5"]',
+            '{"x": 3, "scale": 2, "tags": ["a"], "mode": "add"}',
+            ["--x", "4"],
+            {"x": "5"},
+        ]
+        results = list(run_records(parser, container, records, max_workers=2, chunksize=2))
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.result for r in results] == [[3.0, []], [5.0, ["a"]], [4.0, []], [5.0, []]]
+        assert all(r.error is None for r in results)
+
+    def test_errors(self):
+        parser, container = self._parser()
+        records = [
+            '{"x": 1',
+            '{"x": 1, "unknown": 2}',
+            '{"x": 1, "mode": "div"}',
+            '["--x"]',
+            '[1, 2]',
+            '"--x"',
+            '{"x": -1}',
+            '{"x": 1}',
+        ]
+        results = list(run_records(parser, container, records, max_pending=1))
+        assert [r.index for r in results] == list(range(len(records)))
+        assert all(r.error is not None for r in results[:-1])
+        assert "unrecognized argument in record: unknown" in results[1].error
+        assert results[6].error == "ValueError: negative x"
+        assert results[-1].result == [1.0, []]
+
+    def test_unordered(self):
+        parser, container = self._parser()
+        records = [["--x", str(i)] for i in range(50)] + ['{"x": "y"}']
+        results = list(run_records(parser, container, records, max_workers=4, ordered=False))
+        assert sorted(r.index for r in results) == list(range(51))
+        assert sorted(r.result[0] for r in results if r.error is None) == list(range(50))
+
+    def test_backpressure(self):
+        parser, container = self._parser()
+        read = []
+        def records():
+            for i in range(100):
+                read.append(i)
+                yield {"x": i}
+        results = run_records(parser, container, records(), max_workers=1, max_pending=2)
+        first = next(results)
+        assert first.index == 0
+        # only a bounded number of records was read ahead
+        assert len(read) <= 3
+        assert len(list(results)) == 99
+        assert len(read) == 100
+
+    def test_process_pool(self):
+        parser, container = self._parser()
+        records = ['{"x": %i}' % i for i in range(10)]
+        results = list(run_records(parser, container, records, executor='process', max_workers=2, chunksize=3))
+        assert [r.result for r in results] == [[float(i), []] for i in range(10)]
+
+    def test_jsonl(self, tmp_path):
+        parser, container = self._parser()
+        output = io.StringIO()
+        failed = run_jsonl(parser, container, io.StringIO('{"x": 2}\n\n{"x": -2}\n{"x": 1, "scale": 3}\n'), output)
+        assert failed == 1
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert lines[0] == {"index": 0, "result": [2.0, []]}
+        assert lines[1]["index"] == 1 and "error" in lines[1]
+        assert lines[2] == {"index": 2, "result": [3.0, []]}
+
+        # command line interface
+        path = tmp_path / "records.jsonl"
+        path.write_text('{"x": 2}\n["--x", "3", "--mode", "add"]\n')
+        with pytest.raises(SystemExit) as e:
+            main(["test_runner:job", "--input", str(path), "--output", str(tmp_path / "out.jsonl")])
+        assert e.value.code == 0
+        assert (tmp_path / "out.jsonl").read_text().splitlines() == [
+            '{"index": 0, "result": [2.0, []]}',
+            '{"index": 1, "result": [4.0, []]}'
+        ]
+
+    def test_help_record(self, capsys):
+        parser, container = self._parser()
+        output = io.StringIO()
+        run_jsonl(parser, container, io.StringIO('["--help"]\n{"x": 1}\n'), output)
+        # help is not printed into the stream of results
+        assert capsys.readouterr().out == ""
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert lines[0] == {"index": 0, "error": "Parser exited with status 0"}
+        assert lines[1] == {"index": 1, "result": [1.0, []]}
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_memoized(self, tmp_path, executor):
+        # create parser
+        parser = ArgumentParser(result_cache=str(tmp_path))
+        container = parser.add_args_from_callable(job, memoize=True)
+
+        records = ['{"x": 2}', '{"x": 2}', '{"x": 3}']
+        results = list(run_records(parser, container, records, executor=executor, max_workers=1))
+        assert [r.result for r in results] == [[2.0, []], [2.0, []], [3.0, []]]
+        # results of the runner are stored in the result cache
+        assert len(list(tmp_path.glob("*.pickle"))) == 2
+        parser.parse_args(["--x", "3"])
+        assert container() == [3.0, []]
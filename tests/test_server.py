@@ -0,0 +1,78 @@
+import sys
+import threading
+import pytest
+from defparse import ArgumentParser
+from defparse.server import Server
+from defparse.client import request
+
+def greet(name:str, times:int =1):
+    print(" ".join(["hello " + name] * times))
+    if name == "error":
+        raise ValueError("invalid name")
+
+def echo(prefix:str =""):
+    print(prefix + sys.stdin.read())
+
+@pytest.fixture
+def server(tmp_path):
+    # create parser
+    parser = ArgumentParser(prog="tool")
+    commands = parser.add_subcommands({"greet": greet, "echo": echo})
+    server = Server(parser, commands, str(tmp_path / "tool.sock"), max_workers=4)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+class TestServer():
+
+    def test_requests(self, server):
+        response = request(server.path, ["greet", "--name", "a", "--times", "2"])
+        assert response == {'stdout': "hello a hello a\n", 'stderr': "", 'exit_code': 0}
+        # standard input is forwarded
+        response = request(server.path, ["echo", "--prefix", "> "], stdin="text")
+        assert response['stdout'] == "> text\n"
+
+    def test_errors(self, server):
+        # parse errors exit with code 2
+        response = request(server.path, ["greet", "--times", "x"])
+        assert response['exit_code'] == 2
+        assert "invalid int value: 'x'" in response['stderr']
+        # help exits with code 0
+        response = request(server.path, ["greet", "-h"])
+        assert response['exit_code'] == 0
+        assert response['stdout'].startswith("usage: tool greet")
+        # exceptions are reported with traceback
+        response = request(server.path, ["greet", "--name", "error"])
+        assert response['exit_code'] == 1
+        assert response['stdout'] == "hello error\n"
+        assert "ValueError: invalid name" in response['stderr']
+
+    def test_concurrent_requests(self, server):
+        responses = [None] * 32
+        def run(i):
+            responses[i] = request(server.path, ["greet", "--name", str(i)])
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(responses))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # output is captured per request
+        assert [r['stdout'] for r in responses] == ["hello %i\n" % i for i in range(len(responses))]
+
+    def test_existing_path(self, tmp_path):
+        # create parser
+        parser = ArgumentParser(prog="tool")
+        commands = parser.add_subcommands({"greet": greet})
+        # files other than sockets are never removed
+        path = tmp_path / "tool.sock"
+        path.write_text("important")
+        with pytest.raises(RuntimeError):
+            Server(parser, commands, str(path))
+        assert path.read_text() == "important"
+        # stale sockets are replaced
+        path.unlink()
+        Server(parser, commands, str(path)).shutdown()
+        server = Server(parser, commands, str(path))
+        server.shutdown()
@@ -0,0 +1,77 @@
+import sys
+import importlib
+import defparse.parser
+from defparse import ArgumentParser
+
+MODULE_SOURCE = '''
+IMPORTED = True
+
+def train(lr:float =0.1, epochs:int =3):
+    return ("train", lr, epochs)
+'''
+
+def evaluate(split:str ="test"):
+    return ("evaluate", split)
+
+class TestSubcommands():
+
+    def _write_module(self, tmp_path, monkeypatch):
+        with open(tmp_path / "lazy_train.py", "w") as f:
+            f.write(MODULE_SOURCE)
+        monkeypatch.syspath_prepend(str(tmp_path))
+        sys.modules.pop("lazy_train", None)
+        importlib.invalidate_caches()
+
+    def test_unselected_subcommand_is_not_imported(self, tmp_path, monkeypatch):
+        self._write_module(tmp_path, monkeypatch)
+
+        # create parser
+        parser = ArgumentParser()
+        commands = parser.add_subcommands({
+            "train": "lazy_train:train",
+            "evaluate": evaluate
+        })
+
+        # select evaluate subcommand
+        parser.parse_args("evaluate --split dev".split())
+        assert "lazy_train" not in sys.modules
+        assert commands() == ("evaluate", "dev")
+
+    def test_only_selected_subcommand_is_introspected(self, tmp_path, monkeypatch):
+        self._write_module(tmp_path, monkeypatch)
+
+        # create parser
+        parser = ArgumentParser()
+        parser.add_subcommands({
+            "train": "lazy_train:train",
+            "evaluate": evaluate
+        })
+
+        # record introspected callables
+        introspected = []
+        build_callable_spec = defparse.parser._build_callable_spec
+        def record(fn, **kwargs):
+            introspected.append(fn.__name__)
+            return build_callable_spec(fn, **kwargs)
+        monkeypatch.setattr(defparse.parser, "_build_callable_spec", record)
+        defparse.parser._spec_memo.clear()
+
+        parser.parse_args("train --lr 0.5".split())
+        assert introspected == ["train"]
+
+    def test_subcommand_execution(self, tmp_path, monkeypatch):
+        self._write_module(tmp_path, monkeypatch)
+
+        # create parser
+        parser = ArgumentParser()
+        commands = parser.add_subcommands({
+            "train": "lazy_train:train",
+            "evaluate": evaluate
+        })
+
+        # parse and execute selected subcommand
+        args = parser.parse_args("train --lr 0.5".split())
+        assert args.command == "train"
+        assert "lazy_train" in sys.modules
+        assert commands.selected is commands["train"]
+        assert commands() == ("train", 0.5, 3)
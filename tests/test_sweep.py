@@ -0,0 +1,78 @@
+import pytest
+from typing import List
+from defparse import ArgumentParser, Sweep
+
+def train(lr:Sweep[float], epochs:Sweep[int] =3, name:str ="run"):
+    if lr < 0:
+        raise ValueError("negative learning rate")
+    return (name, lr, epochs)
+
+class TestSweep():
+
+    def test_product(self):
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(train)
+        assert parser._option_string_actions['--lr'].nargs == '+'
+        assert parser._option_string_actions['--lr'].type is float
+
+        # sweep over marked arguments
+        results = list(parser.parse_sweep(
+            container, "--lr 0.1 0.2 --epochs 1 2".split(), executor='thread', max_workers=2
+        ))
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.result for r in results] == [
+            ("run", 0.1, 1), ("run", 0.1, 2),
+            ("run", 0.2, 1), ("run", 0.2, 2)
+        ]
+        assert all(r.error is None for r in results)
+
+    def test_zip(self):
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(train)
+
+        parser.parse_args("--lr 0.1 0.2 --epochs 1 2".split())
+        results = list(container.sweep(mode='zip', executor='thread', chunksize=2))
+        assert [r.result for r in results] == [("run", 0.1, 1), ("run", 0.2, 2)]
+
+        # zip requires arguments of same length
+        parser.parse_args("--lr 0.1 0.2 --epochs 1".split())
+        with pytest.raises(ValueError):
+            container.sweep(mode='zip', executor='thread')
+
+    def test_failure_capture(self):
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(train)
+
+        # scalar defaults of marked arguments are a single point
+        parser.parse_args("--lr 0.1 -0.1 0.3 --name test".split())
+        results = list(container.sweep(executor='thread', ordered=False))
+        results = sorted(results, key=lambda r: r.index)
+        assert len(results) == 3
+        assert results[0].result == ("test", 0.1, 3)
+        assert isinstance(results[1].error, ValueError)
+        assert results[1].kwargs['lr'] == -0.1
+        assert results[2].result == ("test", 0.3, 3)
+
+    def test_explicit_list_arguments(self):
+
+        def test_function_A(A:List[int], B:int =1):
+            return A * B
+
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(test_function_A)
+        parser.parse_args("--A 1 2 3".split())
+        # sweep over list typed argument
+        results = container.sweep(over=["A"], executor='thread')
+        assert [r.result for r in results] == [1, 2, 3]
+
+    def test_process_pool(self):
+        # create parser
+        parser = ArgumentParser()
+        container = parser.add_args_from_callable(train)
+        parser.parse_args("--lr 0.1 0.2".split())
+        results = container.sweep(executor='process', max_workers=2)
+        assert [r.result for r in results] == [("run", 0.1, 3), ("run", 0.2, 3)]